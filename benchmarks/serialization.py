@@ -0,0 +1,196 @@
+"""
+JSON serialization micro-benchmark for large responses.
+
+For each payload it compares:
+- encode: FastAPI's default (jsonable_encoder + json.dumps) vs PydanticJSONResponse (pydantic-core)
+- route: a FastAPI route returning the object with a response_model vs one returning
+  PydanticJSONResponse, called in-process through TestClient (validation + encoding + ASGI)
+- untyped: the same for a route without a response_model (jsonable_encoder path), like
+  /siphon/synthetic_data before it returned PydanticJSONResponse
+- parse: json.loads + model_validate vs validating straight from the JSON bytes, as the client does
+
+Payloads are an embeddings response (--documents x --dim floats) and a page of job results
+(--items batch responses). Pass --batch-file with a captured /conduit/async response body to
+also measure a real list[ConduitResponse | ConduitError].
+
+Usage:
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --documents 1024 --dim 1024 --repeat 20
+    python benchmarks/serialization.py --batch-file batch.json
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from siphonserver.server.api.responses import (
+    EmbeddingsResponse,
+    JobResults,
+    JobStatus,
+    JobItemResult,
+    ConduitResult,
+    conduit_result_adapter,
+    conduit_results_adapter,
+)
+from siphonserver.server.utils.json_response import PydanticJSONResponse
+
+
+def embeddings_payload(documents: int, dim: int) -> EmbeddingsResponse:
+    rng = random.Random(0)
+    return EmbeddingsResponse(
+        embeddings=[[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(documents)]
+    )
+
+
+def job_results_payload(items: int) -> JobResults:
+    now = time.time()
+    status = JobStatus(
+        job_id="0" * 32,
+        kind="batch",
+        state="completed",
+        total=items,
+        completed=items,
+        created_at=now,
+        updated_at=now,
+    )
+    words = "the quick brown fox jumps over the lazy dog".split()
+    rng = random.Random(0)
+    results = [
+        JobItemResult(
+            index=i,
+            type="response",
+            result={
+                "content": " ".join(rng.choice(words) for _ in range(120)),
+                "model": "llama3.1:latest",
+                "usage": {"input_tokens": 250, "output_tokens": 120},
+                "duration": rng.uniform(0.5, 5.0),
+            },
+        )
+        for i in range(items)
+    ]
+    return JobResults(job=status, results=results)
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    """Median seconds per call after one warm-up call."""
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def route_client(payload: Any, response_model: Any) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/default", response_model=response_model)
+    async def default():
+        return payload
+
+    @app.get("/untyped")
+    async def untyped():
+        return payload
+
+    @app.get("/fast", response_model=response_model)
+    async def fast() -> PydanticJSONResponse:
+        return PydanticJSONResponse(payload)
+
+    return TestClient(app)
+
+
+def bench(
+    name: str,
+    payload: Any,
+    response_model: Any,
+    parse_old: Callable[[bytes], Any],
+    parse_new: Callable[[bytes], Any],
+    repeat: int,
+) -> list[tuple[str, str, float, float]]:
+    body = PydanticJSONResponse(payload).body
+    assert json.loads(body) == json.loads(json.dumps(jsonable_encoder(payload)))
+    client = route_client(payload, response_model)
+    return [
+        (
+            name,
+            "encode",
+            timed(lambda: json.dumps(jsonable_encoder(payload)).encode(), repeat),
+            timed(lambda: PydanticJSONResponse(payload).body, repeat),
+        ),
+        (
+            name,
+            "route",
+            timed(lambda: client.get("/default").content, repeat),
+            timed(lambda: client.get("/fast").content, repeat),
+        ),
+        (
+            name,
+            "untyped",
+            timed(lambda: client.get("/untyped").content, repeat),
+            timed(lambda: client.get("/fast").content, repeat),
+        ),
+        (name, "parse", timed(lambda: parse_old(body), repeat), timed(lambda: parse_new(body), repeat)),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=256)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--batch-file", type=Path, help="Captured /conduit/async response body")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    embeddings = embeddings_payload(args.documents, args.dim)
+    rows += bench(
+        f"embeddings {args.documents}x{args.dim}",
+        embeddings,
+        EmbeddingsResponse,
+        lambda body: EmbeddingsResponse.model_validate(json.loads(body)),
+        EmbeddingsResponse.model_validate_json,
+        args.repeat,
+    )
+    results = job_results_payload(args.items)
+    rows += bench(
+        f"job results x{args.items}",
+        results,
+        JobResults,
+        lambda body: JobResults.model_validate(json.loads(body)),
+        JobResults.model_validate_json,
+        args.repeat,
+    )
+    if args.batch_file:
+        batch = conduit_results_adapter.validate_json(args.batch_file.read_bytes())
+        rows += bench(
+            f"conduit batch x{len(batch)}",
+            batch,
+            list[ConduitResult],
+            lambda body: [conduit_result_adapter.validate_python(item) for item in json.loads(body)],
+            conduit_results_adapter.validate_json,
+            args.repeat,
+        )
+
+    print(f"{'payload':<28} {'step':<7} {'default ms':>11} {'fast ms':>9} {'speedup':>8}")
+    for name, step, default, fast in rows:
+        print(
+            f"{name:<28} {step:<7} {default * 1000:>11.2f} {fast * 1000:>9.2f} {default / fast:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
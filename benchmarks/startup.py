@@ -0,0 +1,207 @@
+"""
+Server cold-start benchmark.
+
+Measures, each in a fresh interpreter:
+- import time of siphonserver.server.main, with a per-module breakdown from `python -X importtime`
+- time from launching uvicorn until the first 200 from /livez (and optionally /readyz)
+
+Usage:
+    python benchmarks/startup.py                     # 5 runs, top 25 modules
+    python benchmarks/startup.py --runs 10 --ready   # also wait for /readyz
+    python benchmarks/startup.py --json results.json --max-import-seconds 1.5
+
+With --max-import-seconds / --max-livez-seconds the script exits 1 when the median exceeds the
+budget, so it can guard against import-time regressions in CI.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+APP = "siphonserver.server.main:app"
+MODULE = "siphonserver.server.main"
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    src = str(Path(__file__).resolve().parent.parent / "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    return env
+
+
+def measure_import() -> tuple[float, list[tuple[str, int, int]]]:
+    """Seconds to import the app module, plus (module, self_us, cumulative_us) per module."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {MODULE}; "
+        "print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=_env(),
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    seconds = float(result.stdout.strip().splitlines()[-1])
+    return seconds, modules
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, process: subprocess.Popen, timeout: float) -> float | None:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def measure_first_response(ready: bool, timeout: float) -> dict[str, float | None]:
+    """Seconds from process launch to the first 200 from /livez (and /readyz if ready)."""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", APP, "--port", str(port), "--log-level", "warning"],
+        env=_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        livez = _wait_for(f"{base}/livez", process, timeout)
+        result = {"livez": livez - start if livez else None}
+        if ready:
+            readyz = _wait_for(f"{base}/readyz", process, timeout)
+            result["readyz"] = readyz - start if readyz else None
+        return result
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+        "runs": len(values),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25, help="Modules shown in the breakdown")
+    parser.add_argument("--ready", action="store_true", help="Also time the first 200 from /readyz")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait per endpoint")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--max-import-seconds", type=float)
+    parser.add_argument("--max-livez-seconds", type=float)
+    args = parser.parse_args()
+
+    import_seconds = []
+    self_us: dict[str, list[int]] = defaultdict(list)
+    cumulative_us: dict[str, list[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        seconds, modules = measure_import()
+        import_seconds.append(seconds)
+        for name, own, cumulative in modules:
+            self_us[name].append(own)
+            cumulative_us[name].append(cumulative)
+
+    first_response: dict[str, list[float]] = defaultdict(list)
+    for _ in range(args.runs):
+        for endpoint, seconds in measure_first_response(args.ready, args.timeout).items():
+            if seconds is not None:
+                first_response[endpoint].append(seconds)
+
+    # Breakdown by median cumulative time; top-level packages by summed self time
+    modules = sorted(
+        (
+            (name, statistics.median(self_us[name]), statistics.median(cumulative_us[name]))
+            for name in cumulative_us
+        ),
+        key=lambda row: row[2],
+        reverse=True,
+    )
+    packages: dict[str, float] = defaultdict(float)
+    for name, own, _ in modules:
+        packages[name.split(".")[0]] += own
+
+    print(f"Import {MODULE}: median {statistics.median(import_seconds):.3f}s over {args.runs} runs")
+    for endpoint in ["livez", "readyz"] if args.ready else ["livez"]:
+        values = first_response.get(endpoint)
+        if values:
+            print(f"First 200 from /{endpoint}: median {statistics.median(values):.3f}s")
+        else:
+            print(f"First 200 from /{endpoint}: not reached within {args.timeout}s")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, own, cumulative in modules[: args.top]:
+        print(f"{cumulative / 1000:>14.1f} {own / 1000:>9.1f}  {name}")
+    print(f"\n{'self ms':>9}  package")
+    for package, own in sorted(packages.items(), key=lambda row: row[1], reverse=True)[: args.top]:
+        print(f"{own / 1000:>9.1f}  {package}")
+
+    results = {
+        "python": sys.version.split()[0],
+        "import_seconds": _summary(import_seconds),
+        "first_response_seconds": {
+            endpoint: _summary(values) for endpoint, values in first_response.items()
+        },
+        "modules": [
+            {"module": name, "self_ms": own / 1000, "cumulative_ms": cumulative / 1000}
+            for name, own, cumulative in modules[: args.top]
+        ],
+        "packages_self_ms": {
+            package: own / 1000
+            for package, own in sorted(packages.items(), key=lambda row: row[1], reverse=True)
+        },
+    }
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    failed = False
+    if args.max_import_seconds and statistics.median(import_seconds) > args.max_import_seconds:
+        print(f"FAIL: import median exceeds {args.max_import_seconds}s", file=sys.stderr)
+        failed = True
+    livez = first_response.get("livez")
+    if args.max_livez_seconds and (
+        not livez or statistics.median(livez) > args.max_livez_seconds
+    ):
+        print(f"FAIL: /livez median exceeds {args.max_livez_seconds}s", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+asyncio client for SiphonServer.
+
+Same calls as SiphonClient, as coroutines over one pooled httpx.AsyncClient. A semaphore caps how
+many requests are on the wire at once (max_concurrency), so callers can gather thousands of calls
+from one event loop and let the client queue them instead of opening a connection per task.
+Request encoding, retry/backoff and error parsing are shared with SiphonClient. The streaming
+endpoints are only on SiphonClient.
+"""
+
+from siphonserver.server.api.requests import (
+    ConduitRequest,
+    BatchRequest,
+    SyntheticDataRequest,
+    EmbeddingsRequest,
+    JobRequest,
+)
+from siphonserver.server.api.responses import (
+    ConduitResponse,
+    ConduitError,
+    EmbeddingsResponse,
+    JobStatus,
+    JobResults,
+    conduit_result_adapter,
+    conduit_results_adapter,
+)
+from siphonserver.server.api import embeddings_format
+from siphonserver.server.utils import hashing
+from siphonserver.client.response_cache import ResponseCache
+from siphonserver.client.siphonclient import (
+    DEFAULT_COMPRESS_THRESHOLD,
+    RETRY_STATUSES,
+    SIPHON_SERVER_DEFAULT_PORT,
+    SIPHON_SERVER_IP,
+    encode_request,
+    handle_error_response,
+    parse_embeddings,
+    parse_synthetic_data,
+    _backoff_seconds,
+    _retry_after_seconds,
+    logger,
+)
+from siphon.synthetic_data.synthetic_data_classes import SyntheticDataUnion
+from pydantic import BaseModel
+import asyncio
+import time
+import httpx
+
+# Transport failures worth retrying: the request never reached the server or the pooled
+# connection was closed under it
+_RETRY_ERRORS = (httpx.NetworkError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+class AsyncSiphonClient:
+    def __init__(
+        self,
+        base_url: str = "",
+        compress_threshold: int | None = DEFAULT_COMPRESS_THRESHOLD,
+        max_concurrency: int = 64,
+        pool_size: int | None = None,
+        connect_timeout: float = 10.0,
+        read_timeout: float | None = 600.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        cache: ResponseCache | None = None,
+    ):
+        """
+        max_concurrency: requests in flight at once; further calls wait for a slot.
+        pool_size: connections kept to the server (defaults to max_concurrency).
+        The remaining arguments behave as in SiphonClient.
+        """
+        if base_url == "":
+            self.base_url = self._get_url()
+        else:
+            self.base_url = base_url.rstrip("/")
+        self.compress_threshold = compress_threshold
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        pool_size = pool_size or max_concurrency
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+            # No pool timeout: callers beyond the pool size wait on the semaphore anyway
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=None),
+        )
+
+    def _get_url(self) -> str:
+        return f"http://{SIPHON_SERVER_IP}:{SIPHON_SERVER_DEFAULT_PORT}"
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncSiphonClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _request(
+        self, method: str, path: str, idempotent: bool = True, **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request once a concurrency slot is free. Idempotent calls are retried on transport
+        errors and RETRY_STATUSES; the slot is released while backing off.
+        """
+        attempts = self.max_retries + 1 if idempotent else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                async with self._semaphore:
+                    response = await self.client.request(method, path, **kwargs)
+            except _RETRY_ERRORS as e:
+                if last:
+                    raise
+                delay = _backoff_seconds(attempt, None, self.backoff_base, self.backoff_max)
+                logger.warning(f"{method} {path} failed ({e!r}); retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or last:
+                    return response
+                delay = _backoff_seconds(
+                    attempt,
+                    _retry_after_seconds(response),
+                    self.backoff_base,
+                    self.backoff_max,
+                )
+                logger.warning(
+                    f"{method} {path} returned {response.status_code}; retrying in {delay:.1f}s"
+                )
+            await asyncio.sleep(delay)
+
+    async def _cached(self, key: str | None) -> tuple[bytes, str] | None:
+        # The cache is SQLite-backed; keep its reads and writes off the event loop
+        if self.cache is None or key is None:
+            return None
+        return await asyncio.to_thread(self.cache.get, key)
+
+    def _cache_key(self, path: str, request: BaseModel, *extra: str) -> str | None:
+        if self.cache is None:
+            return None
+        return ResponseCache.key(path, hashing.request_hash(request), *extra)
+
+    async def _store(self, key: str | None, response: httpx.Response) -> None:
+        if key is not None:
+            await asyncio.to_thread(
+                self.cache.set,
+                key,
+                response.content,
+                response.headers.get("Content-Type", ""),
+            )
+
+    async def _post(
+        self,
+        path: str,
+        model: BaseModel,
+        headers: dict[str, str] | None = None,
+        idempotent: bool = True,
+        **dump_kwargs,
+    ) -> httpx.Response:
+        body, headers = encode_request(model, self.compress_threshold, headers, **dump_kwargs)
+        response = await self._request(
+            "POST", path, idempotent, content=body, headers=headers
+        )
+        if response.status_code != 200:
+            handle_error_response(response)
+        return response
+
+    async def get_status(self):
+        """Get server status"""
+        response = await self._request("GET", "/status")
+        response.raise_for_status()
+        return response.json()
+
+    async def query_sync(self, request: ConduitRequest) -> ConduitResponse | ConduitError:
+        """Send a synchronous query to the server"""
+        key = self._cache_key("/conduit/sync", request)
+        if (cached := await self._cached(key)) is not None:
+            return conduit_result_adapter.validate_json(cached[0])
+        response = await self._post("/conduit/sync", request)
+        result = conduit_result_adapter.validate_json(response.content)
+        if isinstance(result, ConduitResponse):
+            await self._store(key, response)
+        return result
+
+    async def query_async(
+        self, batch: BatchRequest
+    ) -> list[ConduitResponse | ConduitError]:
+        """Send an asynchronous batch query to the server"""
+        response = await self._post("/conduit/async", batch)
+        return conduit_results_adapter.validate_json(response.content)
+
+    async def generate_synthetic_data(
+        self, request: SyntheticDataRequest
+    ) -> SyntheticDataUnion | ConduitError:
+        """Generate synthetic data using the server with structured error handling"""
+        digest = hashing.request_hash(request)
+        key = ResponseCache.key("/siphon/synthetic_data", digest) if self.cache else None
+        if (cached := await self._cached(key)) is not None:
+            return parse_synthetic_data(cached[0])
+        logger.debug(f"Sending synthetic data request [hash: {digest[:8]}]")
+        response = await self._post("/siphon/synthetic_data", request)
+        logger.debug(
+            f"Received synthetic data [hash: {digest[:8]}, "
+            f"request ID: {response.headers.get('X-Request-ID', 'unknown')}]"
+        )
+        synthetic_data = parse_synthetic_data(response.content)
+        await self._store(key, response)
+        return synthetic_data
+
+    async def generate_embeddings(
+        self, request: EmbeddingsRequest
+    ) -> EmbeddingsResponse | ConduitError:
+        """Generate embeddings using the server."""
+        key = self._cache_key("/conduit/embeddings", request)
+        if (cached := await self._cached(key)) is not None:
+            return parse_embeddings(cached[0])
+        response = await self._post("/conduit/embeddings", request)
+        result = parse_embeddings(response.content)
+        if isinstance(result, EmbeddingsResponse):
+            await self._store(key, response)
+        return result
+
+    async def generate_embeddings_array(
+        self,
+        request: EmbeddingsRequest,
+        wire_format: str = embeddings_format.FLOAT32,
+    ):
+        """Generate embeddings as a float32 NumPy array of shape (documents, dim)."""
+        if wire_format not in embeddings_format.BINARY_FORMATS:
+            raise ValueError(f"Unsupported embeddings format: {wire_format}")
+        key = self._cache_key("/conduit/embeddings", request, wire_format)
+        if (cached := await self._cached(key)) is not None:
+            return embeddings_format.decode(*cached)
+        response = await self._post(
+            "/conduit/embeddings",
+            request,
+            headers={"Accept": wire_format},
+            exclude_none=True,
+        )
+        content_type = response.headers.get("Content-Type", "")
+        await self._store(key, response)
+        return embeddings_format.decode(response.content, content_type)
+
+    # Background jobs
+    async def submit_job(self, request: JobRequest) -> JobStatus:
+        """Queue a batch or synthetic data job on the server and return its initial status"""
+        # Not retried: a lost response would otherwise queue the job twice
+        response = await self._post("/jobs", request, idempotent=False)
+        return JobStatus.model_validate_json(response.content)
+
+    async def get_job(self, job_id: str) -> JobStatus:
+        """Get the state and progress of a job"""
+        response = await self._request("GET", f"/jobs/{job_id}")
+        if response.status_code != 200:
+            handle_error_response(response)
+        return JobStatus.model_validate_json(response.content)
+
+    async def get_job_results(
+        self, job_id: str, offset: int = 0, limit: int = 1000
+    ) -> JobResults:
+        """Get a page of finished item results (available while the job is still running)"""
+        response = await self._request(
+            "GET",
+            f"/jobs/{job_id}/results",
+            params={"offset": offset, "limit": limit},
+        )
+        if response.status_code != 200:
+            handle_error_response(response)
+        return JobResults.model_validate_json(response.content)
+
+    async def cancel_job(self, job_id: str) -> JobStatus:
+        """Cancel a queued or running job; finished items are kept"""
+        response = await self._request("DELETE", f"/jobs/{job_id}")
+        if response.status_code != 200:
+            handle_error_response(response)
+        return JobStatus.model_validate_json(response.content)
+
+    async def wait_for_job(
+        self, job_id: str, poll_interval: float = 5.0, timeout: float | None = None
+    ) -> JobStatus:
+        """Poll a job until it completes, fails or is cancelled"""
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            status = await self.get_job(job_id)
+            if status.state in ("completed", "failed", "cancelled"):
+                return status
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Job {job_id} still {status.state} after {timeout}s")
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,295 @@
+"""
+Client-side chunking for arbitrarily long inputs.
+
+iter_batch / iter_embeddings (SiphonClient, worker threads) and aiter_batch / aiter_embeddings
+(AsyncSiphonClient, tasks) take an iterable of prompt strings, input-variable dicts or documents
+and:
+- read it lazily, a chunk at a time, so only the chunks in flight are held in memory
+- cut chunks by item count and by UTF-8 bytes, under the server's admission limits
+- send up to `concurrency` chunks at once and yield results one per input item, in input order
+- adapt the chunk size so each request takes about target_seconds, from observed latency
+- split a chunk in half and resend it if the server still rejects it as too large (413)
+
+A chunk that fails for any other reason raises from the iterator; items yielded before it are
+unaffected.
+"""
+
+from siphonserver.server.api.requests import (
+    ConduitRequest,
+    BatchRequest,
+    EmbeddingsRequest,
+)
+from siphonserver.server.api.responses import ConduitResponse, ConduitError
+from siphonserver.server.utils.exceptions import ErrorType
+from siphonserver.client.siphonclient import SiphonClient, SiphonServerException
+from siphonserver.client.async_siphonclient import AsyncSiphonClient
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+# Defaults sit well inside the server's admission limits (max_batch_items, max_prompt_bytes)
+DEFAULT_MAX_CHUNK_ITEMS = 1000
+DEFAULT_MAX_CHUNK_BYTES = 4_000_000
+
+
+class ChunkSizer:
+    """
+    Picks the next chunk size so a request takes about target_seconds.
+    Tracks an exponentially weighted per-item latency; the size at most doubles per observation
+    and is clamped to [minimum, maximum]. With adaptive=False the size stays at initial.
+    """
+
+    _SMOOTHING = 0.3
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = DEFAULT_MAX_CHUNK_ITEMS,
+        target_seconds: float = 20.0,
+        adaptive: bool = True,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.adaptive = adaptive
+        self.size = max(minimum, min(initial, maximum))
+        self._per_item: float | None = None
+        self._lock = threading.Lock()
+
+    def observe(self, items: int, seconds: float) -> None:
+        if not self.adaptive or items <= 0:
+            return
+        with self._lock:
+            per_item = seconds / items
+            if self._per_item is None:
+                self._per_item = per_item
+            else:
+                self._per_item += self._SMOOTHING * (per_item - self._per_item)
+            ideal = self.target_seconds / max(self._per_item, 1e-9)
+            self.size = int(max(self.minimum, min(ideal, self.size * 2, self.maximum)))
+
+    def rejected(self, items: int) -> None:
+        """The server refused a chunk of this many items as too large; stay below it."""
+        with self._lock:
+            self.maximum = max(self.minimum, min(self.maximum, items // 2))
+            self.size = min(self.size, self.maximum)
+
+
+def _item_bytes(item: str | dict[str, str]) -> int:
+    if isinstance(item, str):
+        return len(item.encode())
+    return sum(len(str(value).encode()) for value in item.values())
+
+
+def _chunks(items: Iterable, sizer: ChunkSizer, max_chunk_bytes: int) -> Iterator[list]:
+    """Pull items lazily into chunks of sizer.size items or max_chunk_bytes, whichever is first"""
+    iterator = iter(items)
+    while True:
+        chunk, size, nbytes = [], sizer.size, 0
+        for item in iterator:
+            chunk.append(item)
+            nbytes += _item_bytes(item)
+            if len(chunk) >= size or (max_chunk_bytes and nbytes >= max_chunk_bytes):
+                break
+        if not chunk:
+            return
+        yield chunk
+
+
+def _too_large(error: SiphonServerException) -> bool:
+    return error.server_error.error_type == ErrorType.BATCH_SIZE_EXCEEDED
+
+
+def _batch_request(
+    request: ConduitRequest, chunk: list, prompt_str: str | None
+) -> BatchRequest:
+    fields = request.model_dump(
+        exclude={"prompt_strings", "input_variables_list", "prompt_str"}
+    )
+    if isinstance(chunk[0], str):
+        return BatchRequest.model_validate({**fields, "prompt_strings": chunk})
+    return BatchRequest.model_validate(
+        {**fields, "input_variables_list": chunk, "prompt_str": prompt_str}
+    )
+
+
+def _timed_call(sizer: ChunkSizer, call: Callable[[list], list]) -> Callable[[list], list]:
+    def run(chunk: list) -> list:
+        start = time.perf_counter()
+        try:
+            results = call(chunk)
+        except SiphonServerException as e:
+            if not _too_large(e) or len(chunk) < 2:
+                raise
+            sizer.rejected(len(chunk))
+            middle = len(chunk) // 2
+            return run(chunk[:middle]) + run(chunk[middle:])
+        sizer.observe(len(chunk), time.perf_counter() - start)
+        return results
+
+    return run
+
+
+def _atimed_call(sizer: ChunkSizer, call):
+    async def run(chunk: list) -> list:
+        start = time.perf_counter()
+        try:
+            results = await call(chunk)
+        except SiphonServerException as e:
+            if not _too_large(e) or len(chunk) < 2:
+                raise
+            sizer.rejected(len(chunk))
+            middle = len(chunk) // 2
+            return await run(chunk[:middle]) + await run(chunk[middle:])
+        sizer.observe(len(chunk), time.perf_counter() - start)
+        return results
+
+    return run
+
+
+def _dispatch(chunks: Iterator[list], call: Callable[[list], list], concurrency: int) -> Iterator:
+    """
+    Run chunks on `concurrency` threads and yield their results in chunk order. Up to twice as
+    many chunks are queued so threads stay busy while the oldest chunk is awaited.
+    """
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="siphon-chunk")
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(call, chunk))
+            while len(pending) >= 2 * concurrency:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Stopped early (consumer break or an error): drop chunks that haven't started
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def _adispatch(chunks: Iterator[list], call, concurrency: int) -> AsyncIterator:
+    """Run up to `concurrency` chunks as tasks and yield their results in chunk order."""
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(asyncio.ensure_future(call(chunk)))
+            while len(pending) >= concurrency:
+                for result in await pending.popleft():
+                    yield result
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def iter_batch(
+    client: SiphonClient,
+    request: ConduitRequest,
+    items: Iterable[str] | Iterable[dict[str, str]],
+    prompt_str: str | None = None,
+    chunk_size: int = 100,
+    max_chunk_items: int = DEFAULT_MAX_CHUNK_ITEMS,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    concurrency: int = 4,
+    target_seconds: float = 20.0,
+    adaptive: bool = True,
+) -> Iterator[ConduitResponse | ConduitError]:
+    """
+    Run a query over prompt strings (or input-variable dicts rendered with prompt_str) through
+    /conduit/async in chunks, yielding one result per item in input order. `request` supplies
+    the model and options; its prompt fields are ignored. Size client.pool_size >= concurrency.
+    """
+    prompt_str = prompt_str or getattr(request, "prompt_str", None)
+    sizer = ChunkSizer(
+        chunk_size, maximum=max_chunk_items, target_seconds=target_seconds, adaptive=adaptive
+    )
+    call = _timed_call(
+        sizer, lambda chunk: client.query_async(_batch_request(request, chunk, prompt_str))
+    )
+    return _dispatch(_chunks(items, sizer, max_chunk_bytes), call, concurrency)
+
+
+def iter_embeddings(
+    client: SiphonClient,
+    model: str,
+    documents: Iterable[str],
+    chunk_size: int = 256,
+    max_chunk_items: int = DEFAULT_MAX_CHUNK_ITEMS,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    concurrency: int = 4,
+    target_seconds: float = 10.0,
+    adaptive: bool = True,
+) -> Iterator:
+    """
+    Embed documents in chunks over the binary float32 format, yielding one float32 vector
+    (a NumPy row) per document in input order.
+    """
+    sizer = ChunkSizer(
+        chunk_size, maximum=max_chunk_items, target_seconds=target_seconds, adaptive=adaptive
+    )
+    call = _timed_call(
+        sizer,
+        lambda chunk: list(
+            client.generate_embeddings_array(EmbeddingsRequest(model=model, documents=chunk))
+        ),
+    )
+    return _dispatch(_chunks(documents, sizer, max_chunk_bytes), call, concurrency)
+
+
+def aiter_batch(
+    client: AsyncSiphonClient,
+    request: ConduitRequest,
+    items: Iterable[str] | Iterable[dict[str, str]],
+    prompt_str: str | None = None,
+    chunk_size: int = 100,
+    max_chunk_items: int = DEFAULT_MAX_CHUNK_ITEMS,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    concurrency: int = 4,
+    target_seconds: float = 20.0,
+    adaptive: bool = True,
+) -> AsyncIterator[ConduitResponse | ConduitError]:
+    """iter_batch for AsyncSiphonClient: an async iterator of results in input order."""
+    prompt_str = prompt_str or getattr(request, "prompt_str", None)
+    sizer = ChunkSizer(
+        chunk_size, maximum=max_chunk_items, target_seconds=target_seconds, adaptive=adaptive
+    )
+
+    async def call(chunk: list) -> list:
+        return await client.query_async(_batch_request(request, chunk, prompt_str))
+
+    return _adispatch(
+        _chunks(items, sizer, max_chunk_bytes), _atimed_call(sizer, call), concurrency
+    )
+
+
+def aiter_embeddings(
+    client: AsyncSiphonClient,
+    model: str,
+    documents: Iterable[str],
+    chunk_size: int = 256,
+    max_chunk_items: int = DEFAULT_MAX_CHUNK_ITEMS,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    concurrency: int = 4,
+    target_seconds: float = 10.0,
+    adaptive: bool = True,
+) -> AsyncIterator:
+    """iter_embeddings for AsyncSiphonClient: an async iterator of vectors in input order."""
+    sizer = ChunkSizer(
+        chunk_size, maximum=max_chunk_items, target_seconds=target_seconds, adaptive=adaptive
+    )
+
+    async def call(chunk: list) -> list:
+        return list(
+            await client.generate_embeddings_array(
+                EmbeddingsRequest(model=model, documents=chunk)
+            )
+        )
+
+    return _adispatch(
+        _chunks(documents, sizer, max_chunk_bytes), _atimed_call(sizer, call), concurrency
+    )
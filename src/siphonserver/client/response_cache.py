@@ -0,0 +1,82 @@
+"""
+Opt-in client-side response cache.
+
+Successful response bodies for sync queries, synthetic data and embeddings are stored under the
+request's canonical hash (server.utils.hashing, the same one the server coalesces on) and the
+endpoint, in a TieredCache: a memory LRU in front of a SQLite file with TTL and size limits.
+Repeat runs of a script are then answered locally without a round trip. Bodies are kept as
+received and parsed on every hit, so cached results are the same types as live ones.
+
+Caching model output pins whatever the first run returned; leave it off where fresh samples
+matter, or clear() the cache.
+"""
+
+from pathlib import Path
+import base64
+import sqlite3
+
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.tiered_cache import TieredCache
+
+logger = get_logger(__name__)
+
+DEFAULT_PATH = Path.home() / ".siphonserver" / "client_cache.db"
+
+
+class ResponseCache:
+    """
+    Response bodies keyed by endpoint and request hash. Pass path=":memory:" for a
+    memory-only cache; ttl_seconds=0 keeps entries until they are evicted by size. The memory
+    tier is bounded by max_memory_mb as well as by item count, since one embeddings body can
+    be many megabytes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_PATH,
+        max_memory_items: int = 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_disk_mb: float = 1024,
+        max_memory_mb: float = 64,
+    ):
+        self.cache = TieredCache(
+            path,
+            max_memory_items=max_memory_items,
+            ttl_seconds=ttl_seconds,
+            max_disk_mb=max_disk_mb,
+            max_memory_mb=max_memory_mb,
+        )
+
+    @staticmethod
+    def key(path: str, digest: str, *extra: str) -> str:
+        """Cache key for a request to `path` whose hashing.request_hash is `digest`"""
+        return ":".join((path, digest, *extra))
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        """(body, content type) stored under key, or None"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        header, _, body = entry.partition("\n")
+        encoding, _, content_type = header.partition(" ")
+        if encoding == "base64":
+            return base64.b64decode(body), content_type
+        return body.encode(), content_type
+
+    def set(self, key: str, body: bytes, content_type: str) -> None:
+        # TieredCache holds text: JSON bodies are stored as is, binary ones base64-encoded
+        if content_type.startswith("application/json"):
+            entry = f"text {content_type}\n{body.decode()}"
+        else:
+            entry = f"base64 {content_type}\n{base64.b64encode(body).decode()}"
+        try:
+            self.cache.set(key, entry)
+        except sqlite3.Error as e:
+            # The server has already answered; a cache write failing mustn't fail the call
+            logger.warning(f"Could not cache response for {key}: {e}")
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -3,11 +3,17 @@ from siphonserver.server.api.requests import (
     BatchRequest,
     SyntheticDataRequest,
     EmbeddingsRequest,
+    JobRequest,
 )
 from siphonserver.server.api.responses import (
     ConduitResponse,
     ConduitError,
     EmbeddingsResponse,
+    StreamSummary,
+    JobStatus,
+    JobResults,
+    conduit_result_adapter,
+    conduit_results_adapter,
 )
 from siphon.synthetic_data.synthetic_data_classes import (
     SyntheticData,
@@ -15,15 +21,28 @@ from siphon.synthetic_data.synthetic_data_classes import (
 )
 from siphonserver.server.utils.logging_config import configure_logging
 from siphonserver.server.utils.exceptions import SiphonServerError
+from siphonserver.server.api import embeddings_format, content_encoding
+from siphonserver.server.utils import hashing
+from siphonserver.client.response_cache import ResponseCache
 from dbclients import get_network_context
+from collections.abc import Iterator
+from email.utils import parsedate_to_datetime
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 import requests
 import json
+import random
+import time
 
 logger = configure_logging()
 
 # Constants
 SIPHON_SERVER_DEFAULT_PORT = 8080
 SIPHON_SERVER_IP = get_network_context().siphon_server
+# Request bodies at least this large are compressed (large contexts, embedding batches)
+DEFAULT_COMPRESS_THRESHOLD = 64 * 1024
+# Statuses an idempotent call is retried on: load shedding (429) and unavailable (503)
+RETRY_STATUSES = frozenset({429, 503})
 
 
 class SiphonServerException(Exception):
@@ -39,84 +58,321 @@ class SiphonServerException(Exception):
         )
 
 
+def _retry_after_seconds(response) -> float | None:
+    """Retry-After as seconds (delta-seconds or HTTP-date form), or None if absent/invalid"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_seconds(
+    attempt: int, retry_after: float | None, backoff_base: float, backoff_max: float
+) -> float:
+    if retry_after is not None:
+        # Small jitter so clients shed together don't all come back at the same instant
+        return retry_after + random.uniform(0, backoff_base)
+    return random.uniform(0, min(backoff_max, backoff_base * 2**attempt))
+
+
+def encode_request(
+    model: BaseModel,
+    compress_threshold: int | None,
+    headers: dict[str, str] | None = None,
+    **dump_kwargs,
+) -> tuple[bytes, dict[str, str]]:
+    """
+    JSON body and headers for a request model, gzip-compressed once it reaches compress_threshold.
+    Always gzip, since every server reads it; zstd needs an optional package on the server.
+    """
+    body = model.model_dump_json(**dump_kwargs).encode()
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    if compress_threshold is not None and len(body) >= compress_threshold:
+        body = content_encoding.compress(body, content_encoding.GZIP)
+        headers["Content-Encoding"] = content_encoding.GZIP
+    return body, headers
+
+
+def handle_error_response(response) -> None:
+    """
+    Parse SiphonServerError from an error response (requests or httpx) and raise
+    SiphonServerException, falling back to the response's own raise_for_status()
+    """
+    try:
+        error_data = response.json()
+
+        # Check if it's our structured error format
+        if isinstance(error_data, dict) and "error_type" in error_data:
+            server_error = SiphonServerError.model_validate(error_data)
+
+            logger.error(
+                f"Server error [{server_error.request_id}]: {server_error.error_type}"
+            )
+            logger.error(f"Message: {server_error.message}")
+
+            if server_error.validation_errors:
+                logger.error(
+                    f"Validation errors: {json.dumps(server_error.validation_errors, indent=2)}"
+                )
+
+            if server_error.context:
+                logger.error(
+                    f"Context: {json.dumps(server_error.context, indent=2)}"
+                )
+
+            raise SiphonServerException(server_error)
+
+        # Fallback for non-structured errors
+        logger.error(
+            f"Non-structured error response: {json.dumps(error_data, indent=2)}"
+        )
+
+    except (json.JSONDecodeError, ValueError):
+        # Raw text response
+        logger.error(f"Raw error response: {response.text}")
+
+    # Still raise the original HTTP error
+    response.raise_for_status()
+
+
+def parse_synthetic_data(content: bytes) -> SyntheticDataUnion:
+    """Rebuild the SyntheticData subclass matching the response's sourcetype"""
+    from siphon.data.type_definitions.source_type import SourceType
+    from siphon.synthetic_data.synthetic_data_classes import SyntheticDataClasses
+
+    json_dict = json.loads(content)
+    sourcetype = SourceType(json_dict["sourcetype"])
+
+    # Find the right SyntheticData subclass
+    synthetic_data_class = None
+    for cls_candidate in SyntheticDataClasses:
+        if cls_candidate.__name__.replace("SyntheticData", "") == sourcetype.value:
+            synthetic_data_class = cls_candidate
+            break
+
+    if not synthetic_data_class:
+        # Fallback to base SyntheticData class
+        synthetic_data_class = SyntheticData
+
+    return synthetic_data_class.model_validate(json_dict)
+
+
+def parse_embeddings(content: bytes) -> EmbeddingsResponse | ConduitError:
+    try:
+        return EmbeddingsResponse.model_validate_json(content)
+    except ValueError:
+        return ConduitError.model_validate_json(content)
+
+
 class SiphonClient:
-    def __init__(self, base_url: str = ""):
+    def __init__(
+        self,
+        base_url: str = "",
+        compress_threshold: int | None = DEFAULT_COMPRESS_THRESHOLD,
+        pool_size: int = 10,
+        connect_timeout: float = 10.0,
+        read_timeout: float | None = 600.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        cache: ResponseCache | None = None,
+    ):
+        """
+        compress_threshold: request bodies of at least this many bytes are sent
+        gzip-compressed (None disables). Responses are decompressed transparently.
+        pool_size: keep-alive connections kept to the server (size it to the number of threads
+        sharing this client).
+        connect_timeout / read_timeout: seconds to establish a connection / between bytes of the
+        response (None waits forever); long generations need a generous read timeout.
+        max_retries, backoff_base, backoff_max: idempotent calls are retried on connection errors
+        and 429/503, waiting Retry-After when the server sends it and otherwise a jittered
+        exponential backoff (backoff_base * 2**attempt, capped at backoff_max).
+        cache: optional ResponseCache answering repeated sync queries, synthetic data and
+        embeddings requests locally.
+        """
         if base_url == "":
             self.base_url = self._get_url()
         else:
             self.base_url = base_url.rstrip("/")
+        self.compress_threshold = compress_threshold
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+
+        self.session = requests.Session()
+        # Retries are handled in _request so they can honour Retry-After and idempotency
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.session.close()
+
+    def __enter__(self) -> "SiphonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _get_url(self) -> str:
         """Get SiphonServer URL with same host detection logic as PostgreSQL"""
         return f"http://{SIPHON_SERVER_IP}:{SIPHON_SERVER_DEFAULT_PORT}"
 
-    def _handle_error_response(self, response: requests.Response) -> None:
-        """Parse SiphonServerError from response and raise appropriate exception"""
-        try:
-            error_data = response.json()
+    def _backoff(self, attempt: int, response: requests.Response | None) -> float:
+        retry_after = _retry_after_seconds(response) if response is not None else None
+        return _backoff_seconds(attempt, retry_after, self.backoff_base, self.backoff_max)
 
-            # Check if it's our structured error format
-            if isinstance(error_data, dict) and "error_type" in error_data:
-                server_error = SiphonServerError.model_validate(error_data)
-
-                logger.error(
-                    f"Server error [{server_error.request_id}]: {server_error.error_type}"
+    def _request(
+        self, method: str, path: str, idempotent: bool = True, **kwargs
+    ) -> requests.Response:
+        """
+        Send a request over the pooled session. Idempotent calls are retried on connection
+        errors and RETRY_STATUSES; the last response (or error) is returned (or raised) as is.
+        """
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = self.max_retries + 1 if idempotent else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                if last:
+                    raise
+                delay = self._backoff(attempt, None)
+                logger.warning(f"{method} {path} failed ({e}); retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or last:
+                    return response
+                delay = self._backoff(attempt, response)
+                logger.warning(
+                    f"{method} {path} returned {response.status_code}; retrying in {delay:.1f}s"
                 )
-                logger.error(f"Message: {server_error.message}")
+                response.close()
+            time.sleep(delay)
 
-                if server_error.validation_errors:
-                    logger.error(
-                        f"Validation errors: {json.dumps(server_error.validation_errors, indent=2)}"
-                    )
-
-                if server_error.context:
-                    logger.error(
-                        f"Context: {json.dumps(server_error.context, indent=2)}"
-                    )
+    def _post(
+        self,
+        path: str,
+        model: BaseModel,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+        idempotent: bool = True,
+        **dump_kwargs,
+    ) -> requests.Response:
+        """POST a request model as JSON, compressing the body once it reaches compress_threshold"""
+        body, headers = encode_request(model, self.compress_threshold, headers, **dump_kwargs)
+        return self._request(
+            "POST", path, idempotent, data=body, headers=headers, stream=stream
+        )
 
-                raise SiphonServerException(server_error)
+    def _handle_error_response(self, response: requests.Response) -> None:
+        """Parse SiphonServerError from response and raise appropriate exception"""
+        handle_error_response(response)
 
-            # Fallback for non-structured errors
-            logger.error(
-                f"Non-structured error response: {json.dumps(error_data, indent=2)}"
-            )
+    def _cached(self, key: str | None) -> tuple[bytes, str] | None:
+        if self.cache is None or key is None:
+            return None
+        return self.cache.get(key)
 
-        except (json.JSONDecodeError, ValueError):
-            # Raw text response
-            logger.error(f"Raw error response: {response.text}")
+    def _cache_key(self, path: str, request: BaseModel, *extra: str) -> str | None:
+        if self.cache is None:
+            return None
+        return ResponseCache.key(path, hashing.request_hash(request), *extra)
 
-        # Still raise the original HTTP error
-        response.raise_for_status()
+    def _store(self, key: str | None, response: requests.Response) -> None:
+        if key is not None:
+            self.cache.set(key, response.content, response.headers.get("Content-Type", ""))
 
     def get_status(self):
         """Get server status"""
-        response = requests.get(f"{self.base_url}/status")
+        response = self._request("GET", "/status")
         response.raise_for_status()
         return response.json()
 
     def query_sync(self, request: ConduitRequest) -> ConduitResponse | ConduitError:
         """Send a synchronous query to the server"""
-        response = requests.post(
-            f"{self.base_url}/conduit/sync", json=request.model_dump()
-        )
+        key = self._cache_key("/conduit/sync", request)
+        if (cached := self._cached(key)) is not None:
+            return conduit_result_adapter.validate_json(cached[0])
+        response = self._post("/conduit/sync", request)
         response.raise_for_status()
-        try:
-            return ConduitResponse.model_validate_json(response.text)
-        except Exception as e:
-            return ConduitError.model_validate_json(response.text)
+        result = conduit_result_adapter.validate_json(response.content)
+        if isinstance(result, ConduitResponse):
+            self._store(key, response)
+        return result
+
+    def query_sync_stream(self, request: ConduitRequest) -> Iterator[str | StreamSummary]:
+        """
+        Stream a synchronous query over server-sent events.
+        Yields each token as a str, then a final StreamSummary with the complete response,
+        usage and timing. Raises SiphonServerException if the server reports an error mid-stream.
+        """
+        with self._post(
+            "/conduit/sync/stream",
+            request,
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                self._handle_error_response(response)
+            event, data = "message", []
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[len("event:") :].strip()
+                elif line.startswith("data:"):
+                    data.append(line[len("data:") :].strip())
+                elif line == "" and data:
+                    payload = "\n".join(data)
+                    if event == "token":
+                        yield json.loads(payload)["text"]
+                    elif event == "summary":
+                        yield StreamSummary.model_validate_json(payload)
+                    elif event == "error":
+                        raise SiphonServerException(
+                            SiphonServerError.model_validate_json(payload)
+                        )
+                    event, data = "message", []
 
     def query_async(self, batch: BatchRequest) -> list[ConduitResponse | ConduitError]:
         """Send an asynchronous batch query to the server"""
-        response = requests.post(
-            f"{self.base_url}/conduit/async", json=batch.model_dump()
-        )
-        response.raise_for_status()
-        try:
-            return [
-                ConduitResponse.model_validate_json(item) for item in response.json()
-            ]
-        except Exception as e:
-            return [ConduitError.model_validate_json(item) for item in response.json()]
+        response = self._post("/conduit/async", batch)
+        if response.status_code != 200:
+            self._handle_error_response(response)
+        return conduit_results_adapter.validate_json(response.content)
+
+    def query_async_stream(
+        self, batch: BatchRequest
+    ) -> Iterator[tuple[int, ConduitResponse | ConduitError | SiphonServerError]]:
+        """
+        Stream a batch query, yielding (index, result) pairs as each item completes.
+        Results arrive in completion order; index is the item's position in the batch.
+        Items that failed server-side are yielded as SiphonServerError.
+        """
+        with self._post("/conduit/async/stream", batch, stream=True) as response:
+            if response.status_code != 200:
+                self._handle_error_response(response)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record["type"] == "response":
+                    result = ConduitResponse.model_validate(record["result"])
+                elif record["type"] == "error":
+                    result = ConduitError.model_validate(record["result"])
+                else:
+                    result = SiphonServerError.model_validate(record["result"])
+                yield record["index"], result
 
     def generate_synthetic_data(
         self, request: SyntheticDataRequest
@@ -125,22 +381,25 @@ class SiphonClient:
         endpoint = f"{self.base_url}/siphon/synthetic_data"
 
         # Log the request details
-        request_data = request.model_dump()
         logger.info(f"Sending request to {endpoint}")
-        logger.debug(f"Request payload keys: {list(request_data.keys())}")
+        logger.debug(f"Request payload keys: {list(type(request).model_fields)}")
         logger.debug(f"Context type: {type(request.context).__name__}")
         logger.debug(f"Model: {request.model}")
 
-        # Log a hash of the request for duplicate detection
-        import hashlib
-
-        request_hash = hashlib.md5(
-            json.dumps(request_data, sort_keys=True).encode()
-        ).hexdigest()[:8]
+        # Log a hash of the request for duplicate detection (same canonical hash the server coalesces on)
+        digest = hashing.request_hash(request)
+        request_hash = digest[:8]
         logger.info(f"Request hash: {request_hash}")
 
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.key("/siphon/synthetic_data", digest)
+            if (cached := self._cached(key)) is not None:
+                logger.info(f"Synthetic data served from client cache [hash: {request_hash}]")
+                return parse_synthetic_data(cached[0])
+
         try:
-            response = requests.post(endpoint, json=request_data)
+            response = self._post("/siphon/synthetic_data", request)
 
             # Log response details before checking status
             logger.info(f"Response status: {response.status_code}")
@@ -155,30 +414,8 @@ class SiphonClient:
                 self._handle_error_response(response)
 
             # 3. Reconstruct SyntheticData
-            from siphon.data.type_definitions.source_type import SourceType
-
-            json_dict = response.json()
-            synthetic_data = None
-            sourcetype = SourceType(json_dict["sourcetype"])
-            from siphon.synthetic_data.synthetic_data_classes import (
-                SyntheticDataClasses,
-            )
-
-            # Find the right SyntheticData subclass
-            synthetic_data_class = None
-            for cls_candidate in SyntheticDataClasses:
-                if (
-                    cls_candidate.__name__.replace("SyntheticData", "")
-                    == sourcetype.value
-                ):
-                    synthetic_data_class = cls_candidate
-                    break
-
-            if not synthetic_data_class:
-                # Fallback to base SyntheticData class
-                synthetic_data_class = SyntheticData
-
-            synthetic_data = synthetic_data_class.model_validate(json_dict)
+            synthetic_data = parse_synthetic_data(response.content)
+            self._store(key, response)
             logger.info(f"Successfully received synthetic data [hash: {request_hash}]")
             return synthetic_data
         except SiphonServerException:
@@ -202,13 +439,89 @@ class SiphonClient:
         """
         Generate embeddings using the server.
         """
-        response = requests.post(
-            f"{self.base_url}/conduit/embeddings",
-            json=request.model_dump(),
-        )
+        key = self._cache_key("/conduit/embeddings", request)
+        if (cached := self._cached(key)) is not None:
+            return parse_embeddings(cached[0])
+        response = self._post("/conduit/embeddings", request)
         response.raise_for_status()
-        try:
-            return EmbeddingsResponse.model_validate_json(response.text)
+        result = parse_embeddings(response.content)
+        if isinstance(result, EmbeddingsResponse):
+            self._store(key, response)
+        return result
 
-        except Exception as e:
-            return ConduitError.model_validate_json(response.text)
+    def generate_embeddings_array(
+        self,
+        request: EmbeddingsRequest,
+        wire_format: str = embeddings_format.FLOAT32,
+    ):
+        """
+        Generate embeddings as a float32 NumPy array of shape (documents, dim).
+        The server sends a binary payload (raw float32 or .npy) which is decoded without an
+        intermediate Python list. Use EmbeddingsRequest(documents=[...]) to skip sending
+        ids and metadatas.
+        """
+        if wire_format not in embeddings_format.BINARY_FORMATS:
+            raise ValueError(f"Unsupported embeddings format: {wire_format}")
+        key = self._cache_key("/conduit/embeddings", request, wire_format)
+        if (cached := self._cached(key)) is not None:
+            return embeddings_format.decode(*cached)
+        response = self._post(
+            "/conduit/embeddings",
+            request,
+            headers={"Accept": wire_format},
+            exclude_none=True,
+        )
+        if response.status_code != 200:
+            self._handle_error_response(response)
+        content_type = response.headers.get("Content-Type", "")
+        self._store(key, response)
+        return embeddings_format.decode(response.content, content_type)
+
+    # Background jobs
+    def submit_job(self, request: JobRequest) -> JobStatus:
+        """Queue a batch or synthetic data job on the server and return its initial status"""
+        # Not retried: a lost response would otherwise queue the job twice
+        response = self._post("/jobs", request, idempotent=False)
+        if response.status_code != 200:
+            self._handle_error_response(response)
+        return JobStatus.model_validate_json(response.content)
+
+    def get_job(self, job_id: str) -> JobStatus:
+        """Get the state and progress of a job"""
+        response = self._request("GET", f"/jobs/{job_id}")
+        if response.status_code != 200:
+            self._handle_error_response(response)
+        return JobStatus.model_validate_json(response.content)
+
+    def get_job_results(
+        self, job_id: str, offset: int = 0, limit: int = 1000
+    ) -> JobResults:
+        """Get a page of finished item results (available while the job is still running)"""
+        response = self._request(
+            "GET",
+            f"/jobs/{job_id}/results",
+            params={"offset": offset, "limit": limit},
+        )
+        if response.status_code != 200:
+            self._handle_error_response(response)
+        return JobResults.model_validate_json(response.content)
+
+    def cancel_job(self, job_id: str) -> JobStatus:
+        """Cancel a queued or running job; finished items are kept"""
+        response = self._request("DELETE", f"/jobs/{job_id}")
+        if response.status_code != 200:
+            self._handle_error_response(response)
+        return JobStatus.model_validate_json(response.content)
+
+    def wait_for_job(
+        self, job_id: str, poll_interval: float = 5.0, timeout: float | None = None
+    ) -> JobStatus:
+        """Poll a job until it completes, fails or is cancelled"""
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            status = self.get_job(job_id)
+            if status.state in ("completed", "failed", "cancelled"):
+                return status
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Job {job_id} still {status.state} after {timeout}s")
+            time.sleep(poll_interval)
@@ -0,0 +1,171 @@
+"""
+HTTP body compression shared by the server and the client: gzip always, zstd when available.
+
+- Requests: the client compresses bodies above a size threshold and labels them with
+  Content-Encoding; the server decompresses them (see server.utils.middleware).
+- Responses: the server compresses non-streaming bodies above a threshold with the best encoding
+  the client lists in Accept-Encoding.
+
+zstd comes from the standard library's compression.zstd (Python 3.14+) or the zstandard package;
+without either, only gzip is used and offered.
+"""
+
+from functools import cache
+import gzip
+import zlib
+
+GZIP = "gzip"
+ZSTD = "zstd"
+IDENTITY = "identity"
+
+_GZIP_LEVEL = 5
+_ZSTD_LEVEL = 3
+_ZSTD_FEED = 16 * 1024  # Compressed bytes per step when the decoder can't bound its output
+
+
+class DecompressedTooLarge(ValueError):
+    """The body decompresses to more than the allowed size."""
+
+
+@cache
+def _zstd_codec():
+    """(compress, decompress(data, limit), error type) for the available zstd module, or None."""
+    try:
+        from compression import zstd
+    except ImportError:
+        pass
+    else:
+
+        def decompress(data: bytes, limit: int) -> bytes:
+            chunks, total = [], 0
+            while True:
+                decompressor = zstd.ZstdDecompressor()
+                chunk = decompressor.decompress(data, limit - total if limit else -1)
+                chunks.append(chunk)
+                total += len(chunk)
+                if limit and total >= limit:
+                    break  # Over the size limit; the caller reports it
+                if not decompressor.eof:
+                    raise ValueError("Invalid zstd body: truncated")
+                # Concatenated frames are one valid zstd stream
+                data = decompressor.unused_data
+                if not data:
+                    break
+            return b"".join(chunks)
+
+        return (lambda data: zstd.compress(data, level=_ZSTD_LEVEL)), decompress, zstd.ZstdError
+
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    def decompress(data: bytes, limit: int) -> bytes:
+        # zstandard's decompressobj has no output limit, so feed it small slices of input
+        chunks, total = [], 0
+        while True:
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+            for start in range(0, len(data), _ZSTD_FEED):
+                chunk = decompressor.decompress(data[start : start + _ZSTD_FEED])
+                chunks.append(chunk)
+                total += len(chunk)
+                if limit and total >= limit:
+                    return b"".join(chunks)  # Over the size limit; the caller reports it
+                if decompressor.eof:
+                    data = decompressor.unused_data + data[start + _ZSTD_FEED :]
+                    break
+            else:
+                raise ValueError("Invalid zstd body: truncated")
+            if not data:
+                break
+        return b"".join(chunks)
+
+    return (
+        lambda data: zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data),
+        decompress,
+        zstandard.ZstdError,
+    )
+
+
+def supported() -> tuple[str, ...]:
+    """Encodings this process can read and write, most preferred first."""
+    return (ZSTD, GZIP) if _zstd_codec() is not None else (GZIP,)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Best supported encoding listed in an Accept-Encoding header (ignoring q=0), or None."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        params = params.strip().lower()
+        try:
+            quality = float(params.removeprefix("q=")) if params.startswith("q=") else 1.0
+        except ValueError:
+            quality = 1.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    for encoding in supported():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == GZIP:
+        return gzip.compress(data, compresslevel=_GZIP_LEVEL, mtime=0)
+    if encoding == ZSTD:
+        codec = _zstd_codec()
+        if codec is None:
+            raise ValueError("zstd is not available (pip install zstandard)")
+        return codec[0](data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def _gunzip(data: bytes, limit: int) -> bytes:
+    """Decode every member of a (possibly multi-member) gzip body, stopping at limit bytes."""
+    chunks, total = [], 0
+    while True:
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        try:
+            chunk = decompressor.decompress(data, limit - total if limit else 0)
+        except zlib.error as e:
+            raise ValueError(f"Invalid gzip body: {e}") from e
+        chunks.append(chunk)
+        total += len(chunk)
+        if limit and total >= limit:
+            break  # Over the size limit; the caller reports it
+        if not decompressor.eof:
+            raise ValueError("Invalid gzip body: truncated")
+        # Concatenated members are one valid gzip stream
+        data = decompressor.unused_data
+        if not data:
+            break
+    return b"".join(chunks)
+
+
+def decompress(data: bytes, encoding: str, max_size: int = 0) -> bytes:
+    """
+    Decode a request body. Raises ValueError for an unknown encoding or corrupt data and
+    DecompressedTooLarge when the output would exceed max_size (0 = unlimited).
+    """
+    limit = max_size + 1 if max_size else 0
+    if encoding == GZIP:
+        output = _gunzip(data, limit)
+    elif encoding == ZSTD:
+        codec = _zstd_codec()
+        if codec is None:
+            raise ValueError("zstd is not available")
+        _, zstd_decompress, zstd_error = codec
+        try:
+            output = zstd_decompress(data, limit)
+        except zstd_error as e:
+            raise ValueError(f"Invalid zstd body: {e}") from e
+    elif encoding == IDENTITY:
+        output = data
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    if max_size and len(output) > max_size:
+        raise DecompressedTooLarge(f"Body decompresses to more than {max_size} bytes")
+    return output
@@ -0,0 +1,99 @@
+"""
+Binary wire formats for /conduit/embeddings, negotiated via the Accept header.
+
+- application/json (default): EmbeddingsResponse
+- application/x-siphon-float32: 8-byte little-endian header (uint32 rows, uint32 dim)
+  followed by rows * dim little-endian float32 values
+- application/x-npy: a NumPy .npy file holding a float32 (rows, dim) array
+
+NumPy is only required when a binary format is used.
+"""
+
+import io
+import struct
+
+JSON = "application/json"
+FLOAT32 = "application/x-siphon-float32"
+NPY = "application/x-npy"
+BINARY_FORMATS = (FLOAT32, NPY)
+
+SHAPE_HEADER = "X-Embeddings-Shape"
+_FLOAT32_HEADER = struct.Struct("<II")
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "numpy is required for binary embeddings formats (pip install numpy)"
+        ) from e
+    return np
+
+
+def _quality(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 1.0
+    return 1.0
+
+
+def negotiate(accept: str | None) -> str:
+    """
+    Pick the response format from an Accept header: the listed format with the highest q-value
+    (earliest on a tie), ignoring q=0. Wildcards stand for JSON; anything unrecognised means JSON.
+    """
+    if not accept:
+        return JSON
+    best, best_quality = JSON, 0.0
+    for part in accept.split(","):
+        media_type, *params = part.split(";")
+        media_type = media_type.strip().lower()
+        if media_type in ("*/*", "application/*"):
+            media_type = JSON
+        elif media_type not in BINARY_FORMATS and media_type != JSON:
+            continue
+        quality = _quality(params)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+def encode(embeddings, media_type: str) -> tuple[bytes, tuple[int, int]]:
+    """Encode a (rows, dim) list/array of vectors; returns the payload and its shape."""
+    np = _numpy()
+    array = np.asarray(embeddings, dtype="<f4")
+    if array.size == 0:
+        array = array.reshape(0, 0)
+    if array.ndim != 2:
+        raise ValueError(f"Expected 2-D embeddings, got shape {array.shape}")
+    rows, dim = array.shape
+
+    if media_type == FLOAT32:
+        payload = _FLOAT32_HEADER.pack(rows, dim) + array.tobytes(order="C")
+    elif media_type == NPY:
+        buffer = io.BytesIO()
+        np.save(buffer, array, allow_pickle=False)
+        payload = buffer.getvalue()
+    else:
+        raise ValueError(f"Unsupported embeddings format: {media_type}")
+    return payload, (rows, dim)
+
+
+def decode(payload: bytes, media_type: str):
+    """Decode a binary payload straight into a float32 (rows, dim) NumPy array."""
+    np = _numpy()
+    media_type = media_type.split(";")[0].strip().lower()
+    if media_type == FLOAT32:
+        rows, dim = _FLOAT32_HEADER.unpack_from(payload)
+        array = np.frombuffer(
+            payload, dtype="<f4", count=rows * dim, offset=_FLOAT32_HEADER.size
+        )
+        return array.reshape(rows, dim)
+    if media_type == NPY:
+        return np.load(io.BytesIO(payload), allow_pickle=False)
+    raise ValueError(f"Unsupported embeddings format: {media_type}")
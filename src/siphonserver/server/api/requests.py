@@ -2,6 +2,7 @@
 ConduitRequest,
 BatchRequest,
 SyntheticDataRequest,
+JobRequest,
 """
 
 from conduit.request.request import Request as ConduitRequest
@@ -10,6 +11,8 @@ from siphon.context.context_classes import ContextUnion
 from pydantic import BaseModel, Field, model_validator
 from typing import Any
 
+from siphonserver.server.utils.timing import stage, DESERIALIZE
+
 
 class BatchRequest(ConduitRequest):
     """
@@ -54,6 +57,11 @@ class SyntheticDataRequest(BaseModel):
     @model_validator(mode="before")
     @classmethod
     def deserialize_context(cls, data):
+        with stage(DESERIALIZE):
+            return cls._deserialize_context(data)
+
+    @staticmethod
+    def _deserialize_context(data):
         if isinstance(data, dict) and "context" in data:
             context_data = data["context"]
             if isinstance(context_data, dict):
@@ -77,10 +85,57 @@ class EmbeddingsRequest(BaseModel):
         ...,
         description="The embedding model to use for generating embeddings.",
     )
-    batch: ChromaBatch = Field(
-        ...,
+    batch: ChromaBatch | None = Field(
+        default=None,
         description="Batch of documents to generate embeddings for.",
     )
+    documents: list[str] | None = Field(
+        default=None,
+        description="Bare documents to embed; avoids sending ids and metadatas.",
+    )
+
+    @model_validator(mode="after")
+    def _exactly_one(self):
+        if (self.batch is None) == (self.documents is None):
+            raise ValueError("Provide exactly one of 'batch' or 'documents'.")
+        return self
+
+    @property
+    def texts(self) -> list[str]:
+        """The documents to embed, whichever way they were supplied."""
+        if self.documents is not None:
+            return self.documents
+        return list(self.batch.documents)
+
+
+class JobRequest(BaseModel):
+    """
+    Submit a long-running batch as a background job.
+    Exactly one of 'batch' or 'synthetic_data' must be provided.
+    """
+
+    batch: BatchRequest | None = Field(
+        default=None, description="Batch of conduit queries to run item by item."
+    )
+    synthetic_data: list[SyntheticDataRequest] | None = Field(
+        default=None, description="Synthetic data requests to run item by item."
+    )
+
+    @model_validator(mode="after")
+    def _exactly_one(self):
+        if (self.batch is None) == (not self.synthetic_data):
+            raise ValueError("Provide exactly one of 'batch' or 'synthetic_data'.")
+        return self
+
+    @property
+    def kind(self) -> str:
+        return "batch" if self.batch is not None else "synthetic_data"
+
+    @property
+    def total(self) -> int:
+        if self.batch is not None:
+            return len(self.batch.prompt_strings or self.batch.input_variables_list)
+        return len(self.synthetic_data)
 
 
 class CuratorRequest(BaseModel):
@@ -110,5 +165,6 @@ Requests = {
     "BatchRequest": BatchRequest,
     "SiphonSyntheticDataRequest": SyntheticDataRequest,
     "EmbeddingsRequest": EmbeddingsRequest,
+    "JobRequest": JobRequest,
     "CuratorRequest": CuratorRequest,
 }
@@ -3,24 +3,72 @@ StatusResponse,
 ConduitResponse,
 ConduitError,
 SyntheticData,
+StreamSummary,
+JobStatus,
+JobResults,
 """
 
 from conduit.result.response import Response as ConduitResponse
 from conduit.result.error import ConduitError
 from siphon.data.synthetic_data import SyntheticData
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Annotated
 
 
 class StatusResponse(BaseModel):
     """Server status response"""
 
     status: str = Field(
-        ..., description="Server status: 'healthy', 'degraded', 'error'"
+        ..., description="Server status: 'starting', 'healthy', 'degraded', 'error'"
     )
     message: str = Field(..., description="Status message")
     models_available: list = Field(..., description="Available models by provider")
     gpu_enabled: bool = Field(..., description="Whether GPU acceleration is available")
     uptime: float | None = Field(None, description="Server uptime in seconds")
+    checked_at: float | None = Field(
+        None, description="When the backends were last probed (unix seconds)"
+    )
+    executors: dict[str, dict] = Field(
+        default_factory=dict,
+        description="Per-executor running/queued counts and saturation",
+    )
+    model_registry: dict = Field(
+        default_factory=dict,
+        description="Warm model registry contents and hit/miss/eviction counters",
+    )
+    embedding_batcher: dict = Field(
+        default_factory=dict,
+        description="Embedding micro-batching request/batch/document counters",
+    )
+    singleflight: dict[str, dict] = Field(
+        default_factory=dict,
+        description="Backend calls made vs. duplicate in-flight requests coalesced, per service",
+    )
+    caches: dict[str, dict] = Field(
+        default_factory=dict, description="Result cache hit/miss counters, per cache"
+    )
+    admission: dict = Field(
+        default_factory=dict,
+        description="Admission control in-flight count and admitted/rejected counters",
+    )
+    model_residency: dict = Field(
+        default_factory=dict,
+        description="Local models the scheduler considers loaded, swap count and estimated time lost to swaps",
+    )
+    warmup: dict = Field(
+        default_factory=dict,
+        description="Warm-up progress, warm/failed models and traffic pre-warm candidates",
+    )
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness probe result; served with 503 when not ready"""
+
+    ready: bool = Field(..., description="Whether the server should receive traffic")
+    checks: dict[str, bool] = Field(
+        default_factory=dict, description="Individual readiness checks"
+    )
+    detail: dict = Field(default_factory=dict, description="Supporting details")
 
 
 class EmbeddingsResponse(BaseModel):
@@ -31,10 +79,74 @@ class EmbeddingsResponse(BaseModel):
     )
 
 
+class StreamSummary(BaseModel):
+    """Final event of a streamed /conduit/sync query"""
+
+    response: ConduitResponse | ConduitError | None = Field(
+        None, description="Complete response, when the backend returns one"
+    )
+    content: str = Field(..., description="Full text assembled from streamed tokens")
+    model: str = Field(..., description="Model that produced the stream")
+    usage: dict = Field(
+        default_factory=dict, description="Token usage reported by the backend"
+    )
+    time_to_first_token: float | None = Field(
+        None, description="Seconds from request start to the first token"
+    )
+    duration: float = Field(..., description="Total seconds for the stream")
+
+
+class JobStatus(BaseModel):
+    """State and progress of a background job"""
+
+    job_id: str = Field(..., description="Job identifier")
+    kind: str = Field(..., description="'batch' or 'synthetic_data'")
+    state: str = Field(
+        ..., description="'queued', 'running', 'completed', 'failed' or 'cancelled'"
+    )
+    total: int = Field(..., description="Number of items in the job")
+    completed: int = Field(0, description="Items finished successfully")
+    failed: int = Field(0, description="Items that raised an exception")
+    created_at: float = Field(..., description="Submission time (unix seconds)")
+    updated_at: float = Field(..., description="Last state change (unix seconds)")
+    error: str | None = Field(None, description="Job-level failure message")
+
+
+class JobItemResult(BaseModel):
+    """Result of one job item"""
+
+    index: int = Field(..., description="Position of the item in the submitted job")
+    type: str = Field(
+        ...,
+        description="'response', 'error', 'synthetic_data' or 'exception' (SiphonServerError)",
+    )
+    result: dict = Field(..., description="Serialized result for the item")
+
+
+class JobResults(BaseModel):
+    """Page of (possibly partial) job results, ordered by item index"""
+
+    job: JobStatus
+    results: list[JobItemResult] = Field(default_factory=list)
+
+
+# Parsers for /conduit/sync and /conduit/async bodies: validate straight from JSON bytes in
+# pydantic-core, trying ConduitResponse before ConduitError for each result
+ConduitResult = Annotated[
+    ConduitResponse | ConduitError, Field(union_mode="left_to_right")
+]
+conduit_result_adapter = TypeAdapter(ConduitResult)
+conduit_results_adapter = TypeAdapter(list[ConduitResult])
+
+
 Responses = {
     "StatusResponse": StatusResponse,
+    "ReadinessResponse": ReadinessResponse,
     "ConduitResponse": ConduitResponse,
     "ConduitError": ConduitError,
     "SyntheticData": SyntheticData,
     "EmbeddingsResponse": EmbeddingsResponse,
+    "StreamSummary": StreamSummary,
+    "JobStatus": JobStatus,
+    "JobResults": JobResults,
 }
@@ -2,14 +2,19 @@
 Main orchestrator for the Siphon & Conduit API server.
 """
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, HTTPException, Header
+from fastapi.responses import (
+    JSONResponse,
+    Response,
+    StreamingResponse,
+    PlainTextResponse,
+)
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from pathlib import Path
 from pydantic import ValidationError
-import uvicorn
+import asyncio
 import time
 import json
 
@@ -21,34 +26,87 @@ from siphonserver.server.api.requests import (
     BatchRequest,
     SyntheticDataRequest,
     EmbeddingsRequest,
+    JobRequest,
 )
 from siphonserver.server.api.responses import (
     StatusResponse,
     ConduitResponse,
     ConduitError,
     EmbeddingsResponse,
+    JobStatus,
+    JobResults,
+    ReadinessResponse,
 )
 
+from siphonserver.server.api import embeddings_format
+
 ## Utils
-from siphonserver.server.utils.exceptions import SiphonServerError, ErrorType
+from siphonserver.server.utils.exceptions import (
+    SiphonServerError,
+    SiphonServerHTTPError,
+    ErrorType,
+)
+from siphonserver.server.utils.admission import admission, get_admission
+from siphonserver.server.utils.deadline import DeadlineExceeded
+from siphonserver.server.utils.scheduler import INTERACTIVE, BULK
 from siphonserver.server.utils.logging_config import configure_logging
+from siphonserver.server.utils.config import get_config, available_cpus
+from siphonserver.server.utils.conduit_cache import get_conduit_cache
+from siphonserver.server.utils.executors import (
+    start_engine,
+    shutdown_engine,
+    get_engine,
+    LLM,
+    EMBEDDINGS,
+    SYNTHETIC,
+)
+from siphonserver.server.utils.model_registry import get_registry
+from siphonserver.server.utils.singleflight import singleflight_stats
+from siphonserver.server.utils.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    RequestContextMiddleware,
+    TimedRoute,
+)
+from siphonserver.server.utils.json_response import PydanticJSONResponse
+from siphonserver.server.utils import metrics
 
 ## Services
-from siphonserver.server.services.get_status import get_status_service
-from siphonserver.server.services.conduit_async import conduit_async_service
-from siphonserver.server.services.conduit_sync import conduit_sync_service
+from siphonserver.server.services.health import (
+    start_health_prober,
+    stop_health_prober,
+    get_health_prober,
+)
+from siphonserver.server.services.conduit_async import (
+    conduit_async_service,
+    conduit_async_stream_service,
+)
+from siphonserver.server.services.conduit_sync import (
+    conduit_sync_service,
+    conduit_sync_stream_service,
+)
 from siphonserver.server.services.generate_synthetic_data import generate_synthetic_data
-from siphonserver.server.services.generate_embeddings import generate_embeddings_service
-
-# Response/request models
-from conduit.batch import ModelAsync, ConduitCache
+from siphonserver.server.services.generate_embeddings import (
+    generate_embeddings_service,
+    embed_request,
+)
+from siphonserver.server.services.embedding_batcher import get_batcher
+from siphonserver.server.services.synthetic_data_cache import get_synthetic_data_cache
+from siphonserver.server.services.embedding_cache import get_embedding_cache
+from siphonserver.server.services.warmup import (
+    start_warmup_manager,
+    stop_warmup_manager,
+    get_warmup_manager,
+)
+from siphonserver.server.services.jobs import (
+    start_job_manager,
+    stop_job_manager,
+    get_job_manager,
+)
 
 # Setup logging
 logger = configure_logging()
 
-# Set up cache
-ModelAsync.conduit_cache = ConduitCache(name="siphonserver")
-
 # Add at module level
 startup_time = time.time()
 
@@ -58,13 +116,27 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 SiphonServer starting up...")
     logger.info("🔥 GPU acceleration enabled for local models")
-    from conduit.sync import Model
-
-    _ = Model._odometer_registry  # Initialize to load models and GPU resource
+    # Conduit models, the conduit cache and torch load on first use (the health probe starts
+    # right away, off the event loop), so /livez answers as soon as the app is up
+    start_engine()
+    start_warmup_manager()
+    await start_job_manager()
+    start_health_prober(startup_time)
 
     yield
-    # Shutdown
+    # Shutdown: uvicorn has already closed the listeners and waited out in-flight requests
+    # (timeout_graceful_shutdown); let running jobs finish, then stop
     logger.info("🛑 SiphonServer shutting down...")
+    config = get_config()
+    await stop_health_prober()
+    if not await get_job_manager().drain(config.job_drain_timeout_seconds):
+        logger.warning(
+            f"Jobs still running after {config.job_drain_timeout_seconds}s; "
+            "they will resume on the next start"
+        )
+    await stop_job_manager()
+    await stop_warmup_manager()
+    await asyncio.to_thread(shutdown_engine)
 
 
 # Set up FastAPI app
@@ -74,6 +146,11 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
 )
+# Endpoints mark entry/exit so validation and serialization show up in Server-Timing
+app.router.route_class = TimedRoute
+
+# Per-route request counts and latency for /metrics
+app.add_middleware(MetricsMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -82,37 +159,158 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Server-Timing"],
 )
 
+# gzip/zstd request bodies are decoded and large responses encoded per Accept-Encoding
+app.add_middleware(
+    CompressionMiddleware,
+    min_bytes=get_config().response_compression_min_bytes,
+    max_decompressed_bytes=get_config().max_decompressed_request_bytes,
+    compress_responses=get_config().response_compression_enabled,
+)
+
+# Outermost: X-Request-ID and per-stage Server-Timing for every request
+app.add_middleware(RequestContextMiddleware)
+
+
+# Metrics collected at scrape time
+def _collect_metrics():
+    for pool, stats in get_engine().stats().items():
+        metrics.EXECUTOR_QUEUED.set(stats["queued"], pool=pool)
+        metrics.EXECUTOR_RUNNING.set(stats["running"], pool=pool)
+        metrics.EXECUTOR_WORKERS.set(stats["max_workers"], pool=pool)
+        for priority, scheduler in stats["scheduler"].items():
+            metrics.SCHEDULER_WAITING.set(scheduler["waiting"], pool=pool, priority=priority)
+    metrics.RESIDENT_MODELS.set(len(get_engine().residency.stats()["resident"]))
+    registry = get_registry().stats()
+    metrics.set_cache_stats("model_registry", registry["hits"], registry["misses"])
+    synthetic_data_cache = get_synthetic_data_cache()
+    if synthetic_data_cache is not None:
+        stats = synthetic_data_cache.stats()
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        metrics.set_cache_stats("synthetic_data", hits, stats["misses"])
+    embedding_cache = get_embedding_cache()
+    if embedding_cache is not None:
+        stats = embedding_cache.stats()
+        metrics.set_cache_stats("embeddings", stats["hits"], stats["misses"])
+    conduit_cache = get_conduit_cache()
+    if conduit_cache is not None:
+        stats = conduit_cache.stats()
+        metrics.set_cache_stats("conduit", stats["hits"], stats["misses"])
+
+
+metrics.REGISTRY.add_collector(_collect_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of request, model, executor and cache metrics"""
+    # Collectors read SQLite-backed cache stats, so render off the event loop
+    return PlainTextResponse(
+        await asyncio.to_thread(metrics.REGISTRY.render),
+        media_type="text/plain; version=0.0.4",
+    )
+
 
-# Status endpoint
+# Status endpoints
 @app.get("/status", response_model=StatusResponse)
 async def get_status():
-    return get_status_service(startup_time)
+    """Latest background health snapshot plus live executor, registry and cache counters"""
+    status = get_health_prober().status()
+    status.executors = get_engine().stats()
+    status.model_registry = get_registry().stats()
+    status.embedding_batcher = get_batcher().stats()
+    status.singleflight = singleflight_stats()
+    status.admission = get_admission().stats()
+    status.model_residency = get_engine().residency.stats()
+    warmup = get_warmup_manager()
+    if warmup is not None:
+        status.warmup = warmup.stats()
+    status.caches = await asyncio.to_thread(_cache_stats)
+    return status
+
+
+def _cache_stats() -> dict[str, dict]:
+    """Result cache counters; opening the caches and reading their stats touch SQLite."""
+    caches = {}
+    synthetic_data_cache = get_synthetic_data_cache()
+    if synthetic_data_cache is not None:
+        caches["synthetic_data"] = synthetic_data_cache.stats()
+    embedding_cache = get_embedding_cache()
+    if embedding_cache is not None:
+        caches["embeddings"] = embedding_cache.stats()
+    conduit_cache = get_conduit_cache()
+    if conduit_cache is not None:
+        caches["conduit"] = conduit_cache.stats()
+    return caches
+
+
+@app.get("/livez")
+async def livez():
+    """Liveness: the event loop is responsive"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz", response_model=ReadinessResponse)
+async def readyz():
+    """Readiness: backends probed and reachable, executors not backed up"""
+    readiness = get_health_prober().readiness()
+    status_code = 200 if readiness.ready else 503
+    return JSONResponse(status_code=status_code, content=readiness.model_dump())
 
 
 # Conduit endpoints
-@app.post("/conduit/sync")
-async def conduit_sync(request: ConduitRequest) -> ConduitResponse | ConduitError:
-    return conduit_sync_service(request)
+# Routes with potentially large bodies return PydanticJSONResponse directly, so FastAPI skips
+# re-validating and re-encoding the result; response_model still documents the schema.
+@app.post(
+    "/conduit/sync",
+    response_model=ConduitResponse | ConduitError,
+    dependencies=[admission(LLM, INTERACTIVE)],
+)
+async def conduit_sync(request: ConduitRequest, http_request: Request) -> PydanticJSONResponse:
+    await get_admission().check_body(http_request)
+    return PydanticJSONResponse(await conduit_sync_service(request))
+
+
+@app.post("/conduit/sync/stream", dependencies=[admission(LLM, INTERACTIVE)])
+async def conduit_sync_stream(
+    request: ConduitRequest, http_request: Request
+) -> StreamingResponse:
+    """Stream tokens as server-sent events, ending with a summary event"""
+    await get_admission().check_body(http_request)
+    return StreamingResponse(
+        conduit_sync_stream_service(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post(
+    "/conduit/async",
+    response_model=list[ConduitResponse | ConduitError],
+    dependencies=[admission(LLM, BULK)],
+)
+async def conduit_async(batch: BatchRequest) -> PydanticJSONResponse:
+    get_admission().check_batch(batch)
+    return PydanticJSONResponse(await conduit_async_service(batch))
 
 
-@app.post("/conduit/async")
-async def conduit_async(
-    batch: BatchRequest,
-) -> list[ConduitResponse | ConduitError]:
-    return await conduit_async_service(batch)
+@app.post("/conduit/async/stream", dependencies=[admission(LLM, BULK)])
+async def conduit_async_stream(batch: BatchRequest) -> StreamingResponse:
+    """Stream batch results as NDJSON records tagged with their index, in completion order"""
+    get_admission().check_batch(batch)
+    return StreamingResponse(
+        conduit_async_stream_service(batch), media_type="application/x-ndjson"
+    )
 
 
 # Siphon endpoint
-@app.post("/siphon/synthetic_data")
-async def siphon_synthetic_data(request: SyntheticDataRequest):
+@app.post("/siphon/synthetic_data", dependencies=[admission(SYNTHETIC, BULK)])
+async def siphon_synthetic_data(request: SyntheticDataRequest, http_request: Request):
     """Generate synthetic data with structured error handling"""
-    request_id = (
-        getattr(request.state, "request_id", "unknown")
-        if hasattr(request, "state")
-        else "unknown"
-    )
+    await get_admission().check_body(http_request)
+    request_id = getattr(http_request.state, "request_id", "unknown")
 
     logger.info(f"[{request_id}] Received synthetic data request")
     logger.debug(f"[{request_id}] Request model: {request.model}")
@@ -137,7 +335,7 @@ async def siphon_synthetic_data(request: SyntheticDataRequest):
         )
         logger.info(result)
 
-        return result
+        return PydanticJSONResponse(result)
 
     except ValidationError as e:
         logger.error(f"[{request_id}] Validation error in synthetic data generation")
@@ -160,15 +358,17 @@ async def siphon_synthetic_data(request: SyntheticDataRequest):
 
         raise HTTPException(status_code=422, detail=error.model_dump())
 
+    except DeadlineExceeded:
+        raise
+
     except Exception as e:
         logger.error(f"[{request_id}] Unexpected error: {type(e).__name__}: {str(e)}")
 
         # Create structured error
         error = (
             SiphonServerError.from_general_exception(
-                e, status_code=500, include_traceback=True
+                e, http_request, status_code=500, include_traceback=True
             )
-            .add_context("request_id", request_id)
             .add_context("context_type", type(request.context).__name__)
             .add_context("model", request.model)
         )
@@ -178,10 +378,76 @@ async def siphon_synthetic_data(request: SyntheticDataRequest):
         raise HTTPException(status_code=500, detail=error.model_dump())
 
 
-@app.post("/conduit/embeddings")
-async def generate_embeddings(request: EmbeddingsRequest) -> EmbeddingsResponse:
-    """Generate synthetic data with structured error handling"""
-    return await generate_embeddings_service(request)
+@app.post(
+    "/conduit/embeddings",
+    response_model=EmbeddingsResponse,
+    dependencies=[admission(EMBEDDINGS, INTERACTIVE)],
+)
+async def generate_embeddings(
+    request: EmbeddingsRequest, accept: str | None = Header(default=None)
+) -> Response:
+    """
+    Generate embeddings. Returns JSON by default, or a compact float32/.npy payload when the
+    Accept header asks for one (see server.api.embeddings_format).
+    """
+    get_admission().check_documents(request.texts)
+    media_type = embeddings_format.negotiate(accept)
+    if media_type == embeddings_format.JSON:
+        return PydanticJSONResponse(await generate_embeddings_service(request))
+
+    embeddings = await embed_request(request)
+    payload, (rows, dim) = embeddings_format.encode(embeddings, media_type)
+    return Response(
+        content=payload,
+        media_type=media_type,
+        headers={embeddings_format.SHAPE_HEADER: f"{rows},{dim}"},
+    )
+
+
+# Job endpoints
+def _job_not_found(job_id: str) -> HTTPException:
+    error = SiphonServerError(
+        error_type=ErrorType.JOB_NOT_FOUND,
+        message=f"Job not found: {job_id}",
+        status_code=404,
+    )
+    return HTTPException(status_code=404, detail=error.model_dump())
+
+
+@app.post("/jobs")
+async def submit_job(request: JobRequest) -> JobStatus:
+    """Queue a batch or synthetic data job; poll /jobs/{job_id} for progress"""
+    return await get_job_manager().submit(request)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> JobStatus:
+    status = await get_job_manager().get(job_id)
+    if status is None:
+        raise _job_not_found(job_id)
+    return status
+
+
+@app.get("/jobs/{job_id}/results", response_model=JobResults)
+async def get_job_results(
+    job_id: str, offset: int = 0, limit: int = 1000
+) -> PydanticJSONResponse:
+    """Finished item results so far, ordered by item index"""
+    manager = get_job_manager()
+    status = await manager.get(job_id)
+    if status is None:
+        raise _job_not_found(job_id)
+    return PydanticJSONResponse(
+        JobResults(job=status, results=await manager.results(job_id, offset, limit))
+    )
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str) -> JobStatus:
+    status = await get_job_manager().cancel(job_id)
+    if status is None:
+        raise _job_not_found(job_id)
+    return status
 
 
 # Error handlers
@@ -246,6 +512,41 @@ async def general_validation_error_handler(request: Request, exc: ValidationErro
     return JSONResponse(status_code=422, content=error.model_dump())
 
 
+@app.exception_handler(SiphonServerHTTPError)
+async def siphon_server_http_error_handler(
+    request: Request, exc: SiphonServerHTTPError
+):
+    """Return a SiphonServerError raised by an endpoint or dependency as-is"""
+    error = exc.error
+    error.path = error.path or str(request.url.path)
+    error.method = error.method or request.method
+    error.request_id = error.request_id or getattr(request.state, "request_id", None)
+
+    logger.warning(f"Request rejected: {error.error_type.value}: {error.message}")
+
+    return JSONResponse(
+        status_code=error.status_code, content=error.model_dump(), headers=exc.headers
+    )
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    """The client's X-Request-Timeout ran out before the work finished"""
+
+    error = SiphonServerError(
+        error_type=ErrorType.TIMEOUT_ERROR,
+        message=str(exc),
+        status_code=504,
+        path=str(request.url.path),
+        method=request.method,
+        request_id=getattr(request.state, "request_id", None),
+    )
+
+    logger.warning(f"Deadline exceeded: {error.model_dump_json()}")
+
+    return JSONResponse(status_code=504, content=error.model_dump())
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Catch-all exception handler"""
@@ -260,22 +561,49 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 def main():
-    """Run the Uvicorn server"""
+    """Run the Uvicorn development server: one process, reloading on source changes"""
     from siphonserver.server.logo import print_logo
+    import uvicorn
 
+    config = get_config()
     watch_directory = str(Path(__file__).parent.parent.parent)
 
     print_logo()
 
     uvicorn.run(
         "siphonserver.server.main:app",
-        host="0.0.0.0",
-        port=8080,
+        host=config.host,
+        port=config.port,
         reload=True,
         reload_dirs=[watch_directory],  # Watch the project directory for changes
         log_level="info",
     )
 
 
+def serve():
+    """
+    Run the production server: SIPHON_WORKERS processes (one per available core if 0), no
+    reloader, and a graceful shutdown that drains in-flight requests and running jobs.
+    """
+    from siphonserver.server.logo import print_logo
+    import uvicorn
+
+    config = get_config()
+    workers = config.workers or available_cpus()
+
+    print_logo()
+    logger.info(f"Starting {workers} worker process(es) on {config.host}:{config.port}")
+
+    uvicorn.run(
+        "siphonserver.server.main:app",
+        host=config.host,
+        port=config.port,
+        workers=workers,
+        timeout_keep_alive=config.timeout_keep_alive_seconds,
+        timeout_graceful_shutdown=config.timeout_graceful_shutdown_seconds,
+        log_level="info",
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -1,25 +1,42 @@
 from siphonserver.server.api.requests import BatchRequest  # your class
-from conduit.conduit.async_conduit import AsyncConduit
-from conduit.model.model_async import ModelAsync
-from conduit.prompt.prompt import Prompt
-from conduit.progress.verbosity import Verbosity
-from conduit.result.result import ConduitResult
+from siphonserver.server.api.responses import ConduitResponse
+from siphonserver.server.utils.executors import get_engine, LLM
+from siphonserver.server.utils.model_registry import new_async_model
+from siphonserver.server.utils.exceptions import SiphonServerError
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.services.warmup import record_model_request
+from siphonserver.server.utils.metrics import observe_model_call, observe_tokens
+from collections.abc import AsyncIterator
 from functools import partial
+from typing import TYPE_CHECKING
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import json
+import time
+
+if TYPE_CHECKING:
+    from conduit.result.result import ConduitResult
+
+logger = get_logger(__name__)
 
 
 async def conduit_async_service(
     batch: BatchRequest,
-) -> list[ConduitResult]:
+) -> "list[ConduitResult]":
     """
     Normalize BatchRequest into a list of query_async coroutines and execute them.
     """
+    # The conduit batch stack is imported on first use, not at server startup
+    from conduit.conduit.async_conduit import AsyncConduit
+    from conduit.prompt.prompt import Prompt
+    from conduit.progress.verbosity import Verbosity
+
     model_str = batch.model
+    record_model_request(model_str)
     prompt_str = batch.prompt_str
     input_variables_list = batch.input_variables_list
     prompt_strings = batch.prompt_strings
-    model = ModelAsync(model_str)
+    model = new_async_model(model_str)
     if prompt_str and input_variables_list:
         prompt = Prompt(prompt_str)
         conduit = AsyncConduit(model=model, prompt=prompt)
@@ -40,13 +57,100 @@ async def conduit_async_service(
             "BatchRequest must contain either 'prompt_str' with 'input_variables_list' or 'prompt_strings'."
         )
     assert func_for_executor is not None, "Function for executor should not be None"
-    # Run the following in a thread pool to avoid blocking the event loop
+    # Run the following on the shared LLM executor to avoid blocking the event loop
     ## conduit.run(input_variables_list=input_variables_list, verbosity=Verbosity.PROGRESS)
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        results = await loop.run_in_executor(
-            executor,
-            func_for_executor,
-        )
+    start = time.perf_counter()
+    items = len(batch.prompt_strings or batch.input_variables_list or [])
+    results = await get_engine().run(
+        LLM, func_for_executor, cost=items, model=model_str
+    )
+    observe_model_call("/conduit/async", model_str, time.perf_counter() - start)
+    for result in results:
+        observe_tokens(model_str, result)
 
     return results
+
+
+def run_single(batch: BatchRequest, index: int) -> "ConduitResult":
+    """Run one item of the batch through AsyncConduit (on an LLM executor thread)."""
+    from conduit.conduit.async_conduit import AsyncConduit
+    from conduit.prompt.prompt import Prompt
+    from conduit.progress.verbosity import Verbosity
+
+    model = new_async_model(batch.model)
+    start = time.perf_counter()
+    if batch.prompt_strings:
+        conduit = AsyncConduit(model=model)
+        results = conduit.run(
+            prompt_strings=[batch.prompt_strings[index]], verbose=Verbosity.SILENT
+        )
+    else:
+        conduit = AsyncConduit(model=model, prompt=Prompt(batch.prompt_str))
+        results = conduit.run(
+            input_variables_list=[batch.input_variables_list[index]],
+            verbose=Verbosity.SILENT,
+        )
+    observe_model_call(
+        "batch_item", batch.model, time.perf_counter() - start, results[0]
+    )
+    return results[0]
+
+
+def result_record(result) -> tuple[str, dict]:
+    """Tag a batch item result as "response", "error" (ConduitError) or "exception"."""
+    if isinstance(result, SiphonServerError):
+        record_type = "exception"
+    elif isinstance(result, ConduitResponse):
+        record_type = "response"
+    else:
+        record_type = "error"
+    return record_type, result.model_dump(mode="json")
+
+
+def _ndjson_record(index: int, result) -> str:
+    record_type, payload = result_record(result)
+    return json.dumps({"index": index, "type": record_type, "result": payload}) + "\n"
+
+
+async def conduit_async_stream_service(batch: BatchRequest) -> AsyncIterator[str]:
+    """
+    Stream a BatchRequest as NDJSON, one record per item in completion order.
+    Each line is {"index": <position in the batch>, "type": "response" | "error" | "exception",
+    "result": {...}}. At most SIPHON_ASYNC_STREAM_CONCURRENCY items are in flight, so results
+    are written out as they finish instead of being held for the whole batch.
+    """
+    total = len(batch.prompt_strings or batch.input_variables_list)
+    record_model_request(batch.model)
+    concurrency = get_config().async_stream_concurrency
+    engine = get_engine()
+    next_index = 0
+    in_flight: dict[asyncio.Future, int] = {}
+
+    def schedule() -> None:
+        nonlocal next_index
+        while next_index < total and len(in_flight) < concurrency:
+            task = asyncio.ensure_future(
+                engine.run(LLM, run_single, batch, next_index, model=batch.model)
+            )
+            in_flight[task] = next_index
+            next_index += 1
+
+    try:
+        schedule()
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = in_flight.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.error(f"Streamed batch item {index} failed: {e}")
+                    result = SiphonServerError.from_general_exception(
+                        e, include_traceback=False
+                    ).add_context("index", index)
+                yield _ndjson_record(index, result)
+            schedule()
+    finally:
+        # Client went away: drop anything still queued
+        for task in in_flight:
+            task.cancel()
@@ -1,21 +1,211 @@
-from conduit.sync import Model, Verbosity, ConduitCache
 from siphonserver.server.api.requests import ConduitRequest
-from siphonserver.server.api.responses import ConduitResponse, ConduitError
+from siphonserver.server.api.responses import (
+    ConduitResponse,
+    ConduitError,
+    StreamSummary,
+)
+from siphonserver.server.utils.executors import get_engine, LLM
+from siphonserver.server.utils.model_registry import get_registry, SYNC
+from siphonserver.server.utils.exceptions import SiphonServerError
+from siphonserver.server.utils.hashing import request_hash
+from siphonserver.server.utils.singleflight import get_singleflight
+from siphonserver.server.utils.metrics import observe_model_call
 from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.services.warmup import record_model_request
+from collections.abc import AsyncIterator
+from typing import Any, Callable
+import asyncio
+import json
+import threading
+import time
 
-# Set up cache
-Model.conduit_cache = ConduitCache(name="siphonserver")  # Initialize cache if needed
 # Set up logger
 logger = get_logger(__name__)
 
 
-def conduit_sync_service(request: ConduitRequest) -> ConduitResponse | ConduitError:
+def _query(request: ConduitRequest) -> ConduitResponse | ConduitError:
+    from conduit.sync import Verbosity
+
+    model = get_registry().get(SYNC, request.model)
+    start = time.perf_counter()
+    response = model.query(request=request, verbose=Verbosity.SUMMARY)
+    observe_model_call(
+        "/conduit/sync", request.model, time.perf_counter() - start, response
+    )
+    return response
+
+
+async def conduit_sync_service(
+    request: ConduitRequest,
+) -> ConduitResponse | ConduitError:
     """
     Synchronous Conduit processing function.
     Accepts ConduitRequest; returns ConduitResponse or ConduitError.
+    The blocking Model.query call runs on the shared LLM executor; identical requests already
+    in flight share that call instead of starting another.
     """
     logger.info(f"Processing sync query for model: {request.model}")
-    model = Model(request.model)
-    response = model.query(request=request, verbose=Verbosity.SUMMARY)
+    record_model_request(request.model)
+    response = await get_singleflight("conduit_sync").do(
+        request_hash(request),
+        lambda: get_engine().run(LLM, _query, request, model=request.model),
+    )
     logger.info(f"Sync query completed for model: {request.model}")
     return response
+
+
+# Streaming
+_END = object()
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Pull the text delta out of a streamed chunk (str, Ollama- or OpenAI-style objects/dicts)."""
+    if isinstance(chunk, str):
+        return chunk
+    if isinstance(chunk, dict):
+        message = chunk.get("message") or {}
+        return message.get("content") or chunk.get("response") or ""
+    for attr in ("content", "delta", "text", "response"):
+        value = getattr(chunk, attr, None)
+        if isinstance(value, str):
+            return value
+    message = getattr(chunk, "message", None)
+    if isinstance(getattr(message, "content", None), str):
+        return message.content
+    choices = getattr(chunk, "choices", None)
+    if choices:
+        delta = getattr(choices[0], "delta", None)
+        if isinstance(getattr(delta, "content", None), str):
+            return delta.content
+    return ""
+
+
+def _chunk_usage(chunk: Any) -> dict:
+    """Token usage carried by a chunk, if any (final OpenAI chunk or Ollama done chunk)."""
+    get = chunk.get if isinstance(chunk, dict) else lambda k: getattr(chunk, k, None)
+    usage = get("usage")
+    if usage:
+        return usage if isinstance(usage, dict) else dict(getattr(usage, "__dict__", {}))
+    if get("eval_count") is not None:
+        return {
+            "input_tokens": get("prompt_eval_count"),
+            "output_tokens": get("eval_count"),
+        }
+    return {}
+
+
+def _stream_query(
+    request: ConduitRequest,
+    push: Callable[[str, Any], None],
+    stop: threading.Event,
+) -> None:
+    """
+    Run a streaming query on an LLM executor thread, pushing ("chunk" | "final", value) events.
+    Backends that don't stream return a complete response, which is pushed as "final".
+    Setting `stop` (client disconnected) closes the backend stream and frees the thread.
+    """
+    from conduit.sync import Verbosity
+
+    model = get_registry().get(SYNC, request.model)
+    streaming_request = request.model_copy(update={"stream": True})
+    result = model.query(request=streaming_request, verbose=Verbosity.SILENT)
+    if isinstance(result, (ConduitResponse, ConduitError)):
+        push("final", result)
+        return
+    try:
+        for chunk in result:
+            if stop.is_set():
+                logger.info(f"Stopped streamed query for model: {request.model}")
+                return
+            if isinstance(chunk, (ConduitResponse, ConduitError)):
+                push("final", chunk)
+            else:
+                push("chunk", chunk)
+    finally:
+        close = getattr(result, "close", None)
+        if callable(close):
+            close()
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def conduit_sync_stream_service(request: ConduitRequest) -> AsyncIterator[str]:
+    """
+    Stream a ConduitRequest as server-sent events.
+    Emits "token" events ({"text": ...}) as the backend generates them, then one "summary"
+    event holding a StreamSummary (complete response, usage and timing), or an "error" event
+    holding a SiphonServerError.
+    """
+    logger.info(f"Processing streamed sync query for model: {request.model}")
+    record_model_request(request.model)
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def push(kind: str, value: Any) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+
+    start = time.time()
+    stop = threading.Event()
+    task = asyncio.ensure_future(
+        get_engine().run(LLM, _stream_query, request, push, stop, model=request.model)
+    )
+    # Runs after every push scheduled by the thread, so _END is always last
+    task.add_done_callback(lambda _: queue.put_nowait((_END, None)))
+
+    tokens: list[str] = []
+    usage: dict = {}
+    final = None
+    time_to_first_token = None
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind is _END:
+                break
+            if kind == "final":
+                final = value
+                continue
+            usage = _chunk_usage(value) or usage
+            text = _chunk_text(value)
+            if not text:
+                continue
+            if time_to_first_token is None:
+                time_to_first_token = time.time() - start
+            tokens.append(text)
+            yield _sse("token", json.dumps({"text": text}))
+
+        task.result()  # Surface backend exceptions
+    except Exception as e:
+        logger.error(f"Streamed sync query failed: {e}")
+        error = SiphonServerError.from_general_exception(
+            e, include_traceback=False
+        ).add_context("model", request.model)
+        yield _sse("error", error.model_dump_json())
+        return
+    finally:
+        # Cancelling the task only stops us waiting; the event stops the executor thread
+        stop.set()
+        task.cancel()
+
+    content = "".join(tokens)
+    if not tokens and final is not None:
+        # Non-streaming backend: deliver the whole completion as a single token
+        content = str(getattr(final, "content", "") or "")
+        if content:
+            time_to_first_token = time.time() - start
+            yield _sse("token", json.dumps({"text": content}))
+
+    summary = StreamSummary(
+        response=final,
+        content=content,
+        model=request.model,
+        usage=usage,
+        time_to_first_token=time_to_first_token,
+        duration=time.time() - start,
+    )
+    observe_model_call(
+        "/conduit/sync/stream", request.model, summary.duration, final
+    )
+    logger.info(f"Streamed sync query completed for model: {request.model}")
+    yield _sse("summary", summary.model_dump_json())
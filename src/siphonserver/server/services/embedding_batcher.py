@@ -0,0 +1,198 @@
+"""
+Dynamic micro-batching for /conduit/embeddings.
+
+Concurrent EmbeddingsRequests for the same model are merged into a single generate_embeddings
+forward pass, bounded by a maximum batch size (documents) and a maximum wait window, and the
+resulting vectors are split back out to each caller in order. A batch of one request runs as that
+request's work (without its deadline); a merged batch is scheduled as shared work at the most
+urgent caller's class (see scheduler.mark_shared). Each caller stops waiting at its own deadline.
+"""
+
+from contextvars import Context
+from dataclasses import dataclass
+import asyncio
+import threading
+import time
+
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.deadline import wait_shared
+from siphonserver.server.utils.executors import get_engine, EMBEDDINGS
+from siphonserver.server.utils.model_registry import get_registry, EMBEDDING
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.scheduler import (
+    detached_context,
+    get_work_class,
+    highest,
+    mark_shared,
+)
+from siphonserver.server.utils.timing import stage, EXEC
+from siphonserver.server.utils.metrics import (
+    EMBEDDING_BATCH_LATENCY,
+    EMBEDDING_DOCUMENTS,
+)
+
+logger = get_logger(__name__)
+
+
+@dataclass(eq=False)
+class _Pending:
+    documents: list[str]
+    future: asyncio.Future
+    context: Context
+    priority: str
+
+
+def _embed_documents(model: str, documents: list[str]) -> list[list[float]]:
+    """One forward pass over the merged documents (runs on the embeddings executor)."""
+    from conduit.embeddings.chroma_batch import ChromaBatch
+
+    batch = ChromaBatch(
+        ids=[str(i) for i in range(len(documents))],
+        documents=documents,
+        metadatas=[{} for _ in documents],
+    )
+    embedding_model = get_registry().get(EMBEDDING, model)
+    return embedding_model.generate_embeddings(batch).embeddings
+
+
+class EmbeddingBatcher:
+    """Collects concurrent embedding calls per model and flushes them as one batch."""
+
+    def __init__(self, max_batch_size: int = 256, max_wait_ms: float = 5.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending: dict[str, list[_Pending]] = {}
+        self._pending_docs: dict[str, int] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        # Counters
+        self.requests = 0
+        self.batches = 0
+        self.documents = 0
+
+    async def embed(self, model: str, documents: list[str]) -> list[list[float]]:
+        """Queue documents for the model and wait for their vectors, in input order."""
+        if not documents:
+            return []
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = _Pending(
+            documents, future, detached_context(), get_work_class().priority
+        )
+        self._pending.setdefault(model, []).append(pending)
+        self._pending_docs[model] = self._pending_docs.get(model, 0) + len(documents)
+        self.requests += 1
+
+        if self._pending_docs[model] >= self.max_batch_size:
+            self._flush(model)
+        elif model not in self._timers:
+            self._timers[model] = loop.call_later(self.max_wait, self._flush, model)
+        # Batch window plus the shared forward pass
+        with stage(EXEC):
+            try:
+                return await wait_shared(future, "embedding batch")
+            except BaseException:
+                self._withdraw(model, pending)
+                raise
+
+    def _withdraw(self, model: str, pending: _Pending) -> None:
+        """Drop a caller that gave up before its documents were flushed."""
+        queue = self._pending.get(model, [])
+        if pending in queue:
+            queue.remove(pending)
+            self._pending_docs[model] -= len(pending.documents)
+
+    def _flush(self, model: str) -> None:
+        """Take up to max_batch_size documents off the model's queue and run them."""
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.get(model, [])
+        if not pending:
+            return
+
+        # Always take at least one request, even if it alone exceeds the batch size
+        taken: list[_Pending] = [pending.pop(0)]
+        size = len(taken[0].documents)
+        while pending and size + len(pending[0].documents) <= self.max_batch_size:
+            item = pending.pop(0)
+            taken.append(item)
+            size += len(item.documents)
+        self._pending_docs[model] -= size
+
+        context = taken[0].context
+        if len(taken) > 1:
+            context = Context()
+            mark_shared(context, highest(item.priority for item in taken), "embeddings")
+        task = asyncio.get_running_loop().create_task(self._run(model, taken), context=context)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        # Whatever is left starts a fresh window (or flushes now if already full)
+        if pending:
+            if self._pending_docs[model] >= self.max_batch_size:
+                self._flush(model)
+            else:
+                self._timers[model] = asyncio.get_running_loop().call_later(
+                    self.max_wait, self._flush, model
+                )
+
+    async def _run(self, model: str, taken: list[_Pending]) -> None:
+        documents = [doc for item in taken for doc in item.documents]
+        self.batches += 1
+        self.documents += len(documents)
+        if len(taken) > 1:
+            logger.debug(
+                f"Merged {len(taken)} embedding requests ({len(documents)} documents) for {model}"
+            )
+        try:
+            start = time.perf_counter()
+            embeddings = await get_engine().run(
+                EMBEDDINGS, _embed_documents, model, documents
+            )
+            EMBEDDING_BATCH_LATENCY.observe(time.perf_counter() - start, model=model)
+            EMBEDDING_DOCUMENTS.inc(len(documents), model=model)
+            if len(embeddings) != len(documents):
+                raise ValueError(
+                    f"Embedding model returned {len(embeddings)} vectors for {len(documents)} documents"
+                )
+        except Exception as e:
+            for item in taken:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        offset = 0
+        for item in taken:
+            count = len(item.documents)
+            if not item.future.done():
+                item.future.set_result(embeddings[offset : offset + count])
+            offset += count
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "documents": self.documents,
+            "mean_batch_documents": (
+                round(self.documents / self.batches, 2) if self.batches else 0.0
+            ),
+            "pending_documents": sum(self._pending_docs.values()),
+        }
+
+
+_batcher: EmbeddingBatcher | None = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher() -> EmbeddingBatcher:
+    """Return the process-wide EmbeddingBatcher, sized from ServerConfig."""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            config = get_config()
+            _batcher = EmbeddingBatcher(
+                max_batch_size=config.embedding_batch_max_size,
+                max_wait_ms=config.embedding_batch_max_wait_ms,
+            )
+        return _batcher
@@ -0,0 +1,129 @@
+"""
+Content-addressed per-document embedding cache.
+
+Vectors are keyed by (model, sha256(document text)) and stored as little-endian float32 blobs in
+SQLite, so a re-submitted ChromaBatch only sends its new or changed documents to the model.
+Cached vectors come back at float32 precision.
+"""
+
+from pathlib import Path
+import hashlib
+import sqlite3
+import struct
+import threading
+
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    model TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS vectors_key ON vectors (model, digest);
+"""
+_QUERY_CHUNK = 500
+
+
+def document_digest(document: str) -> bytes:
+    return hashlib.sha256(document.encode()).digest()
+
+
+class EmbeddingCache:
+    """SQLite store of float32 vectors; oldest entries are pruned past max_entries."""
+
+    def __init__(self, path: str | Path, max_entries: int = 5_000_000):
+        self.max_entries = max_entries
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        (self.entries,) = self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()
+        # Counters (per document)
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, documents: list[str]) -> list[list[float] | None]:
+        """Cached vectors in document order, None where the document isn't cached."""
+        digests = [document_digest(document) for document in documents]
+        found: dict[bytes, list[float]] = {}
+        unique = list(dict.fromkeys(digests))
+        with self._lock:
+            for start in range(0, len(unique), _QUERY_CHUNK):
+                chunk = unique[start : start + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT digest, dim, vector FROM vectors WHERE model = ? "
+                    f"AND digest IN ({','.join('?' * len(chunk))})",
+                    (model, *chunk),
+                ).fetchall()
+                for digest, dim, vector in rows:
+                    found[digest] = list(struct.unpack(f"<{dim}f", vector))
+            vectors = [found.get(digest) for digest in digests]
+            hits = sum(vector is not None for vector in vectors)
+            self.hits += hits
+            self.misses += len(vectors) - hits
+        return vectors
+
+    def set_many(
+        self, model: str, documents: list[str], vectors: list[list[float]]
+    ) -> None:
+        rows = [
+            (model, document_digest(document), len(vector), struct.pack(f"<{len(vector)}f", *vector))
+            for document, vector in zip(documents, vectors)
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO vectors VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.execute("COMMIT")
+            self.entries += self._conn.total_changes - before
+            if self.entries > self.max_entries:
+                self._prune()
+
+    def _prune(self) -> None:
+        """Drop the oldest entries down to 90% of max_entries; caller holds the lock."""
+        excess = self.entries - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM vectors WHERE rowid IN (SELECT rowid FROM vectors ORDER BY rowid LIMIT ?)",
+            (excess,),
+        )
+        self.entries -= excess
+        logger.info(f"Pruned {excess} cached embeddings")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Return the process-wide cache, or None when SIPHON_EMBEDDING_CACHE_ENABLED is off."""
+    global _cache
+    config = get_config()
+    if not config.embedding_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache(
+                config.embedding_cache_path, max_entries=config.embedding_cache_max_entries
+            )
+        return _cache
@@ -1,5 +1,36 @@
 from siphonserver.server.api.requests import EmbeddingsRequest
 from siphonserver.server.api.responses import EmbeddingsResponse
+from siphonserver.server.services.embedding_batcher import get_batcher
+from siphonserver.server.services.embedding_cache import get_embedding_cache
+import asyncio
+
+
+async def embed_request(request: EmbeddingsRequest) -> list[list[float]]:
+    """
+    Compute the vectors for a request, in document order.
+    Documents already in the embedding cache are served from it; only the distinct misses are
+    handed to the micro-batcher, which merges concurrent requests for the same model into one
+    forward pass on the shared embeddings executor.
+    """
+    if request.batch is not None and request.batch.embeddings:
+        raise ValueError("Embeddings already exist in the provided batch.")
+
+    documents = request.texts
+    cache = get_embedding_cache()
+    if cache is None:
+        return await get_batcher().embed(request.model, documents)
+
+    vectors = await asyncio.to_thread(cache.get_many, request.model, documents)
+    misses = list(dict.fromkeys(doc for doc, vec in zip(documents, vectors) if vec is None))
+    if misses:
+        computed = await get_batcher().embed(request.model, misses)
+        await asyncio.to_thread(cache.set_many, request.model, misses, computed)
+        by_document = dict(zip(misses, computed))
+        vectors = [
+            vec if vec is not None else by_document[doc]
+            for doc, vec in zip(documents, vectors)
+        ]
+    return vectors
 
 
 async def generate_embeddings_service(
@@ -7,18 +38,7 @@ async def generate_embeddings_service(
 ) -> EmbeddingsResponse:
     """
     Generate embeddings for a batch of documents based on the provided request.
-    This function simulates the generation of embeddings using a specified model.
     """
-    from conduit.embeddings.embedding_model import EmbeddingModel
-    from conduit.embeddings.chroma_batch import ChromaBatch
-
-    model: str = request.model
-    batch: ChromaBatch = request.batch
-
-    if batch.embeddings:
-        raise ValueError("Embeddings already exist in the provided batch.")
-
-    embedding_model = EmbeddingModel(model)
-    new_batch: ChromaBatch = embedding_model.generate_embeddings(batch)
-    response = EmbeddingsResponse(embeddings=new_batch.embeddings)
+    embeddings = await embed_request(request)
+    response = EmbeddingsResponse(embeddings=embeddings)
     return response
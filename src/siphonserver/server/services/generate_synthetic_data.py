@@ -1,7 +1,14 @@
 # In server/services/generate_synthetic_data.py
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import time
+
 from siphonserver.server.api.requests import SyntheticDataRequest
+from siphonserver.server.utils.executors import get_engine, SYNTHETIC
+from siphonserver.server.utils.hashing import request_hash
+from siphonserver.server.utils.singleflight import get_singleflight
+from siphonserver.server.services.synthetic_data_cache import get_synthetic_data_cache
+from siphonserver.server.utils.metrics import observe_model_call
+from siphonserver.server.services.warmup import record_model_request
 from siphon.data.synthetic_data import SyntheticData
 
 
@@ -11,21 +18,42 @@ async def generate_synthetic_data(
     """
     Generate synthetic data based on the provided request.
     This function simulates the generation of synthetic data such as titles, summaries, and descriptions.
+    Results are served from the synthetic data cache when the same context was seen before.
+    The cache is SQLite-backed, so opening, reading and writing it happen off the event loop.
     """
+    cache = await asyncio.to_thread(get_synthetic_data_cache)
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, request)
+        if cached is not None:
+            return cached
+
     context = request.context
     model = request.model
+    record_model_request(model)
     server_side = True
 
-    # Run your existing sync function in a thread pool
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        synthetic_data = await loop.run_in_executor(
-            executor,
+    async def generate() -> SyntheticData:
+        # Run your existing sync function on the shared synthetic-data executor
+        start = time.perf_counter()
+        synthetic_data = await get_engine().run(
+            SYNTHETIC,
             SyntheticData.from_context,  # Your existing sync function
             context,  # context argument
             False,  # local argument
             model,  # model_str argument
             server_side,  # server_side argument
+            model=model,  # lets the scheduler group work by model
         )
+        observe_model_call(
+            "/siphon/synthetic_data", model, time.perf_counter() - start
+        )
+        if cache is not None:
+            await asyncio.to_thread(cache.set, request, synthetic_data)
+        return synthetic_data
+
+    # Identical requests already in flight attach to the running call
+    synthetic_data = await get_singleflight("synthetic_data").do(
+        request_hash(request), generate
+    )
 
     return synthetic_data
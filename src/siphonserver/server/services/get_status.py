@@ -1,16 +1,28 @@
 from siphonserver.server.api.responses import StatusResponse
+from siphonserver.server.utils.conduit_cache import install_conduit_cache
 
 
-def get_status_service(startup_time: float) -> StatusResponse:
+def get_status_service(
+    startup_time: float, probe_model: str = "llama3.1:latest"
+) -> StatusResponse:
+    """
+    Probe the backends (an Ollama ping, CUDA, the model list). This is slow and touches the GPU,
+    so the server runs it on an interval in HealthProber rather than per /status request.
+    """
     try:
-        from Conduit.sync import Model, Response, Verbosity
+        from conduit.sync import Model, Verbosity
+        from conduit.result.response import Response
         import torch
         import time
 
-        # Is ollama working?
+        install_conduit_cache()
+
+        # Is ollama working? (the timestamp keeps the response cache from answering for it)
         try:
-            test_model = Model("llama3.1:latest")  # Local Ollama model
-            test_response = test_model.query("ping", verbose=Verbosity.SILENT)
+            test_model = Model(probe_model)  # Local Ollama model
+            test_response = test_model.query(
+                f"ping {time.time()}", verbose=Verbosity.SILENT
+            )
             if isinstance(test_response, Response):
                 ollama_working = True
             else:
@@ -44,6 +56,6 @@ def get_status_service(startup_time: float) -> StatusResponse:
             status="error",
             gpu_enabled=False,
             message=f"Error retrieving status: {str(e)}",
-            models_available={},
+            models_available=[],
             uptime=None,
         )
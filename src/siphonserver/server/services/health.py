@@ -0,0 +1,135 @@
+"""
+Background health probing.
+
+HealthProber runs get_status_service on an interval and keeps the latest StatusResponse, so
+/status serves a snapshot instead of pinging a model per request. /livez and /readyz are built
+from the same snapshot plus live executor and model registry state.
+"""
+
+import asyncio
+import time
+
+from siphonserver.server.api.responses import StatusResponse, ReadinessResponse
+from siphonserver.server.services.get_status import get_status_service
+from siphonserver.server.services.warmup import get_warmup_manager
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.executors import get_engine
+from siphonserver.server.utils.model_registry import get_registry
+from siphonserver.server.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class HealthProber:
+    """Probes the backends every interval_seconds and holds the latest snapshot."""
+
+    def __init__(self, startup_time: float, interval_seconds: float, probe_model: str):
+        self.startup_time = startup_time
+        self.interval_seconds = interval_seconds
+        self.probe_model = probe_model
+        self.snapshot = StatusResponse(
+            status="starting",
+            message="Waiting for first health probe",
+            models_available=[],
+            gpu_enabled=False,
+        )
+        self._task: asyncio.Task | None = None
+
+    async def probe(self) -> StatusResponse:
+        """Run one probe off the event loop and store the result."""
+        snapshot = await asyncio.to_thread(
+            get_status_service, self.startup_time, self.probe_model
+        )
+        snapshot.checked_at = time.time()
+        if snapshot.models_available:
+            # Only locally served models count for the scheduler's swap avoidance
+            get_engine().residency.set_local_models(snapshot.models_available)
+        if snapshot.status != self.snapshot.status:
+            logger.info(f"Health status: {self.snapshot.status} -> {snapshot.status}")
+        self.snapshot = snapshot
+        return snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="siphon-health-prober")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def status(self) -> StatusResponse:
+        """The latest snapshot with uptime brought up to date."""
+        return self.snapshot.model_copy(
+            update={"uptime": time.time() - self.startup_time}
+        )
+
+    def readiness(self) -> ReadinessResponse:
+        """
+        Ready once a probe has succeeded, warm-up is done, the local backend answers and no pool
+        is backed up.
+        """
+        executors = get_engine().stats()
+        max_queued = get_config().readyz_max_queued
+        snapshot = self.snapshot
+        warmup = get_warmup_manager()
+        checks = {
+            "probed": snapshot.checked_at is not None,
+            "warmed_up": warmup is None or warmup.ready.is_set(),
+            "backend": snapshot.status in ("healthy", "degraded")
+            and bool(snapshot.models_available),
+            "executors": all(
+                pool["saturation"] < 1 or pool["queued"] <= max_queued
+                for pool in executors.values()
+            ),
+        }
+        return ReadinessResponse(
+            ready=all(checks.values()),
+            checks=checks,
+            detail={
+                "status": snapshot.status,
+                "checked_at": snapshot.checked_at,
+                "executors": executors,
+                "resident_models": get_registry().stats()["models"],
+                "warmup": warmup.stats() if warmup is not None else None,
+            },
+        )
+
+
+_prober: HealthProber | None = None
+
+
+def start_health_prober(startup_time: float) -> HealthProber:
+    """Create and start the process-wide prober; called from the lifespan hook."""
+    global _prober
+    if _prober is None:
+        config = get_config()
+        _prober = HealthProber(
+            startup_time,
+            interval_seconds=config.health_probe_interval_seconds,
+            probe_model=config.health_probe_model,
+        )
+        _prober.start()
+    return _prober
+
+
+def get_health_prober() -> HealthProber:
+    if _prober is None:
+        raise RuntimeError("Health prober has not been started")
+    return _prober
+
+
+async def stop_health_prober() -> None:
+    global _prober
+    if _prober is not None:
+        await _prober.stop()
+        _prober = None
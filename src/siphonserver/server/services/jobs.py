@@ -0,0 +1,425 @@
+"""
+Persistent background jobs for large BatchRequests and bulk synthetic data runs.
+
+Submitting returns a job id immediately; workers process items in the background and write
+each item's result to SQLite as it completes, so progress and partial results can be polled,
+jobs can be cancelled, and unfinished jobs resume (skipping finished items) after a restart.
+
+Several server processes can share one jobs database: each runs the jobs submitted to it, and a
+cancel through any process stops the job wherever it runs. Every unfinished job records the
+process that owns it, and each process heartbeats in the database; a job whose owner has stopped
+heartbeating (crashed, or shut down before the job finished) is adopted by exactly one live
+process, so jobs a sibling is still running are never run twice.
+"""
+
+from pathlib import Path
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from siphonserver.server.api.requests import JobRequest
+from siphonserver.server.api.responses import JobStatus, JobItemResult
+from siphonserver.server.services.conduit_async import run_single, result_record
+from siphonserver.server.services.generate_synthetic_data import generate_synthetic_data
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.exceptions import SiphonServerError
+from siphonserver.server.utils.executors import get_engine, LLM
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.scheduler import set_work_class, reset_work_class, BULK
+
+logger = get_logger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL,
+    request TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    error TEXT,
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS job_owners (
+    owner TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+class JobStore:
+    """SQLite-backed job state and per-item results."""
+
+    def __init__(self, path: str | Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            # Databases from before job ownership; their unfinished jobs count as orphaned
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def create(self, request: JobRequest, owner: str) -> JobStatus:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+            (
+                job_id,
+                request.kind,
+                QUEUED,
+                request.model_dump_json(),
+                request.total,
+                now,
+                now,
+                owner,
+            ),
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> JobStatus | None:
+        rows = self._execute(
+            "SELECT job_id, kind, state, total, created_at, updated_at, error FROM jobs WHERE job_id = ?",
+            (job_id,),
+        )
+        if not rows:
+            return None
+        job_id, kind, state, total, created_at, updated_at, error = rows[0]
+        failed, finished = self._execute(
+            "SELECT COALESCE(SUM(type = 'exception'), 0), COUNT(*) FROM job_items WHERE job_id = ?",
+            (job_id,),
+        )[0]
+        return JobStatus(
+            job_id=job_id,
+            kind=kind,
+            state=state,
+            total=total,
+            completed=finished - failed,
+            failed=failed,
+            created_at=created_at,
+            updated_at=updated_at,
+            error=error,
+        )
+
+    def state(self, job_id: str) -> str | None:
+        rows = self._execute("SELECT state FROM jobs WHERE job_id = ?", (job_id,))
+        return rows[0][0] if rows else None
+
+    def load_request(self, job_id: str) -> JobRequest:
+        (request,) = self._execute(
+            "SELECT request FROM jobs WHERE job_id = ?", (job_id,)
+        )[0]
+        return JobRequest.model_validate_json(request)
+
+    def set_state(self, job_id: str, state: str, error: str | None = None) -> bool:
+        """
+        Move an unfinished job to state. False if it had already finished (completed, failed or
+        cancelled, possibly by another process), which is then left as it is.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ?, error = ? "
+                "WHERE job_id = ? AND state NOT IN (?, ?, ?)",
+                (state, time.time(), error, job_id, *FINISHED_STATES),
+            )
+            return cursor.rowcount == 1
+
+    def save_item(self, job_id: str, index: int, item_type: str, result: dict) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO job_items VALUES (?, ?, ?, ?)",
+            (job_id, index, item_type, json.dumps(result)),
+        )
+
+    def finished_indices(self, job_id: str) -> set[int]:
+        rows = self._execute("SELECT idx FROM job_items WHERE job_id = ?", (job_id,))
+        return {idx for (idx,) in rows}
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 1000) -> list[JobItemResult]:
+        rows = self._execute(
+            "SELECT idx, type, result FROM job_items WHERE job_id = ? ORDER BY idx LIMIT ? OFFSET ?",
+            (job_id, limit, offset),
+        )
+        return [
+            JobItemResult(index=idx, type=item_type, result=json.loads(result))
+            for idx, item_type, result in rows
+        ]
+
+    # Ownership
+    def heartbeat(self, owner: str) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO job_owners VALUES (?, ?)", (owner, time.time())
+        )
+
+    def retire(self, owner: str) -> None:
+        """Stop heartbeating for owner, so its unfinished jobs can be adopted right away."""
+        self._execute("DELETE FROM job_owners WHERE owner = ?", (owner,))
+
+    def orphaned(self, stale_before: float) -> list[tuple[str, str | None]]:
+        """(job_id, owner) of unfinished jobs whose owner last heartbeat before stale_before."""
+        return self._execute(
+            "SELECT job_id, owner FROM jobs WHERE state IN (?, ?) AND (owner IS NULL OR "
+            "owner NOT IN (SELECT owner FROM job_owners WHERE heartbeat_at >= ?)) "
+            "ORDER BY created_at",
+            (QUEUED, RUNNING, stale_before),
+        )
+
+    def adopt(self, job_id: str, previous_owner: str | None, owner: str) -> bool:
+        """Take over a job from previous_owner; False if another process got there first."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET owner = ?, updated_at = ? WHERE job_id = ? AND owner IS ?",
+                (owner, time.time(), job_id, previous_owner),
+            )
+            return cursor.rowcount == 1
+
+
+class JobManager:
+    """
+    Runs queued jobs on background asyncio workers, item by item. Every JobStore call goes
+    through asyncio.to_thread so SQLite (and its lock) never blocks the event loop.
+    """
+
+    # Heartbeats an owner may miss before its jobs are adopted
+    STALE_HEARTBEATS = 3
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 2,
+        item_concurrency: int = 4,
+        heartbeat_seconds: float = 5.0,
+    ):
+        self.store = store
+        self.workers = workers
+        self.item_concurrency = item_concurrency
+        self.heartbeat_seconds = heartbeat_seconds
+        # Unique per process start, so a restarted worker never mistakes old jobs for its own
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._cancelled: set[str] = set()
+        self._active: set[str] = set()
+        self._draining = False
+
+    async def start(self) -> None:
+        """Start heartbeating, adopt orphaned jobs (now and periodically) and spawn workers."""
+        await asyncio.to_thread(self.store.heartbeat, self.owner)
+        await self._adopt_orphans()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"siphon-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._tasks.append(
+            asyncio.create_task(self._keep_alive(), name="siphon-job-heartbeat")
+        )
+
+    async def _keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, self.owner)
+                if not self._draining:
+                    await self._adopt_orphans()
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e}")
+
+    async def _adopt_orphans(self) -> None:
+        """Queue unfinished jobs whose owning process has stopped heartbeating."""
+        stale_before = time.time() - self.STALE_HEARTBEATS * self.heartbeat_seconds
+        for job_id, previous_owner in await asyncio.to_thread(
+            self.store.orphaned, stale_before
+        ):
+            if await asyncio.to_thread(
+                self.store.adopt, job_id, previous_owner, self.owner
+            ):
+                logger.info(f"Resuming job {job_id} (was owned by {previous_owner})")
+                self._queue.put_nowait(job_id)
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Start no more queued jobs and wait up to timeout for running ones to finish; False if some
+        are still running. Queued jobs stay queued in the store for the next start.
+        """
+        self._draining = True
+        deadline = time.monotonic() + timeout
+        while self._active and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        return not self._active
+
+    async def stop(self) -> None:
+        """
+        Stop workers and heartbeating; unfinished jobs stay in the store and are adopted by
+        another live process, or by this server on its next start.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self.store.retire, self.owner)
+
+    @property
+    def active_jobs(self) -> int:
+        return len(self._active)
+
+    @property
+    def queued_jobs(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, request: JobRequest) -> JobStatus:
+        status = await asyncio.to_thread(self.store.create, request, self.owner)
+        self._queue.put_nowait(status.job_id)
+        logger.info(f"Queued {status.kind} job {status.job_id} ({status.total} items)")
+        return status
+
+    async def get(self, job_id: str) -> JobStatus | None:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def results(
+        self, job_id: str, offset: int = 0, limit: int = 1000
+    ) -> list[JobItemResult]:
+        return await asyncio.to_thread(self.store.results, job_id, offset, limit)
+
+    async def cancel(self, job_id: str) -> JobStatus | None:
+        status = await self.get(job_id)
+        if status is None or status.state in FINISHED_STATES:
+            return status
+        self._cancelled.add(job_id)
+        if await asyncio.to_thread(self.store.set_state, job_id, CANCELLED):
+            logger.info(f"Cancelled job {job_id}")
+        return await self.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            if self._draining:
+                continue
+            self._active.add(job_id)
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                await asyncio.to_thread(self.store.set_state, job_id, FAILED, str(e))
+            finally:
+                self._active.discard(job_id)
+                self._cancelled.discard(job_id)
+
+    async def _run_item(self, request: JobRequest, index: int) -> tuple[str, dict]:
+        try:
+            if request.batch is not None:
+                result = await get_engine().run(
+                    LLM, run_single, request.batch, index, model=request.batch.model
+                )
+                return result_record(result)
+            result = await generate_synthetic_data(request.synthetic_data[index])
+            return "synthetic_data", result.model_dump(mode="json")
+        except Exception as e:
+            error = SiphonServerError.from_general_exception(
+                e, include_traceback=False
+            ).add_context("index", index)
+            return result_record(error)
+
+    async def _process(self, job_id: str) -> None:
+        status = await self.get(job_id)
+        if status is None or status.state in FINISHED_STATES:
+            return
+        if not await asyncio.to_thread(self.store.set_state, job_id, RUNNING):
+            return  # Cancelled since
+        # Job items are bulk work, shared fairly between jobs
+        work_class_token = set_work_class(BULK, f"job:{job_id}")
+        in_flight: dict[asyncio.Task, int] = {}
+        try:
+            request = await asyncio.to_thread(self.store.load_request, job_id)
+            finished = await asyncio.to_thread(self.store.finished_indices, job_id)
+            pending = (i for i in range(request.total) if i not in finished)
+
+            def schedule() -> None:
+                while len(in_flight) < self.item_concurrency:
+                    index = next(pending, None)
+                    if index is None:
+                        return
+                    in_flight[asyncio.ensure_future(self._run_item(request, index))] = index
+
+            schedule()
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item_type, result = task.result()
+                    await asyncio.to_thread(
+                        self.store.save_item, job_id, in_flight.pop(task), item_type, result
+                    )
+                # Cancelled here, or through another server process sharing the store
+                if job_id in self._cancelled:
+                    return
+                if await asyncio.to_thread(self.store.state, job_id) == CANCELLED:
+                    return
+                schedule()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            reset_work_class(work_class_token)
+
+        # A cancel that arrived after the last check above still wins
+        if await asyncio.to_thread(self.store.set_state, job_id, COMPLETED):
+            logger.info(f"Completed job {job_id}")
+
+
+_manager: JobManager | None = None
+
+
+async def start_job_manager() -> JobManager:
+    """Create and start the process-wide JobManager; called from the lifespan hook."""
+    global _manager
+    if _manager is None:
+        config = get_config()
+        store = JobStore(config.jobs_db_path)
+        _manager = JobManager(
+            store,
+            workers=config.job_workers,
+            item_concurrency=config.job_item_concurrency,
+            heartbeat_seconds=config.job_heartbeat_seconds,
+        )
+        await _manager.start()
+    return _manager
+
+
+def get_job_manager() -> JobManager:
+    if _manager is None:
+        raise RuntimeError("Job manager has not been started")
+    return _manager
+
+
+async def stop_job_manager() -> None:
+    global _manager
+    if _manager is not None:
+        await _manager.stop()
+        _manager = None
@@ -0,0 +1,92 @@
+"""
+Result cache for /siphon/synthetic_data.
+
+Final SyntheticData objects are cached by a hash of the context text, sourcetype and model, so
+re-ingesting an unchanged document skips SyntheticData.from_context entirely. Entries live in a
+TieredCache: a memory LRU in front of a SQLite store with TTL and size limits.
+"""
+
+from importlib import import_module
+import json
+import threading
+
+from siphonserver.server.api.requests import SyntheticDataRequest
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.hashing import canonical_json, request_hash
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.tiered_cache import TieredCache
+
+logger = get_logger(__name__)
+
+
+def synthetic_data_key(request: SyntheticDataRequest) -> str:
+    """Cache key: sha256 over the context text, its sourcetype and the model."""
+    context = request.context
+    text = getattr(context, "context", None)
+    if not isinstance(text, str):
+        text = canonical_json(context)
+    sourcetype = getattr(context, "sourcetype", "")
+    return request_hash(
+        {
+            "context": text,
+            "sourcetype": str(getattr(sourcetype, "value", sourcetype)),
+            "model": request.model,
+        }
+    )
+
+
+class SyntheticDataCache:
+    """Stores SyntheticData results with their concrete class so hits rebuild the right subclass."""
+
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+
+    def get(self, request: SyntheticDataRequest):
+        try:
+            entry = self.cache.get(synthetic_data_key(request))
+            if entry is None:
+                return None
+            envelope = json.loads(entry)
+            module, _, name = envelope["class"].partition(":")
+            synthetic_data_class = getattr(import_module(module), name)
+            return synthetic_data_class.model_validate(envelope["data"])
+        except Exception as e:
+            logger.warning(f"Synthetic data cache read failed: {e}")
+            return None
+
+    def set(self, request: SyntheticDataRequest, synthetic_data) -> None:
+        cls = type(synthetic_data)
+        envelope = {
+            "class": f"{cls.__module__}:{cls.__qualname__}",
+            "data": synthetic_data.model_dump(mode="json"),
+        }
+        try:
+            self.cache.set(synthetic_data_key(request), json.dumps(envelope))
+        except Exception as e:
+            logger.warning(f"Synthetic data cache write failed: {e}")
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+_cache: SyntheticDataCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_synthetic_data_cache() -> SyntheticDataCache | None:
+    """Return the process-wide cache, or None when SIPHON_SYNTHETIC_CACHE_ENABLED is off."""
+    global _cache
+    config = get_config()
+    if not config.synthetic_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SyntheticDataCache(
+                TieredCache(
+                    config.synthetic_cache_path,
+                    max_memory_items=config.synthetic_cache_memory_items,
+                    ttl_seconds=config.synthetic_cache_ttl_seconds,
+                    max_disk_mb=config.synthetic_cache_max_disk_mb,
+                )
+            )
+        return _cache
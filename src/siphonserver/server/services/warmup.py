@@ -0,0 +1,192 @@
+"""
+Model warm-up and keep-alive.
+
+At startup the WarmupManager loads the configured models (SIPHON_WARMUP_MODELS) with a tiny query so
+the first real request doesn't pay the cold-start cost, and /readyz holds off until that's done.
+Afterwards it re-pings warm models on an interval so the local backend keeps them resident, and
+can optionally pre-warm the models requested most often over a rolling window.
+"""
+
+from collections import Counter, deque
+import asyncio
+import threading
+import time
+
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.executors import get_engine, LLM
+from siphonserver.server.utils.model_registry import get_registry, SYNC
+from siphonserver.server.utils.scheduler import set_work_class, BULK
+from siphonserver.server.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _ping(model_name: str) -> None:
+    """One tiny query; the timestamp keeps the response cache from answering in the model's place."""
+    from conduit.sync import Verbosity
+
+    model = get_registry().get(SYNC, model_name)
+    model.query(f"ping {time.time()}", verbose=Verbosity.SILENT)
+
+
+class TrafficWindow:
+    """Model request counts over a rolling time window."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._events: deque[tuple[float, str]] = deque()
+        self._lock = threading.Lock()
+
+    def record(self, model: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._events.append((now, model))
+            self._expire(now)
+
+    def top(self, n: int, min_requests: int = 1) -> list[str]:
+        """Most requested models in the window, busiest first."""
+        with self._lock:
+            self._expire(time.monotonic())
+            counts = Counter(model for _, model in self._events)
+        return [model for model, count in counts.most_common(n) if count >= min_requests]
+
+    def _expire(self, now: float) -> None:
+        while self._events and now - self._events[0][0] > self.window_seconds:
+            self._events.popleft()
+
+
+class WarmupManager:
+    """Warms configured models at startup, keeps warm models resident, pre-warms busy ones."""
+
+    def __init__(
+        self,
+        models: list[str],
+        keepalive_interval_seconds: float = 240,
+        traffic_enabled: bool = False,
+        traffic_window_seconds: float = 600,
+        traffic_top_n: int = 2,
+        traffic_min_requests: int = 5,
+    ):
+        self.models = list(dict.fromkeys(models))
+        self.keepalive_interval_seconds = keepalive_interval_seconds
+        self.traffic = TrafficWindow(traffic_window_seconds) if traffic_enabled else None
+        self.traffic_top_n = traffic_top_n
+        self.traffic_min_requests = traffic_min_requests
+        self.warmed: dict[str, float] = {}  # model -> last successful ping (time.time())
+        self.failed: dict[str, str] = {}
+        self.ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        # Counters
+        self.pings = 0
+
+    def record_request(self, model: str) -> None:
+        if self.traffic is not None:
+            self.traffic.record(model)
+
+    async def warm(self, model: str) -> bool:
+        start = time.perf_counter()
+        try:
+            await get_engine().run(LLM, _ping, model, model=model)
+        except Exception as e:
+            self.failed[model] = str(e)
+            logger.warning(f"Warm-up ping failed for {model}: {e}")
+            return False
+        self.pings += 1
+        self.failed.pop(model, None)
+        if model not in self.warmed:
+            logger.info(f"Warmed {model} in {time.perf_counter() - start:.2f}s")
+        self.warmed[model] = time.time()
+        return True
+
+    async def _run(self) -> None:
+        # Warm-up and keep-alive pings are background work: bulk class, their own client
+        set_work_class(BULK, "warmup")
+        for model in self.models:
+            await self.warm(model)
+        self.ready.set()
+        logger.info(
+            f"Warm-up finished: {len(self.warmed)}/{len(self.models)} configured models warm"
+        )
+
+        if self.keepalive_interval_seconds <= 0 and self.traffic is None:
+            return
+        interval = self.keepalive_interval_seconds or 60
+        while True:
+            await asyncio.sleep(interval)
+            targets = list(self.models)
+            if self.traffic is not None:
+                # Only locally served models; pinging hosted APIs would just cost money
+                residency = get_engine().residency
+                targets += [
+                    model
+                    for model in self.traffic.top(self.traffic_top_n, self.traffic_min_requests)
+                    if residency.is_local(model)
+                ]
+            if self.keepalive_interval_seconds <= 0:
+                # Traffic pre-warming only: just the models that aren't warm yet
+                targets = [model for model in targets if model not in self.warmed]
+            for model in dict.fromkeys(targets):
+                await self.warm(model)
+
+    def start(self) -> None:
+        if self._task is None:
+            if not self.models:
+                self.ready.set()
+            self._task = asyncio.create_task(self._run(), name="siphon-warmup")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready.is_set(),
+            "configured": self.models,
+            "warm": sorted(self.warmed),
+            "failed": self.failed,
+            "pings": self.pings,
+            "trending": (
+                self.traffic.top(self.traffic_top_n, self.traffic_min_requests)
+                if self.traffic is not None
+                else []
+            ),
+        }
+
+
+_manager: WarmupManager | None = None
+
+
+def start_warmup_manager() -> WarmupManager:
+    """Create and start the process-wide warm-up manager; called from the lifespan hook."""
+    global _manager
+    if _manager is None:
+        config = get_config()
+        _manager = WarmupManager(
+            config.warmup_models,
+            keepalive_interval_seconds=config.keepalive_interval_seconds,
+            traffic_enabled=config.warmup_traffic_enabled,
+            traffic_window_seconds=config.warmup_traffic_window_seconds,
+            traffic_top_n=config.warmup_traffic_top_n,
+            traffic_min_requests=config.warmup_traffic_min_requests,
+        )
+        _manager.start()
+    return _manager
+
+
+def get_warmup_manager() -> WarmupManager | None:
+    return _manager
+
+
+def record_model_request(model: str) -> None:
+    """Count a request for the model towards traffic-based pre-warming (no-op if disabled)."""
+    if _manager is not None:
+        _manager.record_request(model)
+
+
+async def stop_warmup_manager() -> None:
+    global _manager
+    if _manager is not None:
+        await _manager.stop()
+        _manager = None
@@ -0,0 +1,236 @@
+"""
+Admission control for model-bound endpoints.
+
+Requests are checked before any model work is queued: batches and embedding requests are capped by
+item count and prompt bytes (413), and when the server is already at its in-flight limit or the
+target executor pool's queue is full, new requests are shed with 429 and Retry-After instead of
+queueing without bound. The client's X-Request-Timeout becomes the request deadline (see
+server.utils.deadline), and the route's priority class (overridable with X-Priority) plus
+X-Client-ID set how the request's executor work is scheduled (see server.utils.scheduler).
+"""
+
+from contextlib import asynccontextmanager
+import json
+import threading
+
+from fastapi import Depends, Request
+
+from siphonserver.server.utils.config import ServerConfig, get_config
+from siphonserver.server.utils.deadline import (
+    DEADLINE_HEADER,
+    parse_timeout,
+    set_deadline,
+    reset_deadline,
+)
+from siphonserver.server.utils.exceptions import (
+    ErrorType,
+    SiphonServerError,
+    SiphonServerHTTPError,
+)
+from siphonserver.server.utils.executors import get_engine
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.metrics import REJECTED
+from siphonserver.server.utils.scheduler import (
+    PRIORITIES,
+    PRIORITY_HEADER,
+    CLIENT_HEADER,
+    set_work_class,
+    reset_work_class,
+)
+
+logger = get_logger(__name__)
+
+
+def _utf8_len(text: str | None) -> int:
+    return len(text.encode()) if text else 0
+
+
+def prompt_bytes(batch) -> int:
+    """UTF-8 size of a BatchRequest's prompts (prompt strings or template + input variables)."""
+    total = _utf8_len(batch.prompt_str)
+    if batch.prompt_strings:
+        total += sum(_utf8_len(prompt) for prompt in batch.prompt_strings)
+    if batch.input_variables_list:
+        total += len(json.dumps(batch.input_variables_list, default=str).encode())
+    return total
+
+
+class AdmissionController:
+    """Request limits plus the count of admitted requests currently being served."""
+
+    def __init__(self, config: ServerConfig):
+        self.max_batch_items = config.max_batch_items
+        self.max_embedding_documents = config.max_embedding_documents
+        self.max_prompt_bytes = config.max_prompt_bytes
+        self.max_in_flight = config.max_in_flight
+        self.max_queued_per_pool = config.max_queued_per_pool
+        self.retry_after_seconds = config.retry_after_seconds
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        # Counters
+        self.admitted = 0
+        self.rejected = 0
+        self.too_large = 0
+
+    # Size limits
+    def _too_large(self, message: str, **context) -> SiphonServerHTTPError:
+        with self._lock:
+            self.too_large += 1
+        REJECTED.inc(reason="too_large")
+        error = SiphonServerError(
+            error_type=ErrorType.BATCH_SIZE_EXCEEDED, message=message, status_code=413
+        )
+        for key, value in context.items():
+            error.add_context(key, value)
+        return SiphonServerHTTPError(error)
+
+    def check_prompt_bytes(self, size: int) -> None:
+        if self.max_prompt_bytes and size > self.max_prompt_bytes:
+            raise self._too_large(
+                f"Request prompts are {size} bytes; the limit is {self.max_prompt_bytes}",
+                prompt_bytes=size,
+                limit=self.max_prompt_bytes,
+            )
+
+    def check_batch(self, batch) -> None:
+        """413 for a BatchRequest over the item or prompt-byte limit."""
+        items = len(batch.prompt_strings or batch.input_variables_list or [])
+        if self.max_batch_items and items > self.max_batch_items:
+            raise self._too_large(
+                f"Batch has {items} items; the limit is {self.max_batch_items}. "
+                "Submit larger batches to /jobs.",
+                items=items,
+                limit=self.max_batch_items,
+            )
+        self.check_prompt_bytes(prompt_bytes(batch))
+
+    def check_documents(self, documents: list[str]) -> None:
+        """413 for an embeddings request over the document or byte limit."""
+        if self.max_embedding_documents and len(documents) > self.max_embedding_documents:
+            raise self._too_large(
+                f"Request has {len(documents)} documents; the limit is {self.max_embedding_documents}",
+                documents=len(documents),
+                limit=self.max_embedding_documents,
+            )
+        self.check_prompt_bytes(sum(_utf8_len(document) for document in documents))
+
+    async def check_body(self, request: Request) -> None:
+        """
+        413 for a single-prompt request (sync query, synthetic data context) whose JSON body,
+        after decompression, is over the prompt-byte limit.
+        """
+        size = len(await request.body())  # Already read (and cached) to parse the request model
+        if self.max_prompt_bytes and size > self.max_prompt_bytes:
+            raise self._too_large(
+                f"Request body is {size} bytes; the limit is {self.max_prompt_bytes}",
+                body_bytes=size,
+                limit=self.max_prompt_bytes,
+            )
+
+    # Load shedding
+    def _overloaded(self, reason: str, request: Request) -> SiphonServerHTTPError:
+        with self._lock:
+            self.rejected += 1
+        REJECTED.inc(reason=reason)
+        error = SiphonServerError(
+            error_type=ErrorType.OVERLOADED,
+            message=f"Server is overloaded ({reason.replace('_', ' ')}); retry later",
+            status_code=429,
+            path=str(request.url.path),
+            method=request.method,
+            request_id=getattr(request.state, "request_id", None),
+        )
+        return SiphonServerHTTPError(
+            error, headers={"Retry-After": str(self.retry_after_seconds)}
+        )
+
+    @staticmethod
+    def _invalid_header(header: str, reason) -> SiphonServerHTTPError:
+        return SiphonServerHTTPError(
+            SiphonServerError(
+                error_type=ErrorType.INVALID_REQUEST,
+                message=f"Invalid {header} header: {reason}",
+                status_code=400,
+            )
+        )
+
+    @asynccontextmanager
+    async def admit(self, request: Request, pool: str, priority: str):
+        """
+        Hold an in-flight slot, the request deadline and the request's scheduling class for the
+        duration of the block.
+        """
+        try:
+            timeout = parse_timeout(request.headers.get(DEADLINE_HEADER))
+        except ValueError as e:
+            raise self._invalid_header(DEADLINE_HEADER, e)
+        priority = request.headers.get(PRIORITY_HEADER, priority).lower()
+        if priority not in PRIORITIES:
+            raise self._invalid_header(
+                PRIORITY_HEADER, f"expected one of {', '.join(PRIORITIES)}"
+            )
+        client = request.headers.get(CLIENT_HEADER) or (
+            request.client.host if request.client else "anonymous"
+        )
+
+        if self.max_queued_per_pool:
+            queued = get_engine().stats()[pool]["queued"]
+            if queued >= self.max_queued_per_pool:
+                raise self._overloaded("executor_queue_full", request)
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                admitted = False
+            else:
+                admitted = True
+                self.in_flight += 1
+                self.admitted += 1
+        if not admitted:
+            raise self._overloaded("too_many_in_flight", request)
+
+        deadline_token = set_deadline(timeout)
+        work_class_token = set_work_class(priority, client)
+        try:
+            yield
+        finally:
+            reset_work_class(work_class_token)
+            reset_deadline(deadline_token)
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "too_large": self.too_large,
+            }
+
+
+_controller: AdmissionController | None = None
+_controller_lock = threading.Lock()
+
+
+def get_admission() -> AdmissionController:
+    """Return the process-wide AdmissionController, configured from ServerConfig."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController(get_config())
+        return _controller
+
+
+def admission(pool: str, priority: str):
+    """
+    Route dependency: admit the request to the given executor pool or reject it early.
+    `priority` is the route's default class; clients may override it with X-Priority.
+    On streaming routes the slot and deadline are held until the body has been sent, which
+    relies on FastAPI >= 0.118 running yield-dependency cleanup after the response.
+    """
+
+    async def dependency(request: Request):
+        async with get_admission().admit(request, pool, priority):
+            yield
+
+    return Depends(dependency)
@@ -0,0 +1,103 @@
+"""
+The one ConduitCache the server's models share.
+
+Sync and batch models used to each construct their own ConduitCache("siphonserver") at import
+time, so every server process opened the cache store twice, and with several worker processes
+starting at once they all raced to create it. install_conduit_cache() builds a single instance
+per process, serialised across processes with a file lock, and hands it to both model classes.
+The instance is wrapped in a CountingConduitCache, which counts lookup hits and misses for
+/metrics since ConduitCache keeps no counters of its own. It runs the first time a conduit model
+is built (by the model registry or the health probe), so neither the conduit model stack nor the
+cache store is loaded before the server accepts connections.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+import fcntl
+import threading
+
+from siphonserver.server.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_NAME = "siphonserver"
+_LOCK_PATH = Path.home() / ".siphonserver" / "conduit_cache.lock"
+
+# The ConduitCache method models call to look up a stored response (None on a miss)
+LOOKUP_METHOD = "check_for_model"
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class CountingConduitCache:
+    """Delegates to a ConduitCache, counting lookups that returned a response (hits) or None."""
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Counting a method the models never call would report a 0% hit ratio forever
+        if not callable(getattr(cache, LOOKUP_METHOD, None)):
+            raise TypeError(
+                f"{type(cache).__name__} has no {LOOKUP_METHOD}() method; "
+                "update CountingConduitCache for this conduit version"
+            )
+
+    def __getattr__(self, name: str):
+        return getattr(self._cache, name)
+
+    def check_for_model(self, *args, **kwargs):
+        result = self._cache.check_for_model(*args, **kwargs)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+@contextmanager
+def _interprocess_lock(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def install_conduit_cache():
+    """
+    Create this process's ConduitCache (once), attach it to Model and ModelAsync, and initialise
+    conduit's odometer registry.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from conduit.sync import Model, ConduitCache
+            from conduit.batch import ModelAsync
+
+            with _interprocess_lock(_LOCK_PATH):
+                _cache = CountingConduitCache(ConduitCache(name=CACHE_NAME))
+            Model.conduit_cache = _cache
+            ModelAsync.conduit_cache = _cache
+            _ = Model._odometer_registry  # Initialize to load models and GPU resource
+            logger.info(f"Conduit cache '{CACHE_NAME}' attached to sync and batch models")
+        return _cache
+
+
+def get_conduit_cache() -> CountingConduitCache | None:
+    """The installed (counting) ConduitCache, or None before install_conduit_cache() has run."""
+    return _cache
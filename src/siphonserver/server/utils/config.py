@@ -0,0 +1,268 @@
+"""
+Server configuration, read once from SIPHON_* environment variables.
+"""
+
+from pydantic import BaseModel, Field, field_validator
+from pathlib import Path
+import os
+
+ENV_PREFIX = "SIPHON_"
+
+
+class ServerConfig(BaseModel):
+    """Tunables for the server; each field maps to SIPHON_<FIELD_NAME> in the environment."""
+
+    # Server process (production entry point)
+    host: str = Field(default="0.0.0.0", description="Interface the server binds to")
+    port: int = Field(default=8080, ge=1, le=65535, description="Port the server listens on")
+    workers: int = Field(
+        default=1,
+        ge=0,
+        description="Server processes (0 = one per CPU core available to this process)",
+    )
+    timeout_keep_alive_seconds: int = Field(
+        default=5, gt=0, description="Seconds an idle keep-alive connection stays open"
+    )
+    timeout_graceful_shutdown_seconds: int = Field(
+        default=30,
+        ge=0,
+        description="On shutdown, how long in-flight requests get to finish before they are cancelled",
+    )
+    job_drain_timeout_seconds: float = Field(
+        default=30,
+        ge=0,
+        description="On shutdown, how long running jobs get to finish before they are left to resume on restart",
+    )
+
+    # Compression
+    response_compression_enabled: bool = Field(
+        default=True,
+        description="Compress non-streaming responses with gzip/zstd when the client accepts it",
+    )
+    response_compression_min_bytes: int = Field(
+        default=1024, ge=0, description="Responses smaller than this are sent uncompressed"
+    )
+    max_decompressed_request_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Largest size a compressed request body may expand to (0 = unlimited)",
+    )
+
+    # Health
+    health_probe_interval_seconds: float = Field(
+        default=30, gt=0, description="Seconds between background backend probes"
+    )
+    health_probe_model: str = Field(
+        default="llama3.1:latest", description="Local model pinged by the health probe"
+    )
+    readyz_max_queued: int = Field(
+        default=32,
+        ge=0,
+        description="Queued executor tasks above which a saturated pool fails readiness",
+    )
+
+    # Warm-up and keep-alive
+    warmup_models: list[str] = Field(
+        default_factory=list,
+        description="Models loaded at startup before /readyz reports ready (comma-separated in the environment)",
+    )
+    keepalive_interval_seconds: float = Field(
+        default=240,
+        ge=0,
+        description="Seconds between keep-alive pings to warm models (0 = no keep-alive)",
+    )
+    warmup_traffic_enabled: bool = Field(
+        default=False, description="Also pre-warm the most requested local models"
+    )
+    warmup_traffic_window_seconds: float = Field(
+        default=600, gt=0, description="Rolling window for request counts used by traffic pre-warming"
+    )
+    warmup_traffic_top_n: int = Field(
+        default=2, ge=1, description="How many of the busiest models traffic pre-warming keeps warm"
+    )
+    warmup_traffic_min_requests: int = Field(
+        default=5, ge=1, description="Requests within the window before a model is pre-warmed"
+    )
+
+    # Executors
+    llm_workers: int = Field(
+        default=8, ge=1, description="Threads for LLM (sync/async conduit) work"
+    )
+    embedding_workers: int = Field(
+        default=2, ge=1, description="Threads for embedding model forward passes"
+    )
+    synthetic_workers: int = Field(
+        default=4, ge=1, description="Threads for synthetic data generation"
+    )
+
+    # Scheduling
+    scheduler_interactive_weight: int = Field(
+        default=8,
+        ge=1,
+        description="Interactive grants per bulk_weight bulk grants when both classes are waiting",
+    )
+    scheduler_bulk_weight: int = Field(
+        default=1, ge=1, description="Bulk grants per interactive_weight interactive grants"
+    )
+    scheduler_quantum: int = Field(
+        default=1,
+        ge=1,
+        description="Deficit round-robin credit (in items) each client gets per round",
+    )
+
+    max_resident_models: int = Field(
+        default=2,
+        ge=1,
+        description="Local models the GPU holds at once; the scheduler groups work to avoid swapping beyond this",
+    )
+    scheduler_affinity_max_wait_ms: float = Field(
+        default=3000,
+        ge=0,
+        description="Starvation bound: work waiting this long is served even if it forces a model swap",
+    )
+
+    # Per-document embedding cache
+    embedding_cache_enabled: bool = Field(
+        default=True, description="Cache vectors by (model, sha256(document))"
+    )
+    embedding_cache_path: str = Field(
+        default=str(Path.home() / ".siphonserver" / "embedding_cache.db"),
+        description="SQLite file holding float32 vectors",
+    )
+    embedding_cache_max_entries: int = Field(
+        default=5_000_000, ge=1, description="Vectors kept before the oldest are pruned"
+    )
+
+    # Streaming
+    async_stream_concurrency: int = Field(
+        default=8, ge=1, description="Items in flight per streamed /conduit/async batch"
+    )
+
+    # Background jobs
+    jobs_db_path: str = Field(
+        default=str(Path.home() / ".siphonserver" / "jobs.db"),
+        description="SQLite file holding job state and results",
+    )
+    job_workers: int = Field(
+        default=2, ge=1, description="Jobs processed concurrently"
+    )
+    job_item_concurrency: int = Field(
+        default=4, ge=1, description="Items in flight per running job"
+    )
+    job_heartbeat_seconds: float = Field(
+        default=5,
+        gt=0,
+        description="How often a server process marks its jobs alive; another process adopts them after three missed beats",
+    )
+
+    # Synthetic data result cache
+    synthetic_cache_enabled: bool = Field(
+        default=True, description="Cache final SyntheticData results"
+    )
+    synthetic_cache_path: str = Field(
+        default=str(Path.home() / ".siphonserver" / "synthetic_data_cache.db"),
+        description="SQLite file for the on-disk tier",
+    )
+    synthetic_cache_memory_items: int = Field(
+        default=1024, ge=0, description="Entries kept in the in-memory LRU tier"
+    )
+    synthetic_cache_ttl_seconds: float = Field(
+        default=30 * 24 * 3600, ge=0, description="Entry lifetime (0 = never expire)"
+    )
+    synthetic_cache_max_disk_mb: float = Field(
+        default=1024, gt=0, description="Size budget for the on-disk tier"
+    )
+
+    # Model registry
+    model_registry_max_models: int = Field(
+        default=16, ge=1, description="Maximum constructed models kept warm"
+    )
+    model_registry_max_memory_mb: int = Field(
+        default=0,
+        ge=0,
+        description="Approximate memory budget for warm models in MB (0 = count limit only)",
+    )
+
+    # Embedding micro-batching
+    embedding_batch_max_size: int = Field(
+        default=256, ge=1, description="Maximum documents merged into one forward pass"
+    )
+    embedding_batch_max_wait_ms: float = Field(
+        default=5.0,
+        ge=0,
+        description="How long to hold the first request waiting for others to join its batch",
+    )
+
+    # Admission control
+    max_batch_items: int = Field(
+        default=1000,
+        ge=0,
+        description="Most items in one /conduit/async batch (0 = unlimited); larger batches go to /jobs",
+    )
+    max_embedding_documents: int = Field(
+        default=10_000, ge=0, description="Most documents in one embeddings request (0 = unlimited)"
+    )
+    max_prompt_bytes: int = Field(
+        default=8_000_000,
+        ge=0,
+        description="Most UTF-8 prompt/document bytes in one request (0 = unlimited)",
+    )
+    max_in_flight: int = Field(
+        default=64,
+        ge=0,
+        description="Model-bound requests served at once before shedding with 429 (0 = unlimited)",
+    )
+    max_queued_per_pool: int = Field(
+        default=128,
+        ge=0,
+        description="Queued executor tasks in the target pool above which new requests get 429 (0 = unlimited)",
+    )
+    retry_after_seconds: int = Field(
+        default=1, ge=1, description="Retry-After sent with 429 responses"
+    )
+
+    @field_validator("warmup_models", mode="before")
+    @classmethod
+    def _split_models(cls, value):
+        if isinstance(value, str):
+            return [model.strip() for model in value.split(",") if model.strip()]
+        return value
+
+    @classmethod
+    def from_env(cls) -> "ServerConfig":
+        """Build config from the environment, falling back to field defaults."""
+        values = {}
+        for name in cls.model_fields:
+            env_value = os.environ.get(f"{ENV_PREFIX}{name.upper()}")
+            if env_value is not None:
+                values[name] = env_value
+        return cls.model_validate(values)
+
+
+def available_cpus() -> int:
+    """
+    CPU cores this process may actually use: its affinity mask, further capped by a cgroup v2
+    CPU quota when running in a container.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+_config: ServerConfig | None = None
+
+
+def get_config() -> ServerConfig:
+    """Return the process-wide ServerConfig, loading it from the environment on first use."""
+    global _config
+    if _config is None:
+        _config = ServerConfig.from_env()
+    return _config
@@ -0,0 +1,67 @@
+"""
+Per-request deadlines.
+
+Clients may send X-Request-Timeout (seconds). Admission control turns it into a monotonic deadline
+held in a context variable; the execution engine drops work that is still queued when the
+deadline passes and stops waiting for work that overruns it. Work shared by several requests
+(coalesced or batched) runs without any one caller's deadline; each caller stops waiting for it
+at its own deadline via wait_shared().
+"""
+
+from contextvars import ContextVar
+from typing import TypeVar
+import asyncio
+import time
+
+T = TypeVar("T")
+
+DEADLINE_HEADER = "X-Request-Timeout"
+
+
+class DeadlineExceeded(TimeoutError):
+    """The client's X-Request-Timeout expired before the work finished."""
+
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def parse_timeout(value: str | None) -> float | None:
+    """Seconds from an X-Request-Timeout header value; ValueError if it isn't a positive number."""
+    if value is None:
+        return None
+    seconds = float(value)
+    if not seconds > 0:
+        raise ValueError(f"{DEADLINE_HEADER} must be a positive number of seconds")
+    return seconds
+
+
+def set_deadline(timeout: float | None):
+    return _deadline.set(time.monotonic() + timeout if timeout is not None else None)
+
+
+def reset_deadline(token) -> None:
+    _deadline.reset(token)
+
+
+def get_deadline() -> float | None:
+    """Monotonic deadline for the current request, or None when the client didn't set one."""
+    return _deadline.get()
+
+
+def remaining(deadline: float | None) -> float | None:
+    """Seconds left before the deadline (may be negative), or None without a deadline."""
+    return deadline - time.monotonic() if deadline is not None else None
+
+
+async def wait_shared(future: "asyncio.Future[T]", what: str) -> T:
+    """
+    Wait for shared work until the current request's deadline, without cancelling it for the
+    other requests waiting on it. Raises DeadlineExceeded when this request runs out of time.
+    """
+    timeout = remaining(get_deadline())
+    if timeout is None:
+        return await asyncio.shield(future)
+    done, _ = await asyncio.wait({future}, timeout=max(timeout, 0))
+    if future in done:
+        return future.result()
+    raise DeadlineExceeded(f"Deadline expired waiting on {what}")
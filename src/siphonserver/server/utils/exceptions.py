@@ -15,6 +15,8 @@ class ErrorType(str, Enum):
     INTERNAL_ERROR = "internal_error"
     TIMEOUT_ERROR = "timeout_error"
     DEPENDENCY_ERROR = "dependency_error"
+    JOB_NOT_FOUND = "job_not_found"
+    OVERLOADED = "overloaded"
 
 
 class SiphonServerError(BaseModel):
@@ -98,3 +100,15 @@ class SiphonServerError(BaseModel):
             self.context = {}
         self.context[key] = value
         return self
+
+
+class SiphonServerHTTPError(Exception):
+    """
+    Raise from endpoints to return a SiphonServerError as the top-level JSON body
+    (optionally with extra headers such as Retry-After).
+    """
+
+    def __init__(self, error: SiphonServerError, headers: dict[str, str] | None = None):
+        self.error = error
+        self.headers = headers
+        super().__init__(error.message)
@@ -0,0 +1,257 @@
+"""
+Shared execution engine for blocking model work.
+
+Every service hands its blocking call (Model.query, AsyncConduit.run, EmbeddingModel.generate_embeddings,
+SyntheticData.from_context) to one of a few named, separately sized thread pools so the event loop
+stays free to serve /status and other requests. Work waiting for a thread is ordered by each pool's
+FairScheduler (priority class, then per-client fairness) rather than first come, first served.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+import asyncio
+import threading
+import time
+
+from siphonserver.server.utils.config import ServerConfig, get_config
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.timing import get_timings, QUEUE, EXEC
+from siphonserver.server.utils.deadline import DeadlineExceeded, get_deadline, remaining
+from siphonserver.server.utils.metrics import DEADLINE_EXPIRED
+from siphonserver.server.utils.scheduler import (
+    FairScheduler,
+    ModelResidency,
+    get_work_class,
+    INTERACTIVE,
+    BULK,
+)
+
+logger = get_logger(__name__)
+
+# Pool names
+LLM = "llm"
+EMBEDDINGS = "embeddings"
+SYNTHETIC = "synthetic"
+
+
+class _Pool:
+    """A ThreadPoolExecutor plus the counters needed to report saturation and queue length."""
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        config: ServerConfig,
+        residency: ModelResidency | None = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"siphon-{name}"
+        )
+        self.scheduler = FairScheduler(
+            name,
+            slots=max_workers,
+            weights={
+                INTERACTIVE: config.scheduler_interactive_weight,
+                BULK: config.scheduler_bulk_weight,
+            },
+            quantum=config.scheduler_quantum,
+            residency=residency,
+            affinity_max_wait=config.scheduler_affinity_max_wait_ms / 1000,
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _run(
+        self,
+        func: Callable[[], Any],
+        timings=None,
+        submitted_at: float = 0.0,
+        deadline: float | None = None,
+        model: str | None = None,
+        swapped: bool = False,
+    ) -> Any:
+        started_at = time.perf_counter()
+        if timings is not None:
+            timings.add(QUEUE, started_at - submitted_at)
+        if deadline is not None and remaining(deadline) <= 0:
+            # The client has given up; drop the work instead of running it
+            DEADLINE_EXPIRED.inc(pool=self.name, stage="queued")
+            with self._lock:
+                self.completed += 1
+                self.failed += 1
+            self.scheduler.finish(model, 0.0, swapped)
+            raise DeadlineExceeded(f"Deadline expired while queued for the {self.name} pool")
+        with self._lock:
+            self.running += 1
+        try:
+            return func()
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            if timings is not None:
+                timings.add(EXEC, elapsed)
+            self.scheduler.finish(model, elapsed, swapped)
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(
+        self, func: Callable[[], Any], cost: int = 1, model: str | None = None
+    ) -> Any:
+        deadline = get_deadline()
+        timeout = remaining(deadline)
+        if timeout is not None and timeout <= 0:
+            DEADLINE_EXPIRED.inc(pool=self.name, stage="submitted")
+            raise DeadlineExceeded(f"Deadline expired before {self.name} work was queued")
+        with self._lock:
+            self.submitted += 1
+        submitted_at = time.perf_counter()
+
+        # Wait for the scheduler to hand out a worker slot
+        try:
+            swapped = await self.scheduler.acquire(
+                get_work_class(), cost, timeout, model
+            )
+        except BaseException as e:
+            expired = isinstance(e, TimeoutError)
+            with self._lock:
+                self.completed += 1
+                self.failed += int(expired)
+            if expired:
+                DEADLINE_EXPIRED.inc(pool=self.name, stage="queued")
+                raise DeadlineExceeded(
+                    f"Deadline expired while queued for the {self.name} pool"
+                ) from None
+            raise
+
+        # The slot is held until the thread is actually done, even if we stop waiting for it
+        loop = asyncio.get_running_loop()
+        # Queue wait and execution time are charged to the request being served, if any
+        try:
+            thread_future = self.executor.submit(
+                self._run, func, get_timings(), submitted_at, deadline, model, swapped
+            )
+        except BaseException:
+            # Never reached the executor (e.g. it is shut down): give the slot back
+            self.scheduler.finish(model, 0.0, swapped)
+            self.scheduler.release()
+            with self._lock:
+                self.completed += 1
+                self.failed += 1
+            raise
+        thread_future.add_done_callback(lambda _: self._release_soon(loop))
+        future = asyncio.wrap_future(thread_future)
+        try:
+            timeout = remaining(deadline)
+            if timeout is None:
+                return await future
+            done, _ = await asyncio.wait({future}, timeout=max(timeout, 0))
+            if future in done:
+                return future.result()
+            # Running work finishes unobserved
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            DEADLINE_EXPIRED.inc(pool=self.name, stage="abandoned")
+            raise DeadlineExceeded(f"Deadline expired waiting on the {self.name} pool")
+        finally:
+            # Work that never reached a thread (caller cancelled or gave up) is never seen by
+            # _run, so account for it here or it would count as queued forever
+            thread_future.cancel()
+            if thread_future.cancelled():
+                self.scheduler.finish(model, 0.0, swapped)
+                with self._lock:
+                    self.completed += 1
+
+    def _release_soon(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self.scheduler.release)
+        except RuntimeError:
+            # Loop already closed (shutdown); nothing left to schedule
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued = self.submitted - self.completed - self.running
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "saturation": round(self.running / self.max_workers, 3),
+                "scheduler": self.scheduler.stats(),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class ExecutionEngine:
+    """Named thread pools for LLM, embedding and synthetic-data work."""
+
+    def __init__(self, config: ServerConfig):
+        # LLM and synthetic-data work both run local models on the same GPU
+        self.residency = ModelResidency(config.max_resident_models)
+        self.pools: dict[str, _Pool] = {
+            LLM: _Pool(LLM, config.llm_workers, config, self.residency),
+            EMBEDDINGS: _Pool(EMBEDDINGS, config.embedding_workers, config),
+            SYNTHETIC: _Pool(SYNTHETIC, config.synthetic_workers, config, self.residency),
+        }
+
+    async def run(
+        self, pool: str, func: Callable, *args, cost: int = 1, model: str | None = None
+    ) -> Any:
+        """
+        Run a blocking callable on the named pool and await its result. `cost` weighs the call
+        for per-client fairness (e.g. the number of items in a batch); `model` lets the scheduler
+        group work by model to avoid GPU model swaps.
+        """
+        if pool not in self.pools:
+            raise ValueError(f"Unknown executor pool: {pool}")
+        return await self.pools[pool].run(partial(func, *args), cost=cost, model=model)
+
+    def stats(self) -> dict[str, dict]:
+        """Per-pool running/queued counts and saturation (running / max_workers)."""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in self.pools.values():
+            pool.shutdown(wait=wait)
+
+
+_engine: ExecutionEngine | None = None
+
+
+def start_engine(config: ServerConfig | None = None) -> ExecutionEngine:
+    """Create the process-wide engine; called from the FastAPI lifespan hook."""
+    global _engine
+    if _engine is None:
+        config = config or get_config()
+        _engine = ExecutionEngine(config)
+        logger.info(
+            f"Execution engine started: llm={config.llm_workers}, "
+            f"embeddings={config.embedding_workers}, synthetic={config.synthetic_workers}"
+        )
+    return _engine
+
+
+def get_engine() -> ExecutionEngine:
+    """Return the running engine, starting one if used outside the server (scripts, tests)."""
+    return _engine if _engine is not None else start_engine()
+
+
+def shutdown_engine(wait: bool = True) -> None:
+    """Shut down the engine's pools; waits for in-flight work by default."""
+    global _engine
+    if _engine is not None:
+        _engine.shutdown(wait=wait)
+        _engine = None
+        logger.info("Execution engine shut down")
@@ -0,0 +1,23 @@
+"""
+Canonical request hashing, shared by server-side coalescing/caching and the client.
+"""
+
+from pydantic import BaseModel
+from typing import Any
+import hashlib
+import json
+
+
+def canonical_json(data: Any) -> str:
+    """Stable JSON for hashing: sorted keys, no whitespace, pydantic models dumped in JSON mode."""
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def request_hash(request: BaseModel | dict, *extra: str) -> str:
+    """sha256 hex digest of a request's canonical JSON, optionally salted with extra parts."""
+    digest = hashlib.sha256(canonical_json(request).encode())
+    for part in extra:
+        digest.update(b"\0" + part.encode())
+    return digest.hexdigest()
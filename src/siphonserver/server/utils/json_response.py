@@ -0,0 +1,25 @@
+"""
+Fast JSON responses for large Pydantic payloads.
+
+FastAPI's default path for a route's return value validates it against the response model,
+dumps it to Python objects, runs jsonable_encoder over the result and finally json.dumps; for a
+large batch or embedding matrix that is several full walks of the payload in Python.
+PydanticJSONResponse instead hands the models (or lists/dicts of them) straight to pydantic-core,
+which serializes them to JSON bytes in one pass in Rust. Routes return it directly (keeping
+response_model for the OpenAPI schema), so FastAPI skips its own encoding.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+from siphonserver.server.utils.timing import stage, SERIALIZE
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core; NaN and infinity become null."""
+
+    def render(self, content: Any) -> bytes:
+        with stage(SERIALIZE):
+            return to_json(content, inf_nan_mode="null")
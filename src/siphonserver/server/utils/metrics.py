@@ -0,0 +1,258 @@
+"""
+Lightweight Prometheus-style metrics.
+
+Counters, gauges and histograms keyed by label values, rendered in the Prometheus text
+exposition format at /metrics. Recording is a dict lookup and an add under the GIL, cheap enough
+to leave on in production. Values owned by other components (executor queues, cache counters)
+are pulled at scrape time by registered collectors instead of being pushed on every change.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Iterable
+import threading
+
+# Latency buckets in seconds: sub-millisecond cache hits up to multi-minute batch runs
+LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 30, 60, 120, 300,
+)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """Mirror a running total kept by another component (collectors); it must only grow."""
+        self._values[self._key(labels)] = value
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last), sum, count]
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        with self._lock:
+            items = [(key, list(e[0]), e[1], e[2]) for key, e in self._values.items()]
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                labels = _format_labels(self.label_names, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callable that refreshes gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                continue
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# HTTP
+REQUESTS = REGISTRY.counter(
+    "siphon_requests_total", "HTTP requests by route, method and status", ("route", "method", "status")
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    "siphon_request_duration_seconds", "HTTP request latency by route", ("route", "method")
+)
+IN_FLIGHT = REGISTRY.gauge("siphon_requests_in_flight", "HTTP requests currently being served")
+REJECTED = REGISTRY.counter(
+    "siphon_rejected_requests_total", "Requests refused by admission control, by reason", ("reason",)
+)
+DEADLINE_EXPIRED = REGISTRY.counter(
+    "siphon_deadline_expired_total", "Executor tasks dropped or abandoned past the client deadline", ("pool", "stage")
+)
+COMPRESSION_BYTES = REGISTRY.counter(
+    "siphon_compression_bytes_total",
+    "Body bytes of compressed requests and responses, before (raw) and after (wire) compression",
+    ("direction", "encoding", "size"),
+)
+
+# Models
+MODEL_REQUESTS = REGISTRY.counter(
+    "siphon_model_requests_total", "Backend calls by route and model", ("route", "model")
+)
+MODEL_LATENCY = REGISTRY.histogram(
+    "siphon_model_duration_seconds", "Backend call latency by route and model", ("route", "model")
+)
+TOKENS = REGISTRY.counter(
+    "siphon_tokens_total", "Tokens processed by model and direction (input/output)", ("model", "direction")
+)
+TOKENS_PER_SECOND = REGISTRY.histogram(
+    "siphon_output_tokens_per_second",
+    "Output tokens per second of generation, by model",
+    ("model",),
+    buckets=(1, 5, 10, 20, 40, 60, 80, 120, 200, 400),
+)
+EMBEDDING_DOCUMENTS = REGISTRY.counter(
+    "siphon_embedding_documents_total", "Documents embedded by model (rate() gives docs/sec)", ("model",)
+)
+EMBEDDING_BATCH_LATENCY = REGISTRY.histogram(
+    "siphon_embedding_batch_duration_seconds", "Embedding forward pass latency by model", ("model",)
+)
+
+# Executors and caches (refreshed by collectors at scrape time)
+EXECUTOR_QUEUED = REGISTRY.gauge("siphon_executor_queued", "Tasks waiting for a worker thread", ("pool",))
+EXECUTOR_RUNNING = REGISTRY.gauge("siphon_executor_running", "Tasks currently running", ("pool",))
+EXECUTOR_WORKERS = REGISTRY.gauge("siphon_executor_max_workers", "Worker threads per pool", ("pool",))
+SCHEDULER_WAIT = REGISTRY.histogram(
+    "siphon_scheduler_wait_seconds", "Time waiting for an executor slot, by pool and priority class", ("pool", "priority")
+)
+SCHEDULER_WAITING = REGISTRY.gauge(
+    "siphon_scheduler_waiting", "Tasks waiting for an executor slot, by pool and priority class", ("pool", "priority")
+)
+MODEL_SWAPS = REGISTRY.counter(
+    "siphon_model_swaps_total", "Local model loads that evicted another model, by model loaded", ("model",)
+)
+MODEL_SWAP_SECONDS = REGISTRY.counter(
+    "siphon_model_swap_seconds_total",
+    "Estimated time lost to swaps (first run after a swap minus warm average), by model",
+    ("model",),
+)
+RESIDENT_MODELS = REGISTRY.gauge("siphon_resident_models", "Local models the scheduler considers loaded")
+CACHE_HITS = REGISTRY.counter("siphon_cache_hits_total", "Cache hits since startup", ("cache",))
+CACHE_MISSES = REGISTRY.counter("siphon_cache_misses_total", "Cache misses since startup", ("cache",))
+CACHE_HIT_RATIO = REGISTRY.gauge("siphon_cache_hit_ratio", "Cache hit ratio since startup", ("cache",))
+
+
+def observe_model_call(route: str, model: str, seconds: float, response=None) -> None:
+    """Record one backend call; token counts are taken from the response when it carries them."""
+    MODEL_REQUESTS.inc(route=route, model=model)
+    MODEL_LATENCY.observe(seconds, route=route, model=model)
+    if response is not None:
+        observe_tokens(model, response, seconds)
+
+
+def observe_tokens(model: str, response, seconds: float = 0.0) -> None:
+    """Add a response's input/output token counts (if it carries them) to the token metrics."""
+    input_tokens = getattr(response, "input_tokens", None)
+    output_tokens = getattr(response, "output_tokens", None)
+    if isinstance(input_tokens, int):
+        TOKENS.inc(input_tokens, model=model, direction="input")
+    if isinstance(output_tokens, int):
+        TOKENS.inc(output_tokens, model=model, direction="output")
+        if seconds > 0 and output_tokens:
+            TOKENS_PER_SECOND.observe(output_tokens / seconds, model=model)
+
+
+def set_cache_stats(cache: str, hits: int, misses: int) -> None:
+    CACHE_HITS.set_total(hits, cache=cache)
+    CACHE_MISSES.set_total(misses, cache=cache)
+    lookups = hits + misses
+    CACHE_HIT_RATIO.set(hits / lookups if lookups else 0.0, cache=cache)
@@ -0,0 +1,365 @@
+"""
+ASGI middleware for the server.
+"""
+
+from functools import wraps
+import asyncio
+import json
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+
+from siphonserver.server.api import content_encoding
+from siphonserver.server.utils.exceptions import ErrorType, SiphonServerError
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.metrics import (
+    IN_FLIGHT,
+    REQUESTS,
+    REQUEST_LATENCY,
+    COMPRESSION_BYTES,
+)
+from siphonserver.server.utils import timing
+
+logger = get_logger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_MAX_REQUEST_ID_LENGTH = 128
+
+
+def route_template(scope: dict) -> str:
+    """The matched route path (e.g. /jobs/{job_id}) so metric labels stay low-cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Counts requests and records latency per route template, method and status."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc(1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.inc(-1)
+            route = route_template(scope)
+            method = scope["method"]
+            REQUESTS.inc(route=route, method=method, status=str(status_code))
+            REQUEST_LATENCY.observe(time.perf_counter() - start, route=route, method=method)
+
+
+def _incoming_request_id(scope: dict) -> str | None:
+    for name, value in scope.get("headers", []):
+        if name == b"x-request-id":
+            request_id = value.decode("latin-1").strip()
+            if 0 < len(request_id) <= _MAX_REQUEST_ID_LENGTH and request_id.isprintable():
+                return request_id
+    return None
+
+
+class RequestContextMiddleware:
+    """
+    Assigns (or propagates) X-Request-ID, exposes it as request.state.request_id, and times the
+    request's stages into a Server-Timing header and a structured "request timings" log record.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        timings = timing.RequestTimings(request_id)
+        token = timing.set_timings(timings)
+        status_code = 500
+
+        async def receive_wrapper():
+            start = time.perf_counter()
+            message = await receive()
+            if message["type"] == "http.request":
+                timings.add(timing.RECEIVE, time.perf_counter() - start)
+                if not message.get("more_body", False):
+                    timings.mark("body_end")
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                self._finish(timings)
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                headers.append((b"server-timing", timings.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            timing.reset_timings(token)
+            record = {
+                "event": "request_timings",
+                "request_id": request_id,
+                "method": scope["method"],
+                "route": route_template(scope),
+                "status": status_code,
+                "timings_ms": timings.as_dict(),
+            }
+            logger.info(json.dumps(record), extra={"timings": record})
+
+    @staticmethod
+    def _finish(timings: timing.RequestTimings) -> None:
+        """Derive validate/serialize from the endpoint marks and close out the total."""
+        now = time.perf_counter()
+        marks = timings.marks
+        if "endpoint_start" in marks:
+            validate_from = marks.get("body_end", timings.start)
+            timings.add(timing.VALIDATE, max(marks["endpoint_start"] - validate_from, 0.0))
+        if "endpoint_end" in marks:
+            timings.add(timing.SERIALIZE, now - marks["endpoint_end"])
+        timings.add(timing.TOTAL, now - timings.start)
+
+
+class CompressionMiddleware:
+    """
+    Decompresses gzip/zstd request bodies (by Content-Encoding) before the app sees them, and
+    compresses responses of at least min_bytes with the best encoding in Accept-Encoding (see
+    server.api.content_encoding). Streaming responses (server-sent events, NDJSON, or any body
+    sent in several chunks) pass through uncompressed so nothing is held back. Every response
+    that could have been compressed carries Vary: Accept-Encoding, whether or not it was.
+    """
+
+    # Bodies this large are (de)compressed on a worker thread instead of the event loop
+    _OFFLOAD_BYTES = 256 * 1024
+    _STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+    def __init__(
+        self,
+        app,
+        min_bytes: int = 1024,
+        max_decompressed_bytes: int = 0,
+        compress_responses: bool = True,
+    ):
+        self.app = app
+        self.min_bytes = min_bytes
+        self.max_decompressed_bytes = max_decompressed_bytes
+        self.compress_responses = compress_responses
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_encoding = headers.get("content-encoding", "").strip().lower()
+        if request_encoding and request_encoding != content_encoding.IDENTITY:
+            try:
+                scope, receive = await self._decompress_request(scope, receive, request_encoding)
+            except ValueError as e:
+                await self._error_response(scope, request_encoding, e)(scope, receive, send)
+                return
+
+        if not self.compress_responses:
+            await self.app(scope, receive, send)
+            return
+        encoding = content_encoding.negotiate(headers.get("accept-encoding"))
+        await self.app(scope, receive, self._compressing_send(send, encoding))
+
+    async def _run(self, func, data: bytes, *args):
+        if len(data) >= self._OFFLOAD_BYTES:
+            return await asyncio.to_thread(func, data, *args)
+        return func(data, *args)
+
+    async def _decompress_request(self, scope, receive, encoding: str):
+        """Read the whole body, decode it, and hand the app a plain request with one body message."""
+        if encoding not in content_encoding.supported():
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client went away mid-body; let the app see the disconnect
+                async def disconnected():
+                    return message
+
+                return scope, disconnected
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        compressed = b"".join(chunks)
+
+        timings = timing.get_timings()
+        with timing.stage(timing.RECEIVE):
+            body = await self._run(
+                content_encoding.decompress, compressed, encoding, self.max_decompressed_bytes
+            )
+        if timings is not None:
+            timings.mark("body_end")
+        COMPRESSION_BYTES.inc(len(compressed), direction="request", encoding=encoding, size="wire")
+        COMPRESSION_BYTES.inc(len(body), direction="request", encoding=encoding, size="raw")
+
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        delivered = False
+
+        async def decompressed_receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        # Rewrite in place so outer middleware still sees the route the router records in scope
+        scope["headers"] = headers
+        return scope, decompressed_receive
+
+    @staticmethod
+    def _error_response(scope, encoding: str, error: ValueError) -> JSONResponse:
+        if isinstance(error, content_encoding.DecompressedTooLarge):
+            error_type, status_code = ErrorType.BATCH_SIZE_EXCEEDED, 413
+        elif encoding not in content_encoding.supported():
+            error_type, status_code = ErrorType.INVALID_REQUEST, 415
+        else:
+            error_type, status_code = ErrorType.INVALID_REQUEST, 400
+        server_error = SiphonServerError(
+            error_type=error_type,
+            message=str(error),
+            status_code=status_code,
+            path=scope.get("path"),
+            method=scope.get("method"),
+            request_id=scope.get("state", {}).get("request_id"),
+        )
+        logger.warning(f"Request body rejected: {server_error.message}")
+        headers = {"Accept-Encoding": ", ".join(content_encoding.supported())}
+        return JSONResponse(
+            status_code=status_code, content=server_error.model_dump(), headers=headers
+        )
+
+    def _compressing_send(self, send, encoding: str | None):
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or content_type.startswith(self._STREAMING_TYPES)
+                    or message["status"] in (204, 304)
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Caches must key this response on Accept-Encoding even when it goes out plain
+                vary = MutableHeaders(raw=list(message.get("headers", [])))
+                vary.add_vary_header("Accept-Encoding")
+                message = {**message, "headers": vary.raw}
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the headers until the body shows whether it is worth compressing
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            passthrough = True
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.min_bytes:
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._run(content_encoding.compress, body, encoding)
+            if len(compressed) >= len(body):
+                await send(start)
+                await send(message)
+                return
+            COMPRESSION_BYTES.inc(len(body), direction="response", encoding=encoding, size="raw")
+            COMPRESSION_BYTES.inc(len(compressed), direction="response", encoding=encoding, size="wire")
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        return send_wrapper
+
+
+def _timed_endpoint(endpoint):
+    """Mark endpoint entry/exit so the middleware can split validation and serialization time."""
+
+    def enter():
+        timings = timing.get_timings()
+        if timings is not None:
+            timings.mark("endpoint_start")
+        return timings
+
+    def leave(timings):
+        if timings is not None:
+            timings.mark("endpoint_end")
+
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            timings = enter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                leave(timings)
+
+    else:
+
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            timings = enter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                leave(timings)
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute whose endpoint records when it starts and returns."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
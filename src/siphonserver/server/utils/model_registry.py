@@ -0,0 +1,179 @@
+"""
+Process-wide registry of constructed model objects.
+
+Model and EmbeddingModel instances are kept warm keyed by (kind, model name) so requests stop
+paying construction cost (and, for sentence-transformers, weight loading) per call. The least
+recently used entry is evicted once the count or memory budget is exceeded.
+
+ModelAsync is deliberately not cached: every AsyncConduit.run spins up its own event loop on an
+LLM thread, and async HTTP clients held by a shared instance would be bound to whichever loop
+created them. new_async_model() builds a fresh one per run instead.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable
+import threading
+
+from siphonserver.server.utils.conduit_cache import install_conduit_cache
+from siphonserver.server.utils.config import get_config
+from siphonserver.server.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Model kinds
+SYNC = "sync"
+EMBEDDING = "embedding"
+
+
+def _build_sync(name: str) -> Any:
+    from conduit.sync import Model
+
+    install_conduit_cache()
+    return Model(name)
+
+
+def new_async_model(name: str) -> Any:
+    """A fresh ModelAsync for one AsyncConduit.run (and so one event loop); never cached."""
+    from conduit.model.model_async import ModelAsync
+
+    install_conduit_cache()
+    return ModelAsync(name)
+
+
+def _build_embedding(name: str) -> Any:
+    from conduit.embeddings.embedding_model import EmbeddingModel
+
+    return EmbeddingModel(name)
+
+
+_FACTORIES: dict[str, Callable[[str], Any]] = {
+    SYNC: _build_sync,
+    EMBEDDING: _build_embedding,
+}
+
+
+def estimate_model_bytes(obj: Any) -> int:
+    """
+    Best-effort resident size of a model object: sums torch parameter/buffer sizes of any
+    nn.Module found on the object (or one level down). Remote/Ollama wrappers report 0.
+    """
+    candidates = [obj] + list(getattr(obj, "__dict__", {}).values())
+    total = 0
+    seen = set()
+    for candidate in candidates:
+        if id(candidate) in seen or not hasattr(candidate, "parameters"):
+            continue
+        seen.add(id(candidate))
+        try:
+            tensors = list(candidate.parameters())
+            if hasattr(candidate, "buffers"):
+                tensors += list(candidate.buffers())
+            total += sum(t.numel() * t.element_size() for t in tensors)
+        except Exception:
+            continue
+    return total
+
+
+class ModelRegistry:
+    """Thread-safe LRU of constructed model objects with hit/miss/eviction counters."""
+
+    def __init__(self, max_models: int = 16, max_memory_mb: int = 0):
+        self.max_models = max_models
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self._models: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: dict[tuple[str, str], threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kind: str, name: str) -> Any:
+        """Return a warm instance for (kind, name), constructing it on first use."""
+        if kind not in _FACTORIES:
+            raise ValueError(f"Unknown model kind: {kind}")
+        key = (kind, name)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key][0]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # Construct outside the registry lock so slow loads don't block other models
+        try:
+            with build_lock:
+                with self._lock:
+                    if key in self._models:
+                        self._models.move_to_end(key)
+                        self.hits += 1
+                        return self._models[key][0]
+                    self.misses += 1
+                logger.info(f"Loading {kind} model: {name}")
+                instance = _FACTORIES[kind](name)
+                size = estimate_model_bytes(instance)
+                with self._lock:
+                    self._models[key] = (instance, size)
+                    self._evict(keep=key)
+                return instance
+        finally:
+            # Also on failure: names come from clients, so a lock per bad name would pile up
+            with self._lock:
+                if self._build_locks.get(key) is build_lock:
+                    del self._build_locks[key]
+
+    def _evict(self, keep: tuple[str, str]) -> None:
+        """Drop least recently used entries until within budget; caller holds the lock."""
+        while len(self._models) > 1 and (
+            len(self._models) > self.max_models
+            or (self.max_memory_bytes and self.memory_bytes > self.max_memory_bytes)
+        ):
+            key = next(iter(self._models))
+            if key == keep:
+                break
+            self._models.pop(key)
+            self.evictions += 1
+            logger.info(f"Evicted {key[0]} model: {key[1]}")
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(size for _, size in self._models.values())
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "models": [f"{kind}:{name}" for kind, name in self._models],
+                "count": len(self._models),
+                "max_models": self.max_models,
+                "memory_bytes": self.memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide ModelRegistry, sized from ServerConfig."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            config = get_config()
+            _registry = ModelRegistry(
+                max_models=config.model_registry_max_models,
+                max_memory_mb=config.model_registry_max_memory_mb,
+            )
+        return _registry
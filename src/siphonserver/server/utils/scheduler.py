@@ -0,0 +1,452 @@
+"""
+Priority classes and per-client fair scheduling for the executor pools.
+
+Each pool lets at most max_workers tasks onto its threads at once; everything else waits here
+instead of in the ThreadPoolExecutor's FIFO queue. Waiting work is ordered on two levels:
+
+- Between priority classes by weighted stride scheduling: with both classes waiting, interactive
+  work gets `interactive_weight` grants for every `bulk_weight` bulk grants, so bulk work is slowed
+  but never starved.
+- Within a class by deficit round-robin across client ids, so a client with a deep queue cannot
+  crowd out everyone else. A task's cost (e.g. the number of items in a batch) is charged against
+  its client's deficit.
+
+For pools that run local (GPU) models, a shared ModelResidency adds model affinity inside each
+class: work for a model that is already loaded (or that fits without evicting one) goes ahead of
+work that would force a swap, so one model's queue drains before the GPU switches weights. Work
+that has waited longer than the starvation bound since it arrived is served regardless, so no
+waiter is deferred for more than that bound by affinity.
+
+The priority class and client id come from the request (see server.utils.admission) through a
+context variable, so services don't have to pass them down. Work that other requests may attach
+to runs in a detached_context(): the starting request's class and client, without its deadline or
+timings. Once a second request does attach, mark_shared() reschedules it under a client of its own,
+so it isn't charged to whichever request started it.
+"""
+
+from collections import OrderedDict, deque
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass
+from typing import Callable, Iterable
+import asyncio
+import threading
+import time
+
+from siphonserver.server.utils.deadline import set_deadline
+from siphonserver.server.utils.timing import set_timings
+from siphonserver.server.utils.metrics import (
+    SCHEDULER_WAIT,
+    MODEL_SWAPS,
+    MODEL_SWAP_SECONDS,
+)
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+
+PRIORITY_HEADER = "X-Priority"
+CLIENT_HEADER = "X-Client-ID"
+
+
+@dataclass(frozen=True)
+class WorkClass:
+    """Who a unit of executor work is for: its priority class and the client to be fair across."""
+
+    priority: str = BULK
+    client: str = "background"
+
+
+_work_class: ContextVar[WorkClass] = ContextVar("work_class", default=WorkClass())
+
+
+def get_work_class() -> WorkClass:
+    return _work_class.get()
+
+
+def set_work_class(priority: str, client: str):
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority class: {priority}")
+    return _work_class.set(WorkClass(priority, client))
+
+
+def reset_work_class(token) -> None:
+    _work_class.reset(token)
+
+
+def highest(priorities: Iterable[str]) -> str:
+    """The highest of some priority classes."""
+    return min(priorities, key=PRIORITIES.index)
+
+
+def detached_context() -> Context:
+    """
+    A copy of the current context for work other requests may attach to (coalesced or batched):
+    the same work class, but no deadline or timings, since those belong to this request alone.
+    """
+    context = copy_context()
+    context.run(set_deadline, None)
+    context.run(set_timings, None)
+    return context
+
+
+def mark_shared(context: Context, priority: str, name: str) -> None:
+    """
+    Schedule detached work as shared by several requests from now on: a work class of its own
+    instead of the client that started it. Call it while the work is not running (from another
+    task on the loop), since a context can't be entered twice.
+    """
+    context.run(set_work_class, priority, f"shared:{name}")
+
+
+@dataclass(eq=False)
+class _Waiter:
+    client: str
+    cost: int
+    future: asyncio.Future
+    enqueued_at: float
+    model: str | None = None
+
+
+class ModelResidency:
+    """
+    Which local models are (probably) loaded on the GPU, in least recently used order, plus swap
+    counters. Shared by every pool that runs local models, since they share the GPU.
+    """
+
+    # Weight for the running average of warm execution time per model
+    _WARM_SMOOTHING = 0.2
+
+    def __init__(self, max_resident: int):
+        self.max_resident = max_resident
+        self._lock = threading.Lock()
+        self._resident: OrderedDict[str, None] = OrderedDict()
+        self._running: dict[str, int] = {}
+        self._local: set[str] = set()
+        self._warm_seconds: dict[str, float] = {}
+        self._cold_seconds: dict[str, float] = {}  # first run after a swap, until a warm baseline exists
+        # Counters
+        self.swaps = 0
+        self.swap_seconds = 0.0
+
+    def set_local_models(self, models: Iterable[str]) -> None:
+        """Models served by the local backend (e.g. Ollama's list); only these can swap."""
+        local = set()
+        for model in models:
+            local.add(model)
+            if model.endswith(":latest"):
+                local.add(model.removesuffix(":latest"))
+        with self._lock:
+            self._local = local
+
+    def is_local(self, model: str | None) -> bool:
+        return model is not None and model in self._local
+
+    def is_cheap(self, model: str | None) -> bool:
+        """True if running the model now would not evict another model's weights."""
+        return self.cheap_check()(model)
+
+    def cheap_check(self) -> Callable[[str | None], bool]:
+        """is_cheap against one snapshot of the resident set, for checking many waiters at once."""
+        local = self._local
+        with self._lock:
+            resident = set(self._resident)
+            has_room = len(self._resident) < self.max_resident
+        return lambda model: model not in local or has_room or model in resident
+
+    def start(self, model: str | None) -> bool:
+        """Note that work for the model is starting; returns True if that means a swap."""
+        if not self.is_local(model):
+            return False
+        with self._lock:
+            self._running[model] = self._running.get(model, 0) + 1
+            if model in self._resident:
+                self._resident.move_to_end(model)
+                return False
+            swapped = len(self._resident) >= self.max_resident
+            if swapped:
+                # Evict the least recently used model that isn't running; if all are running the
+                # backend will hold both for now and we stay over budget until one goes idle
+                idle = [name for name in self._resident if not self._running.get(name)]
+                if idle:
+                    del self._resident[idle[0]]
+                self.swaps += 1
+            self._resident[model] = None
+        if swapped:
+            MODEL_SWAPS.inc(model=model)
+        return swapped
+
+    def finish(self, model: str | None, seconds: float, swapped: bool) -> None:
+        """Record the execution time; time beyond the model's warm average after a swap is lost."""
+        if not self.is_local(model):
+            return
+        lost = 0.0
+        with self._lock:
+            self._running[model] -= 1
+            warm = self._warm_seconds.get(model)
+            if swapped:
+                if warm is None:
+                    self._cold_seconds[model] = seconds
+                else:
+                    lost = max(seconds - warm, 0.0)
+            else:
+                self._warm_seconds[model] = (
+                    seconds
+                    if warm is None
+                    else warm + self._WARM_SMOOTHING * (seconds - warm)
+                )
+                cold = self._cold_seconds.pop(model, None)
+                if cold is not None:
+                    lost = max(cold - self._warm_seconds[model], 0.0)
+            self.swap_seconds += lost
+            while len(self._resident) > self.max_resident:
+                idle = [name for name in self._resident if not self._running.get(name)]
+                if not idle:
+                    break
+                del self._resident[idle[0]]
+        if lost:
+            MODEL_SWAP_SECONDS.inc(lost, model=model)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "resident": list(self._resident),
+                "max_resident": self.max_resident,
+                "local_models": len(self._local),
+                "swaps": self.swaps,
+                "swap_seconds": round(self.swap_seconds, 3),
+            }
+
+
+class _DeficitRoundRobin:
+    """Per-client FIFO queues served in deficit round-robin order."""
+
+    def __init__(self, quantum: int):
+        self.quantum = quantum
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._deficits: dict[str, int] = {}
+        self._turn: str | None = None  # client at the head of the round that has had its quantum
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.client)
+        if queue is None:
+            queue = self._queues[waiter.client] = deque()
+            self._deficits[waiter.client] = 0
+        queue.append(waiter)
+        self._size += 1
+
+    def remove(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.client)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._size -= 1
+        if not queue:
+            self._drop(waiter.client)
+
+    def waiters(self) -> Iterable[_Waiter]:
+        for queue in self._queues.values():
+            yield from queue
+
+    def pop(self, eligible: Callable[[_Waiter], bool] | None = None) -> _Waiter | None:
+        """Next waiter in DRR order, considering only eligible waiters (all if eligible is None)."""
+
+        def first_eligible(queue: deque[_Waiter]) -> _Waiter | None:
+            return next((w for w in queue if eligible is None or eligible(w)), None)
+
+        heads = {client: first_eligible(queue) for client, queue in self._queues.items()}
+        heads = {client: waiter for client, waiter in heads.items() if waiter is not None}
+        if not heads:
+            return None
+        # Credit whole rounds in which nobody could afford its next task in one step, rather
+        # than looping cost / quantum times
+        rounds = min(
+            -(-(waiter.cost - self._deficits[client]) // self.quantum)
+            for client, waiter in heads.items()
+        )
+        if rounds > 1:
+            for client in heads:
+                self._deficits[client] += (rounds - 1) * self.quantum
+        while True:
+            for client, queue in self._queues.items():
+                waiter = first_eligible(queue)
+                if waiter is None:
+                    continue
+                if self._turn != client:
+                    self._turn = client
+                    self._deficits[client] += self.quantum
+                if self._deficits[client] >= waiter.cost:
+                    queue.remove(waiter)
+                    self._deficits[client] -= waiter.cost
+                    self._size -= 1
+                    if not queue:
+                        self._drop(client)
+                    return waiter
+                # Not enough credit for its task: go to the back of the round
+                self._queues.move_to_end(client)
+                self._turn = None
+                break
+
+    def _drop(self, client: str) -> None:
+        # An idle client keeps no credit
+        del self._queues[client]
+        del self._deficits[client]
+        if self._turn == client:
+            self._turn = None
+
+    def clients(self) -> int:
+        return len(self._queues)
+
+
+class FairScheduler:
+    """Grants up to `slots` concurrent tasks, choosing among waiters by class weight, then DRR."""
+
+    def __init__(
+        self,
+        name: str,
+        slots: int,
+        weights: dict[str, int],
+        quantum: int = 1,
+        residency: ModelResidency | None = None,
+        affinity_max_wait: float = 0.0,
+    ):
+        self.name = name
+        self.slots = slots
+        self.weights = weights
+        self.residency = residency
+        self.affinity_max_wait = affinity_max_wait
+        self.busy = 0
+        self._queues = {priority: _DeficitRoundRobin(quantum) for priority in PRIORITIES}
+        self._pass = {priority: 0.0 for priority in PRIORITIES}
+        self._vtime = 0.0
+        # Counters per class
+        self._granted = {priority: 0 for priority in PRIORITIES}
+        self._wait_total = {priority: 0.0 for priority in PRIORITIES}
+        self._wait_max = {priority: 0.0 for priority in PRIORITIES}
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(
+        self,
+        work: WorkClass,
+        cost: int = 1,
+        timeout: float | None = None,
+        model: str | None = None,
+    ) -> bool:
+        """
+        Wait for a slot; returns True if running the model means swapping another one out.
+        Raises TimeoutError if no slot was granted within timeout. The caller must call release()
+        once its task has finished (and finish() for the model).
+        """
+        priority = work.priority if work.priority in self._queues else BULK
+        if self.busy < self.slots and not self.waiting:
+            self.busy += 1
+            self._record(priority, 0.0)
+            return self._start(model)
+
+        waiter = _Waiter(
+            work.client,
+            max(cost, 1),
+            asyncio.get_running_loop().create_future(),
+            time.perf_counter(),
+            model,
+        )
+        queue = self._queues[priority]
+        if not queue:
+            # A class returning from idle doesn't get credit for the time it was away
+            self._pass[priority] = max(self._pass[priority], self._vtime)
+        queue.push(waiter)
+        try:
+            swapped = await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except (TimeoutError, asyncio.CancelledError):
+            if waiter.future.done():
+                # Granted at the last moment; hand the slot (and model) back
+                self.finish(model, 0.0, waiter.future.result())
+                self.release()
+            else:
+                queue.remove(waiter)
+                waiter.future.cancel()
+            raise
+        self._record(priority, time.perf_counter() - waiter.enqueued_at)
+        return swapped
+
+    def _start(self, model: str | None) -> bool:
+        return self.residency.start(model) if self.residency is not None else False
+
+    def finish(self, model: str | None, seconds: float, swapped: bool) -> None:
+        """Report that work for the model has finished (see ModelResidency.finish)."""
+        if self.residency is not None:
+            self.residency.finish(model, seconds, swapped)
+
+    def release(self) -> None:
+        self.busy -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.busy < self.slots:
+            waiter = self._next()
+            if waiter is None:
+                return
+            self.busy += 1
+            waiter.future.set_result(self._start(waiter.model))
+
+    def _next(self) -> _Waiter | None:
+        active = [priority for priority in PRIORITIES if self._queues[priority]]
+        if not active:
+            return None
+        # Stride scheduling: the class with the lowest pass goes next (ties favour interactive)
+        priority = min(active, key=lambda p: self._pass[p])
+        self._vtime = self._pass[priority]
+        self._pass[priority] += 1 / self.weights[priority]
+        queue = self._queues[priority]
+        return queue.pop(self._eligibility(queue))
+
+    def _eligibility(self, queue: _DeficitRoundRobin) -> Callable[[_Waiter], bool] | None:
+        """
+        Model affinity within a class: starved work first, then work that doesn't force a swap,
+        then (if everything would swap) plain fair order.
+        """
+        if self.residency is None:
+            return None
+        now = time.perf_counter()
+        is_cheap = self.residency.cheap_check()
+        starved = set()
+        any_cheap = False
+        for waiter in queue.waiters():
+            if is_cheap(waiter.model):
+                any_cheap = True
+            elif now - waiter.enqueued_at >= self.affinity_max_wait:
+                starved.add(waiter)
+        if starved:
+            return lambda waiter: waiter in starved
+        if any_cheap:
+            return lambda waiter: is_cheap(waiter.model)
+        return None
+
+    def _record(self, priority: str, wait: float) -> None:
+        self._granted[priority] += 1
+        self._wait_total[priority] += wait
+        self._wait_max[priority] = max(self._wait_max[priority], wait)
+        SCHEDULER_WAIT.observe(wait, pool=self.name, priority=priority)
+
+    def stats(self) -> dict[str, dict]:
+        """Per class: waiting tasks and clients, grants, and mean/max queue wait."""
+        stats = {}
+        for priority in PRIORITIES:
+            granted = self._granted[priority]
+            stats[priority] = {
+                "waiting": len(self._queues[priority]),
+                "clients": self._queues[priority].clients(),
+                "granted": granted,
+                "mean_wait_ms": (
+                    round(self._wait_total[priority] / granted * 1000, 2) if granted else 0.0
+                ),
+                "max_wait_ms": round(self._wait_max[priority] * 1000, 2),
+            }
+        return stats
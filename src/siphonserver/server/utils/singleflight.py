@@ -0,0 +1,101 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+The first caller for a key starts the computation; callers arriving with the same key while it
+is still running attach to the same result instead of hitting the backend again. The task runs in
+a detached copy of the first caller's context (see scheduler.detached_context): it keeps that
+caller's priority and client but not its deadline, and is rescheduled as shared work once a second
+caller attaches. Each caller waits only until its own deadline, and the task is cancelled once
+every caller has gone.
+"""
+
+from contextvars import Context
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+import asyncio
+
+from siphonserver.server.utils.deadline import wait_shared
+from siphonserver.server.utils.logging_config import get_logger
+from siphonserver.server.utils.scheduler import (
+    detached_context,
+    get_work_class,
+    highest,
+    mark_shared,
+)
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(eq=False)
+class _Flight:
+    task: asyncio.Task
+    context: Context
+    priority: str
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key onto one running task."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[str, _Flight] = {}
+        self.calls = 0  # Backend calls actually made
+        self.coalesced = 0  # Callers served by someone else's call
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Await func() for this key, sharing the result with concurrent callers of the same key."""
+        priority = get_work_class().priority
+        flight = self._inflight.get(key)
+        if flight is None:
+            self.calls += 1
+            # Run as its own task so one caller disconnecting doesn't cancel it for the others
+            context = detached_context()
+            task = asyncio.get_running_loop().create_task(func(), context=context)
+            flight = _Flight(task, context, priority)
+            self._inflight[key] = flight
+            task.add_done_callback(lambda done: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+            # No longer one caller's work: schedule it as shared, at the most urgent caller's class
+            flight.priority = highest((flight.priority, priority))
+            mark_shared(flight.context, flight.priority, self.name)
+            logger.debug(f"[{self.name}] Coalesced duplicate request {key[:12]}")
+
+        flight.waiters += 1
+        try:
+            return await wait_shared(flight.task, f"coalesced {self.name} request")
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters:
+                # Nobody is waiting for the result any more; later callers start afresh
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+_groups: dict[str, SingleFlight] = {}
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight group for a service."""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def singleflight_stats() -> dict[str, dict]:
+    """Calls made vs. coalesced per group; 'coalesced' is the number of backend calls saved."""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,218 @@
+"""
+Two-tier string cache: an in-memory LRU in front of a SQLite store with TTL and size limits.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+from siphonserver.server.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals SELECT 'disk_bytes', COALESCE(SUM(size), 0) FROM entries;
+"""
+
+
+class TieredCache:
+    """
+    Memory LRU (max_memory_items, and max_memory_mb of values if set) backed by an on-disk
+    SQLite tier (max_disk_mb). A value larger than the whole memory budget is kept on disk only.
+    Entries older than ttl_seconds are treated as misses in both tiers (0 = never expire).
+    When the disk tier exceeds its budget, least recently accessed entries are dropped.
+
+    Several processes may share one database file: every write is one transaction that also
+    keeps the shared disk byte total (the totals table) up to date.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_memory_items: int = 1024,
+        ttl_seconds: float = 0,
+        max_disk_mb: float = 1024,
+        max_memory_mb: float = 0,
+    ):
+        self.path = Path(path)
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)  # 0 = count-bounded only
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        # executescript() commits any open transaction first, so the script takes its own
+        self._conn.executescript(f"BEGIN IMMEDIATE; {_SCHEMA} COMMIT;")
+
+        # Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                self._forget(key)
+
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    with self._transaction():
+                        self._delete(key)
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode())
+        with self._lock:
+            self._remember(key, value, now)
+            with self._transaction():
+                self._delete(key)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (key, value, size, now, now),
+                )
+                disk_bytes = self._add_disk_bytes(size)
+                if disk_bytes > self.max_disk_bytes:
+                    self._shrink(disk_bytes)
+
+    @contextmanager
+    def _transaction(self):
+        """One write transaction, taken up front so other processes' writes can't interleave."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _add_disk_bytes(self, delta: int) -> int:
+        """Adjust the shared disk byte total and return it; caller is in a transaction."""
+        self._conn.execute(
+            "UPDATE totals SET value = value + ? WHERE name = 'disk_bytes'", (delta,)
+        )
+        return self._disk_bytes()
+
+    def _disk_bytes(self) -> int:
+        (value,) = self._conn.execute(
+            "SELECT value FROM totals WHERE name = 'disk_bytes'"
+        ).fetchone()
+        return value
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._forget(key)
+        size = len(value)  # Characters; the cached values are mostly ASCII
+        if self.max_memory_bytes and size > self.max_memory_bytes:
+            return
+        self._memory[key] = (value, created_at)
+        self._memory_bytes += size
+        while len(self._memory) > self.max_memory_items or (
+            self.max_memory_bytes and self._memory_bytes > self.max_memory_bytes
+        ):
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _forget(self, key: str) -> None:
+        """Drop key from the memory tier; caller holds the lock."""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[0])
+
+    def _delete(self, key: str) -> None:
+        """Drop key from the disk tier; caller is in a transaction."""
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._add_disk_bytes(-row[0])
+
+    def _shrink(self, disk_bytes: int) -> None:
+        """
+        Drop least recently accessed disk entries until 90% of the budget; caller holds the lock
+        and is in a transaction.
+        """
+        target = int(self.max_disk_bytes * 0.9)
+        freed = evicted = 0
+        while disk_bytes - freed > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 500"
+            ).fetchall()
+            if not rows:
+                break
+            batch = []
+            for key, size in rows:
+                if disk_bytes - freed <= target:
+                    break
+                batch.append((key,))
+                freed += size
+                self._forget(key)
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", batch)
+            evicted += len(batch)
+        self._add_disk_bytes(-freed)
+        logger.info(f"Evicted {evicted} entries from {self.path.name}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            with self._transaction():
+                self._conn.execute("DELETE FROM entries")
+                self._conn.execute("UPDATE totals SET value = 0 WHERE name = 'disk_bytes'")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes(),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            }
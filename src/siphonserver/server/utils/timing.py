@@ -0,0 +1,81 @@
+"""
+Per-request stage timings.
+
+RequestContextMiddleware puts a RequestTimings in a context variable for each HTTP request; code
+further down (request validators, the execution engine, TimedRoute) adds stage durations to it,
+and the middleware returns them in a Server-Timing header and a structured log record.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
+# Stage names, in the order they happen
+RECEIVE = "receive"  # reading the request body off the socket
+VALIDATE = "validate"  # JSON decode + Pydantic validation, up to the endpoint call
+DESERIALIZE = "deserialize"  # SyntheticDataRequest.deserialize_context (part of validate)
+QUEUE = "queue"  # waiting for an executor thread
+EXEC = "exec"  # model execution on the executor thread
+SERIALIZE = "serialize"  # endpoint return to response start (response_model encoding)
+TOTAL = "total"  # request start to response start
+_ORDER = (RECEIVE, VALIDATE, DESERIALIZE, QUEUE, EXEC, SERIALIZE, TOTAL)
+
+
+class RequestTimings:
+    """Accumulated seconds per stage for one request, plus marks used to derive stages."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.start = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.marks: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = time.perf_counter()
+
+    def _ordered(self) -> list[tuple[str, float]]:
+        rank = {stage: index for index, stage in enumerate(_ORDER)}
+        return sorted(self.stages.items(), key=lambda item: rank.get(item[0], len(rank)))
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds."""
+        return ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self._ordered())
+
+    def as_dict(self) -> dict[str, float]:
+        return {stage: round(seconds * 1000, 2) for stage, seconds in self._ordered()}
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def get_timings() -> RequestTimings | None:
+    """The timings for the request being served, or None outside a request."""
+    return _current.get()
+
+
+def set_timings(timings: RequestTimings | None):
+    return _current.set(timings)
+
+
+def reset_timings(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Add the duration of the with-block to the current request's stage (no-op outside requests)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
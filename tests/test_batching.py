@@ -0,0 +1,134 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+# The client modules import the request models (conduit) and the client's own dependencies
+for module in ("conduit", "siphon", "dbclients"):
+    pytest.importorskip(module)
+
+from siphonserver.client.batching import (
+    ChunkSizer,
+    _chunks,
+    _dispatch,
+    _adispatch,
+    _timed_call,
+    _atimed_call,
+)
+from siphonserver.client.siphonclient import SiphonServerException
+from siphonserver.server.utils.exceptions import ErrorType, SiphonServerError
+
+
+def _too_large() -> SiphonServerException:
+    return SiphonServerException(
+        SiphonServerError(
+            error_type=ErrorType.BATCH_SIZE_EXCEEDED, message="too large", status_code=413
+        )
+    )
+
+
+def test_sizer_clamps_initial():
+    assert ChunkSizer(5000, maximum=100).size == 100
+    assert ChunkSizer(0, minimum=2).size == 2
+
+
+def test_sizer_adapts_toward_target():
+    sizer = ChunkSizer(10, maximum=1000, target_seconds=10.0)
+    sizer.observe(10, 1.0)  # 0.1 s per item: ideal is 100, but at most double
+    assert sizer.size == 20
+    sizer.observe(20, 2.0)
+    assert sizer.size == 40
+    sizer.observe(40, 40.0)  # Suddenly slow: shrinks at once
+    assert sizer.size < 40
+
+
+def test_sizer_fixed_when_not_adaptive():
+    sizer = ChunkSizer(10, adaptive=False)
+    sizer.observe(10, 100.0)
+    assert sizer.size == 10
+
+
+def test_sizer_rejected_stays_below():
+    sizer = ChunkSizer(100, maximum=1000)
+    sizer.rejected(100)
+    assert sizer.maximum == 50 and sizer.size == 50
+    sizer.observe(1, 0.0001)
+    assert sizer.size <= 50
+
+
+def test_chunks_by_count_and_bytes():
+    sizer = ChunkSizer(3, adaptive=False)
+    items = [str(i) for i in range(8)]
+    assert list(_chunks(items, sizer, 0)) == [items[0:3], items[3:6], items[6:8]]
+    sizer = ChunkSizer(100, adaptive=False)
+    assert list(_chunks(["aaaa", "bbbb", "cc", "d"], sizer, 6)) == [["aaaa", "bbbb"], ["cc", "d"]]
+    assert list(_chunks([], sizer, 0)) == []
+
+
+def test_chunks_read_lazily():
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield str(i)
+
+    chunks = _chunks(items(), ChunkSizer(10, adaptive=False), 0)
+    assert next(chunks) == [str(i) for i in range(10)]
+    assert len(consumed) == 10
+
+
+def test_dispatch_preserves_order():
+    rng = random.Random(7)
+
+    def call(chunk):
+        time.sleep(rng.random() / 100)
+        return [item.upper() for item in chunk]
+
+    items = [f"item{i}" for i in range(200)]
+    chunks = _chunks(items, ChunkSizer(7, adaptive=False), 0)
+    assert list(_dispatch(chunks, call, concurrency=4)) == [item.upper() for item in items]
+
+
+def test_timed_call_splits_rejected_chunks():
+    calls = []
+
+    def call(chunk):
+        calls.append(len(chunk))
+        if len(chunk) > 2:
+            raise _too_large()
+        return chunk
+
+    sizer = ChunkSizer(8, adaptive=False)
+    items = [str(i) for i in range(8)]
+    assert _timed_call(sizer, call)(items) == items
+    assert calls[0] == 8 and max(calls[1:]) <= 4
+    assert sizer.maximum < 8
+
+
+def test_timed_call_reraises_other_errors():
+    def call(chunk):
+        raise SiphonServerException(
+            SiphonServerError(error_type=ErrorType.OVERLOADED, message="busy", status_code=429)
+        )
+
+    with pytest.raises(SiphonServerException):
+        _timed_call(ChunkSizer(4), call)([1, 2, 3, 4])
+
+
+def test_adispatch_preserves_order_and_splits():
+    async def call(chunk):
+        if len(chunk) > 3:
+            raise _too_large()
+        await asyncio.sleep(0.001 * (3 - len(chunk)))
+        return [item.upper() for item in chunk]
+
+    items = [f"item{i}" for i in range(50)]
+
+    async def run():
+        sizer = ChunkSizer(5, adaptive=False)
+        chunks = _chunks(items, sizer, 0)
+        return [item async for item in _adispatch(chunks, _atimed_call(sizer, call), 4)]
+
+    assert asyncio.run(run()) == [item.upper() for item in items]
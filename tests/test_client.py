@@ -43,6 +43,31 @@ def test_query_sync():
         logger.warning(f"Error: {e}")
 
 
+def test_query_sync_stream():
+    from siphonserver.server.api.responses import StreamSummary
+
+    logger.info("Streaming synchronous query...")
+    try:
+        request = ConduitRequest.from_query_input(
+            model="llama3.1:latest",
+            query_input="Tell me a joke about llamas",
+        )
+        summary = None
+        for event in client.query_sync_stream(request):
+            if isinstance(event, StreamSummary):
+                summary = event
+            else:
+                print(event, end="", flush=True)
+        print()
+        assert summary is not None
+        print(json.dumps(summary.model_dump(exclude={"response"}), indent=2))
+        logger.info("Synchronous stream completed successfully.")
+    except requests.exceptions.HTTPError as e:
+        logger.warning(f"HTTP Error: {e}")
+    except requests.exceptions.ConnectionError as e:
+        logger.warning(f"Connection Error: {e}")
+
+
 def test_query_async_prompt_strings():
     from siphonserver.server.api.requests import BatchRequest
     from conduit.message.textmessage import TextMessage
@@ -70,6 +95,29 @@ def test_query_async_prompt_strings():
         logger.warning(f"Error: {e}")
 
 
+def test_query_async_stream():
+    from siphonserver.server.api.requests import BatchRequest
+
+    prompt_strings = [
+        "What is the capital of France?",
+        "Explain the theory of relativity.",
+        "What are the benefits of meditation?",
+    ]
+    request = BatchRequest(model="gpt-oss:latest", prompt_strings=prompt_strings)
+    logger.info("Streaming asynchronous query...")
+    try:
+        indices = []
+        for index, result in client.query_async_stream(request):
+            print(index, result)
+            indices.append(index)
+        assert sorted(indices) == list(range(len(prompt_strings)))
+        logger.info("Asynchronous stream completed successfully.")
+    except requests.exceptions.HTTPError as e:
+        logger.warning(f"HTTP Error: {e}")
+    except requests.exceptions.ConnectionError as e:
+        logger.warning(f"Connection Error: {e}")
+
+
 def test_generate_synthetic_data():
     """
     Test the generation of synthetic data using a sample file.
@@ -119,3 +167,43 @@ def test_generate_embeddings():
         logger.warning(f"HTTP Error: {e}")
     except Exception as e:
         logger.warning(f"Error: {e}")
+
+
+def test_generate_embeddings_array():
+    logger.info("Generating embeddings as a binary array...")
+    model = "sentence-transformers/all-MiniLM-L6-v2"
+    request = EmbeddingsRequest(
+        model=model,
+        documents=["This is a test document.", "This is another test document."],
+    )
+
+    try:
+        embeddings = client.generate_embeddings_array(request)
+        print(embeddings.shape, embeddings.dtype)
+        assert embeddings.shape[0] == 2
+        logger.info("Binary embeddings generated successfully.")
+    except requests.exceptions.HTTPError as e:
+        logger.warning(f"HTTP Error: {e}")
+    except requests.exceptions.ConnectionError as e:
+        logger.warning(f"Connection Error: {e}")
+
+
+def test_batch_job():
+    from siphonserver.server.api.requests import BatchRequest, JobRequest
+
+    batch = BatchRequest(
+        model="llama3.1:latest",
+        prompt_strings=["Name a bird.", "Name a fish.", "Name a tree."],
+    )
+    logger.info("Submitting batch job...")
+    try:
+        status = client.submit_job(JobRequest(batch=batch))
+        status = client.wait_for_job(status.job_id, poll_interval=1.0, timeout=300)
+        results = client.get_job_results(status.job_id)
+        print(json.dumps(results.job.model_dump(), indent=2))
+        assert [item.index for item in results.results] == [0, 1, 2]
+        logger.info("Batch job completed successfully.")
+    except requests.exceptions.HTTPError as e:
+        logger.warning(f"HTTP Error: {e}")
+    except requests.exceptions.ConnectionError as e:
+        logger.warning(f"Connection Error: {e}")
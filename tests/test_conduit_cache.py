@@ -0,0 +1,30 @@
+import pytest
+
+from siphonserver.server.utils.conduit_cache import CountingConduitCache
+
+
+class _FakeCache:
+    def __init__(self):
+        self.stored = {"hit": "response"}
+        self.name = "siphonserver"
+
+    def check_for_model(self, key):
+        return self.stored.get(key)
+
+    def store_for_model(self, key, value):
+        self.stored[key] = value
+
+
+def test_counts_hits_and_misses():
+    cache = CountingConduitCache(_FakeCache())
+    assert cache.check_for_model("hit") == "response"
+    assert cache.check_for_model("miss") is None
+    cache.store_for_model("miss", "later")
+    assert cache.check_for_model("miss") == "later"
+    assert cache.name == "siphonserver"
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_ratio": 0.667}
+
+
+def test_rejects_cache_without_lookup_method():
+    with pytest.raises(TypeError):
+        CountingConduitCache(object())
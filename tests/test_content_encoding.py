@@ -0,0 +1,158 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from siphonserver.server.api import content_encoding
+from siphonserver.server.api.content_encoding import DecompressedTooLarge
+from siphonserver.server.utils.middleware import CompressionMiddleware
+
+
+BODY = b'{"prompt": "' + b"tell me about llamas " * 200 + b'"}'
+
+
+def test_gzip_round_trip():
+    compressed = content_encoding.compress(BODY, content_encoding.GZIP)
+    assert len(compressed) < len(BODY)
+    assert content_encoding.decompress(compressed, content_encoding.GZIP) == BODY
+
+
+def test_gzip_multi_member():
+    body = gzip.compress(b"a") + gzip.compress(b"b") + gzip.compress(b"c")
+    assert content_encoding.decompress(body, content_encoding.GZIP) == b"abc"
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        gzip.compress(BODY)[:-10],  # truncated
+        gzip.compress(b"a") + b"trailing garbage",
+        b"not gzip at all",
+    ],
+)
+def test_gzip_rejects_invalid(body):
+    with pytest.raises(ValueError) as info:
+        content_encoding.decompress(body, content_encoding.GZIP)
+    assert not isinstance(info.value, DecompressedTooLarge)
+
+
+def test_gzip_size_limit_spans_members():
+    body = gzip.compress(b"x" * 60) + gzip.compress(b"y" * 60)
+    assert len(content_encoding.decompress(body, content_encoding.GZIP, max_size=120)) == 120
+    with pytest.raises(DecompressedTooLarge):
+        content_encoding.decompress(body, content_encoding.GZIP, max_size=100)
+
+
+needs_zstd = pytest.mark.skipif(
+    content_encoding.ZSTD not in content_encoding.supported(), reason="zstd not available"
+)
+
+
+@needs_zstd
+def test_zstd_round_trip_and_multi_frame():
+    compressed = content_encoding.compress(BODY, content_encoding.ZSTD)
+    assert content_encoding.decompress(compressed, content_encoding.ZSTD) == BODY
+    body = content_encoding.compress(b"a", content_encoding.ZSTD) + compressed
+    assert content_encoding.decompress(body, content_encoding.ZSTD) == b"a" + BODY
+
+
+@needs_zstd
+@pytest.mark.parametrize("cut", [1, 10, -1])
+def test_zstd_rejects_truncated(cut):
+    compressed = content_encoding.compress(BODY, content_encoding.ZSTD)
+    with pytest.raises(ValueError) as info:
+        content_encoding.decompress(compressed[:cut], content_encoding.ZSTD)
+    assert not isinstance(info.value, DecompressedTooLarge)
+
+
+@needs_zstd
+def test_zstd_size_limit():
+    compressed = content_encoding.compress(BODY, content_encoding.ZSTD)
+    with pytest.raises(DecompressedTooLarge):
+        content_encoding.decompress(compressed, content_encoding.ZSTD, max_size=len(BODY) - 1)
+
+
+def test_identity_and_unknown():
+    assert content_encoding.decompress(b"plain", content_encoding.IDENTITY) == b"plain"
+    with pytest.raises(ValueError):
+        content_encoding.decompress(b"plain", "br")
+    with pytest.raises(ValueError):
+        content_encoding.compress(b"plain", "br")
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("br", None),
+        ("gzip", content_encoding.GZIP),
+        ("gzip;q=0", None),
+        ("GZIP ; q=0.5, br", content_encoding.GZIP),
+    ],
+)
+def test_negotiate(accept, expected):
+    assert content_encoding.negotiate(accept) == expected
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: dict):
+        return request
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(BODY.decode())
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(iter(["data: 1\n\n"]), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, min_bytes=1024)
+    return TestClient(app)
+
+
+def test_middleware_decodes_gzip_request():
+    response = _client().post(
+        "/echo",
+        content=gzip.compress(b'{"a": 1}'),
+        headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"a": 1}
+
+
+def test_middleware_rejects_corrupt_request_body():
+    response = _client().post(
+        "/echo",
+        content=b"not gzip",
+        headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "path, accept, encoded",
+    [
+        ("/large", "gzip", True),
+        ("/large", "identity", False),
+        ("/small", "gzip", False),
+    ],
+)
+def test_middleware_varies_on_every_eligible_response(path, accept, encoded):
+    response = _client().get(path, headers={"Accept-Encoding": accept})
+    assert response.headers.get("vary") == "Accept-Encoding"
+    assert (response.headers.get("content-encoding") == "gzip") is encoded
+
+
+def test_middleware_passes_streams_through():
+    response = _client().get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from siphonserver.server.api import embeddings_format
+
+
+VECTORS = [[0.0, 1.5, -2.25], [3.0, 4.0, 5.5]]
+
+
+@pytest.mark.parametrize("media_type", embeddings_format.BINARY_FORMATS)
+def test_round_trip(media_type):
+    payload, shape = embeddings_format.encode(VECTORS, media_type)
+    assert shape == (2, 3)
+    array = embeddings_format.decode(payload, media_type)
+    assert array.dtype == np.float32
+    assert array.shape == (2, 3)
+    np.testing.assert_array_equal(array, np.asarray(VECTORS, dtype=np.float32))
+
+
+def test_float32_layout():
+    payload, _ = embeddings_format.encode(VECTORS, embeddings_format.FLOAT32)
+    assert payload[:8] == (2).to_bytes(4, "little") + (3).to_bytes(4, "little")
+    assert len(payload) == 8 + 2 * 3 * 4
+
+
+@pytest.mark.parametrize("media_type", embeddings_format.BINARY_FORMATS)
+def test_empty_round_trip(media_type):
+    payload, shape = embeddings_format.encode([], media_type)
+    assert shape == (0, 0)
+    assert embeddings_format.decode(payload, media_type).shape == (0, 0)
+
+
+def test_decode_ignores_content_type_parameters():
+    payload, _ = embeddings_format.encode(VECTORS, embeddings_format.FLOAT32)
+    array = embeddings_format.decode(payload, "Application/X-Siphon-Float32; charset=binary")
+    assert array.shape == (2, 3)
+
+
+def test_encode_rejects_ragged_and_unknown():
+    with pytest.raises(ValueError):
+        embeddings_format.encode([1.0, 2.0], embeddings_format.FLOAT32)
+    with pytest.raises(ValueError):
+        embeddings_format.encode(VECTORS, embeddings_format.JSON)
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, embeddings_format.JSON),
+        ("", embeddings_format.JSON),
+        ("text/html", embeddings_format.JSON),
+        ("application/x-npy", embeddings_format.NPY),
+        ("application/json, application/x-siphon-float32;q=0.9", embeddings_format.JSON),
+        ("application/x-siphon-float32;q=0.5, application/x-npy", embeddings_format.NPY),
+        ("application/x-npy;q=0", embeddings_format.JSON),
+        ("application/x-npy; q=0.8, */*;q=0.1", embeddings_format.NPY),
+        ("application/x-npy, application/json", embeddings_format.NPY),
+        ("*/*;q=0.9, application/x-npy;q=0.5", embeddings_format.JSON),
+    ],
+)
+def test_negotiate(accept, expected):
+    assert embeddings_format.negotiate(accept) == expected
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+from siphonserver.server.utils.config import ServerConfig
+from siphonserver.server.utils.executors import _Pool
+
+
+def test_submit_failure_releases_slot():
+    async def main():
+        pool = _Pool("test", 1, ServerConfig())
+        pool.executor.shutdown()
+        with pytest.raises(RuntimeError):
+            await pool.run(lambda: None)
+        return pool
+
+    pool = asyncio.run(main())
+    assert pool.scheduler.busy == 0
+    stats = pool.stats()
+    assert stats["queued"] == 0
+    assert pool.failed == 1
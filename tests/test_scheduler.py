@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+
+from siphonserver.server.utils.scheduler import (
+    FairScheduler,
+    ModelResidency,
+    WorkClass,
+    _DeficitRoundRobin,
+    _Waiter,
+    INTERACTIVE,
+    BULK,
+)
+
+
+def _waiter(client: str, cost: int = 1, tag=None) -> _Waiter:
+    waiter = _Waiter(client, cost, None, 0.0)
+    waiter.tag = tag
+    return waiter
+
+
+class _LoopingDRR(_DeficitRoundRobin):
+    """Reference: hands out one quantum per visit until a client can afford its task."""
+
+    def pop(self, eligible=None):
+        def first_eligible(queue):
+            return next((w for w in queue if eligible is None or eligible(w)), None)
+
+        if not any(first_eligible(queue) for queue in self._queues.values()):
+            return None
+        while True:
+            for client, queue in self._queues.items():
+                waiter = first_eligible(queue)
+                if waiter is None:
+                    continue
+                if self._turn != client:
+                    self._turn = client
+                    self._deficits[client] += self.quantum
+                if self._deficits[client] >= waiter.cost:
+                    queue.remove(waiter)
+                    self._deficits[client] -= waiter.cost
+                    self._size -= 1
+                    if not queue:
+                        self._drop(client)
+                    return waiter
+                self._queues.move_to_end(client)
+                self._turn = None
+                break
+
+
+def _drain(drr: _DeficitRoundRobin) -> list:
+    order = []
+    while (waiter := drr.pop()) is not None:
+        order.append(waiter.tag)
+    return order
+
+
+def test_drr_alternates_clients():
+    drr = _DeficitRoundRobin(quantum=1)
+    for i in range(3):
+        drr.push(_waiter("a", tag=f"a{i}"))
+    for i in range(2):
+        drr.push(_waiter("b", tag=f"b{i}"))
+    assert _drain(drr) == ["a0", "b0", "a1", "b1", "a2"]
+    assert len(drr) == 0 and drr.clients() == 0
+
+
+def test_drr_charges_cost():
+    drr = _DeficitRoundRobin(quantum=1)
+    for i in range(2):
+        drr.push(_waiter("big", cost=3, tag=f"big{i}"))
+    for i in range(6):
+        drr.push(_waiter("small", tag=f"small{i}"))
+    # A cost-3 task waits out three rounds, in which the other client gets three cost-1 tasks
+    assert _drain(drr) == [
+        "small0", "small1", "big0", "small2", "small3", "small4", "big1", "small5"
+    ]
+
+
+def test_drr_large_cost_is_one_step():
+    drr = _DeficitRoundRobin(quantum=1)
+    drr.push(_waiter("a", cost=10**9, tag="huge"))
+    drr.push(_waiter("b", cost=10**9 + 5, tag="huger"))
+    start = time.perf_counter()
+    assert _drain(drr) == ["huge", "huger"]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_drr_matches_looping_reference():
+    rng = random.Random(1234)
+    for _ in range(50):
+        quantum = rng.randint(1, 4)
+        fast, reference = _DeficitRoundRobin(quantum), _LoopingDRR(quantum)
+        tags = []
+        for i in range(rng.randint(1, 40)):
+            client, cost = f"c{rng.randint(0, 4)}", rng.randint(1, 12)
+            fast.push(_waiter(client, cost, i))
+            reference.push(_waiter(client, cost, i))
+            tags.append(i)
+            # Interleave pops with pushes so deficits carry between calls
+            if rng.random() < 0.3:
+                assert getattr(fast.pop(), "tag", None) == getattr(reference.pop(), "tag", None)
+        assert _drain(fast) == _drain(reference)
+
+
+def test_drr_eligible_filter():
+    drr = _DeficitRoundRobin(quantum=1)
+    drr.push(_waiter("a", tag="skip"))
+    drr.push(_waiter("a", tag="take"))
+    waiter = drr.pop(lambda w: w.tag == "take")
+    assert waiter.tag == "take"
+    assert drr.pop(lambda w: False) is None
+    assert len(drr) == 1
+
+
+def test_fair_scheduler_weights_classes():
+    async def run() -> list[str]:
+        scheduler = FairScheduler("test", slots=1, weights={INTERACTIVE: 3, BULK: 1})
+        await scheduler.acquire(WorkClass(BULK, "holder"))
+        grants = []
+
+        async def wait(priority: str):
+            await scheduler.acquire(WorkClass(priority, priority))
+            grants.append(priority)
+
+        tasks = [asyncio.ensure_future(wait(BULK)) for _ in range(4)]
+        tasks += [asyncio.ensure_future(wait(INTERACTIVE)) for _ in range(8)]
+        await asyncio.sleep(0)
+        for _ in tasks:
+            scheduler.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return grants
+
+    grants = asyncio.run(run())
+    assert grants[:4].count(INTERACTIVE) == 3
+    assert grants.count(BULK) == 4 and grants.count(INTERACTIVE) == 8
+
+
+def test_fair_scheduler_timeout_leaves_no_waiter():
+    async def run() -> FairScheduler:
+        scheduler = FairScheduler("test", slots=1, weights={INTERACTIVE: 1, BULK: 1})
+        await scheduler.acquire(WorkClass())
+        try:
+            await scheduler.acquire(WorkClass(), timeout=0.01)
+        except TimeoutError:
+            pass
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.waiting == 0 and scheduler.busy == 1
+
+
+def _affinity_scheduler() -> FairScheduler:
+    residency = ModelResidency(max_resident=1)
+    residency.set_local_models(["m1", "m2"])
+    return FairScheduler(
+        "test",
+        slots=1,
+        weights={INTERACTIVE: 1, BULK: 1},
+        residency=residency,
+        affinity_max_wait=1.0,
+    )
+
+
+def _model_waiter(model: str, waited: float) -> _Waiter:
+    return _Waiter("client", 1, None, time.perf_counter() - waited, model)
+
+
+def test_affinity_prefers_resident_model():
+    scheduler = _affinity_scheduler()
+    scheduler.residency.start("m1")
+    swap, stay = _model_waiter("m2", 0.0), _model_waiter("m1", 0.0)
+    scheduler._queues[BULK].push(swap)
+    scheduler._queues[BULK].push(stay)
+    assert scheduler._next() is stay
+    assert scheduler._next() is swap
+
+
+def test_starvation_counts_from_arrival_not_last_swap():
+    scheduler = _affinity_scheduler()
+    scheduler.residency.start("m1")
+    scheduler.residency.finish("m1", 0.1, False)
+    # m2 is swapped in just now; m1 work that has waited past the bound still goes first
+    assert scheduler.residency.start("m2") is True
+    old, cheap = _model_waiter("m1", 5.0), _model_waiter("m2", 0.0)
+    scheduler._queues[BULK].push(cheap)
+    scheduler._queues[BULK].push(old)
+    assert scheduler._next() is old
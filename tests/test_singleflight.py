@@ -0,0 +1,88 @@
+"""Tests for single-flight coalescing and the work class its shared task is scheduled as."""
+
+import asyncio
+
+from siphonserver.server.utils.deadline import get_deadline, set_deadline
+from siphonserver.server.utils.scheduler import (
+    get_work_class,
+    set_work_class,
+    BULK,
+    INTERACTIVE,
+)
+from siphonserver.server.utils.singleflight import SingleFlight
+
+
+def test_lone_caller_keeps_its_work_class_but_not_its_deadline():
+    async def main():
+        set_work_class(INTERACTIVE, "alice")
+        set_deadline(30)
+        seen = {}
+
+        async def func():
+            seen["work"] = get_work_class()
+            seen["deadline"] = get_deadline()
+            return "done"
+
+        assert await SingleFlight("test").do("key", func) == "done"
+        return seen
+
+    seen = asyncio.run(main())
+    assert seen["work"].priority == INTERACTIVE
+    assert seen["work"].client == "alice"
+    assert seen["deadline"] is None
+
+
+def test_second_caller_reschedules_as_shared_at_highest_priority():
+    async def main():
+        group = SingleFlight("test")
+        started = asyncio.Event()
+        release = asyncio.Event()
+        seen = []
+
+        async def func():
+            seen.append(get_work_class())
+            started.set()
+            await release.wait()
+            seen.append(get_work_class())
+            return "done"
+
+        async def call(priority, client):
+            set_work_class(priority, client)
+            return await group.do("key", func)
+
+        first = asyncio.create_task(call(BULK, "alice"))
+        await started.wait()
+        second = asyncio.create_task(call(INTERACTIVE, "bob"))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, second)
+        return group, seen, results
+
+    group, seen, results = asyncio.run(main())
+    assert results == ["done", "done"]
+    assert (group.calls, group.coalesced) == (1, 1)
+    assert seen[0].client == "alice"
+    assert seen[1].client == "shared:test"
+    assert seen[1].priority == INTERACTIVE
+
+
+def test_task_cancelled_when_last_waiter_leaves():
+    async def main():
+        group = SingleFlight("test")
+        cancelled = asyncio.Event()
+
+        async def func():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(group.do("key", func))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return group
+
+    group = asyncio.run(main())
+    assert group.stats()["in_flight"] == 0
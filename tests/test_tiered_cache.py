@@ -0,0 +1,68 @@
+import threading
+
+from siphonserver.server.utils.tiered_cache import TieredCache
+
+
+def test_memory_tier_bounded_by_bytes(tmp_path):
+    cache = TieredCache(tmp_path / "cache.db", max_memory_items=100, max_memory_mb=0.001)
+    budget = cache.max_memory_bytes
+    for i in range(10):
+        cache.set(f"k{i}", "x" * (budget // 4))
+    stats = cache.stats()
+    assert stats["memory_bytes"] <= budget
+    assert stats["memory_items"] == 4
+    # Evicted from memory, still served from disk
+    assert cache.get("k0") == "x" * (budget // 4)
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_oversized_value_skips_memory(tmp_path):
+    cache = TieredCache(tmp_path / "cache.db", max_memory_mb=0.001)
+    big = "y" * (cache.max_memory_bytes + 1)
+    cache.set("big", big)
+    assert cache.stats()["memory_items"] == 0
+    assert cache.get("big") == big
+
+
+def test_replacing_a_key_keeps_byte_count(tmp_path):
+    cache = TieredCache(tmp_path / "cache.db")
+    cache.set("k", "a" * 100)
+    cache.set("k", "b" * 10)
+    assert cache.stats()["memory_bytes"] == 10
+    cache.clear()
+    assert cache.stats()["memory_bytes"] == 0
+
+
+def test_disk_total_shared_between_connections(tmp_path):
+    path = tmp_path / "cache.db"
+    first = TieredCache(path)
+    second = TieredCache(path)
+    first.set("k", "a" * 100)
+    second.set("k", "b" * 40)  # Replaces the other connection's entry
+    second.set("other", "c" * 10)
+    assert first.stats()["disk_bytes"] == second.stats()["disk_bytes"] == 50
+    assert first.get("other") == "c" * 10
+
+
+def test_disk_budget_counts_every_writer(tmp_path):
+    path = tmp_path / "cache.db"
+    writers = [TieredCache(path, max_disk_mb=0.01) for _ in range(3)]
+    for i in range(30):
+        writers[i % 3].set(f"k{i}", "x" * 1024)
+    assert writers[0].stats()["disk_bytes"] <= writers[0].max_disk_bytes
+
+
+def test_concurrent_writers_same_key(tmp_path):
+    path = tmp_path / "cache.db"
+    writers = [TieredCache(path) for _ in range(4)]
+
+    def write(cache):
+        for i in range(50):
+            cache.set("shared", f"value {i}")
+
+    threads = [threading.Thread(target=write, args=(cache,)) for cache in writers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writers[0].stats()["disk_bytes"] == len("value 49")